@@ -1,10 +1,294 @@
+import os
+import sys
+import time
 from flask import Flask
 
-def create_app():
+# The utils package and config module live next to this package
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# Reference point for cold-start measurements (module import time)
+PROCESS_IMPORT_AT = time.perf_counter()
+
+
+class LazyService:
+    """
+    Build a service on first use instead of at startup. Used for objects
+    whose modules are slow to import (e.g. the scraping session).
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+
+    def get(self):
+        if self._instance is None:
+            self._instance = self._factory()
+        return self._instance
+
+
+def init_db(app):
+    # Schema changes live in utils/migration_utils.py and are tracked by
+    # PRAGMA user_version; a current database only costs one pragma read.
+    from utils.migration_utils import SCHEMA_VERSION, run_migrations
+
+    pool = app.extensions['db_pool']
+    start = time.perf_counter()
+    conn = pool.acquire()
+    try:
+        run_migrations(conn)
+    finally:
+        pool.release(conn)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"Database initialized at {pool.db_path} (schema v{SCHEMA_VERSION}, {elapsed_ms:.1f} ms)")
+    return elapsed_ms
+
+
+def init_services(app):
+    """
+    Create the shared services and store them in app.extensions
+    """
+    from utils.cache_utils import AnalysisCache
+    from utils.job_utils import JobQueue
+    from utils.posting_utils import PostingStore
+    from utils.upload_utils import BlobStore
+
+    config = app.config
+    pool = app.extensions['db_pool']
+
+    analysis_cache = AnalysisCache(
+        pool,
+        ttl=config['ANALYSIS_CACHE_TTL'],
+        url_ttl=config['ANALYSIS_CACHE_URL_TTL'],
+        memory_size=config['ANALYSIS_CACHE_MEMORY_SIZE'],
+        max_rows=config['ANALYSIS_CACHE_MAX_ROWS']
+    )
+
+    def create_page_fetcher():
+        # Shared HTTP session for scraping; pages with validators are revalidated with conditional requests
+        from utils.http_utils import PageFetcher
+        return PageFetcher(pool, timeout=config['SCRAPE_TIMEOUT'], max_rows=config['HTTP_CACHE_MAX_ROWS'])
+
+    page_fetcher = LazyService(create_page_fetcher)
+
+    # Compressed snapshots of scraped posting text, kept for search and re-analysis
+    posting_store = PostingStore(pool, retention=config['POSTING_SNAPSHOT_RETENTION'])
+
+    # Background job queue for URL analysis (SQLite-backed, local worker threads)
+    job_queue = JobQueue(
+        pool,
+        workers=config['JOB_WORKERS'],
+        timeout=config['JOB_TIMEOUT'],
+        max_attempts=config['JOB_MAX_ATTEMPTS'],
+        backoff=config['JOB_RETRY_BACKOFF'],
+        retention=config['JOB_RETENTION']
+    )
+
+    def run_analyze_url_job(payload):
+        from app.routes import parse_analysis_result
+        from utils.llm_utils import process_job_posting_url
+
+        result = parse_analysis_result(process_job_posting_url(
+            payload['url'], cache=analysis_cache, fetcher=page_fetcher.get(), snapshots=posting_store))
+        # Scrape/LLM failures come back as {'error': ...}; raise so the queue retries them
+        if 'error' in result:
+            raise RuntimeError(result['error'])
+        return result
+
+    job_queue.register('analyze_url', run_analyze_url_job)
+
+    # Exchange rates for every salary conversion, served from an in-memory snapshot
+    from utils.rates_utils import rate_store
+    rate_store.bind(pool, check_interval=config['RATES_CHECK_INTERVAL'])
+
+    app.extensions['rate_store'] = rate_store
+    app.extensions['blob_store'] = BlobStore(config['UPLOAD_FOLDER'], pool)
+    app.extensions['analysis_cache'] = analysis_cache
+    app.extensions['posting_store'] = posting_store
+    app.extensions['page_fetcher'] = page_fetcher
+    app.extensions['job_queue'] = job_queue
+
+
+def register_commands(app):
+    """
+    Maintenance commands, e.g. flask --app run rebuild-stats
+    """
+    import click
+
+    @app.cli.command('rebuild-stats')
+    @click.option('--check', is_flag=True, help='Only report differences; exit with status 1 if any')
+    def rebuild_stats_command(check):
+        """Recompute the materialized /api/stats tables from the applications table."""
+        from utils.stats_utils import check_stats, rebuild_stats
+
+        pool = app.extensions['db_pool']
+        conn = pool.acquire()
+        try:
+            differences = check_stats(conn) if check else rebuild_stats(conn)
+        finally:
+            pool.release(conn)
+        for difference in differences:
+            print(f"[WARNING] Stats mismatch: {difference}")
+        if check:
+            print('Stats are consistent' if not differences else f"{len(differences)} stats mismatches found")
+            if differences:
+                raise SystemExit(1)
+        else:
+            print(f"Stats rebuilt ({len(differences)} mismatches corrected)")
+
+
+    @app.cli.command('refresh-rates')
+    @click.option('--loader', help='Rate loader (static or file); defaults to RATES_LOADER')
+    @click.option('--file', 'path', help='JSON rates file for the file loader; defaults to RATES_FILE')
+    def refresh_rates_command(loader, path):
+        """Load exchange rates and recompute stored yearly PLN salaries."""
+        from utils.rates_utils import create_rate_loader
+
+        if path and not loader:
+            loader = 'file'
+        try:
+            summary = app.extensions['rate_store'].refresh(create_rate_loader(loader, path))
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Could not refresh exchange rates: {e}")
+            raise SystemExit(1)
+        print(f"Rates as of {summary['as_of']} ({summary['source']}): {', '.join(f'{c}={r}' for c, r in summary['rates'].items())}")
+        print(f"{len(summary['changed'])} rates changed, {summary['recomputed']} applications recomputed")
+
+
+    @app.cli.command('gc-uploads')
+    @click.option('--grace', type=float, default=24.0, show_default=True,
+                  help='Hours an unreferenced upload is kept (it may belong to an unsaved form)')
+    def gc_uploads_command(grace):
+        """Delete uploaded files that no application references."""
+        blobs, size = app.extensions['blob_store'].gc(grace=grace * 3600)
+        print(f"Removed {blobs} unreferenced blobs ({size} bytes)")
+
+    @app.cli.command('import-legacy-uploads')
+    @click.option('--delete', is_flag=True, help='Remove the legacy files once imported')
+    def import_legacy_uploads_command(delete):
+        """Move files referenced by uploads/cvs and uploads/cover_letters paths into the blob store."""
+        summary = app.extensions['blob_store'].import_legacy(delete=delete)
+        for ref in summary['missing']:
+            print(f"[WARNING] Referenced file not found: {ref}")
+        print(f"Imported {summary['imported']} references from {summary['legacy_files']} legacy files"
+              f"{' (deleted)' if delete else ''}")
+
+    @app.cli.command('reindex-search')
+    def reindex_search_command():
+        """Extract missing document texts and rebuild the full-text search index."""
+        from utils.search_utils import reindex_search
+
+        pool = app.extensions['db_pool']
+        conn = pool.acquire()
+        try:
+            summary = reindex_search(conn, app.extensions['blob_store'])
+        finally:
+            pool.release(conn)
+        print(f"Indexed {summary['applications']} applications ({summary['postings']} with posting text, "
+              f"{summary['documents_extracted']} documents extracted)")
+
+
+    @app.cli.command('import-applications')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), help='Defaults to the file extension')
+    @click.option('--dry-run', is_flag=True, help='Only validate the rows')
+    def import_applications_command(path, fmt, dry_run):
+        """Insert applications from a CSV or JSONL file in chunked transactions."""
+        from utils.bulk_utils import BulkError, detect_format, import_applications
+
+        pool = app.extensions['db_pool']
+        conn = pool.acquire()
+        try:
+            with open(path, 'rb') as f:
+                summary = import_applications(conn, f, detect_format(fmt, path),
+                                              chunk_size=app.config['IMPORT_CHUNK_SIZE'], dry_run=dry_run)
+        except BulkError as e:
+            print(f"[ERROR] Import failed: {e}")
+            raise SystemExit(1)
+        finally:
+            pool.release(conn)
+        for error in summary['errors']:
+            print(f"[WARNING] Line {error['line']}: {'; '.join(error['errors'])}")
+        print(f"{summary['rows']} rows read, {summary['inserted']} inserted in {summary['chunks']} transactions, "
+              f"{summary['invalid']} invalid{' (dry run)' if dry_run else ''}")
+
+    @app.cli.command('export-applications')
+    @click.argument('path', type=click.Path(dir_okay=False))
+    @click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl', 'parquet']),
+                  help='Defaults to the file extension')
+    def export_applications_command(path, fmt):
+        """Write all applications to a CSV, JSONL or Parquet file."""
+        from utils.bulk_utils import EXPORTERS, BulkError
+
+        fmt = fmt or path.rsplit('.', 1)[-1].lower()
+        if fmt not in EXPORTERS:
+            print(f"[ERROR] Unknown export format: {fmt}")
+            raise SystemExit(1)
+        pool = app.extensions['db_pool']
+        conn = pool.acquire()
+        try:
+            chunks = EXPORTERS[fmt](conn, chunk_size=app.config['EXPORT_CHUNK_SIZE'])
+            with open(path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk if isinstance(chunk, bytes) else chunk.encode('utf-8'))
+        except BulkError as e:
+            print(f"[ERROR] Export failed: {e}")
+            raise SystemExit(1)
+        finally:
+            pool.release(conn)
+        print(f"Applications written to {path}")
+
+def create_app(config=None):
+    """
+    Application factory.
+
+    Nothing touches the database at import time; migrations run here, once
+    per factory call. The LLM client, scraping session and HTML parsers are
+    imported on first use, so startup only pays for Flask and SQLite.
+    Startup timings are served by GET /api/health/startup.
+    """
+    start = time.perf_counter()
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+
     app = Flask(__name__)
-    app.config.from_object('backend.config.Config')
-    
-    from backend.app.routes import main_bp
+    app.config.from_object('config.Config')
+    if config:
+        app.config.update(config)
+
+    from flask_cors import CORS
+    CORS(app)  # Enable CORS for all routes
+
+    # Database connection pool: one connection per request, returned at teardown
+    from utils.db_utils import init_app as init_db_pool
+    init_db_pool(app, app.config['DB_PATH'], max_size=app.config['DB_POOL_SIZE'], timeout=app.config['DB_BUSY_TIMEOUT'])
+    migrations_ms = init_db(app)
+
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    init_services(app)
+
+    from app.routes import main_bp
     app.register_blueprint(main_bp)
-    
+    register_commands(app)
+
+    created_at = time.perf_counter()
+    startup = {
+        'import_to_create_ms': (start - PROCESS_IMPORT_AT) * 1000,
+        'create_app_ms': (created_at - start) * 1000,
+        'migrations_ms': migrations_ms,
+        'first_request_ms': None
+    }
+    app.extensions['startup'] = startup
+
+    @app.before_request
+    def record_first_request():
+        if startup['first_request_ms'] is None:
+            startup['first_request_ms'] = (time.perf_counter() - created_at) * 1000
+            print(f"[STARTUP] First request {startup['first_request_ms']:.1f} ms after create_app "
+                  f"(create_app {startup['create_app_ms']:.1f} ms, pid {os.getpid()})")
+
     return app
@@ -1,50 +1,76 @@
-from flask import Blueprint, request, jsonify
-import sqlite3
+from flask import Blueprint, Response, current_app, jsonify, request, send_file, stream_with_context
 import os
-from datetime import datetime
 import json
+import mimetypes
+import time
+from datetime import datetime
+from werkzeug.utils import secure_filename
+from utils.batch_utils import run_batch
+from utils.bulk_utils import APPLICATION_STATUSES, EXPORT_FORMATS, EXPORTERS, BulkError, detect_format, import_applications
+from utils.db_utils import get_db, get_pool
+from utils.etag_utils import conditional, conditional_stats, constant, table_versions
+from utils.posting_utils import location_counts, merge_profile, read_profile, read_snapshot, save_profile, skill_counts
+from utils.query_utils import QueryError, query_applications
+from utils.rates_utils import rate_store
+from utils.salary_utils import PERIODS_PER_YEAR, salary_breakdown, salary_breakdown_batch, to_yearly_pln, to_yearly_pln_batch
+from utils.search_utils import index_document, index_posting, search_applications
+from utils.stats_utils import read_stats
+from utils.stream_utils import format_sse
+from utils.upload_utils import COMPRESSIBLE_EXTENSIONS, parse_blob_ref
 
 main_bp = Blueprint('main', __name__)
 
-# Database helper functions
-def get_db_connection():
-    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'applications.db')
-    os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    return conn
+# Shared services are created by create_app() and stored in app.extensions
+def _analysis_cache():
+    return current_app.extensions['analysis_cache']
 
-def init_db():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Create tables if they don't exist
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS applications (
-        id INTEGER PRIMARY KEY,
-        company TEXT,
-        role TEXT,
-        salary TEXT,
-        url TEXT,
-        date_posted TEXT,
-        date_applied TEXT,
-        cv_path TEXT
-    )
-    ''')
-    conn.commit()
-    conn.close()
+def _page_fetcher():
+    return current_app.extensions['page_fetcher'].get()
+
+def _job_queue():
+    return current_app.extensions['job_queue']
+
+def _blob_store():
+    return current_app.extensions['blob_store']
+
+def _posting_store():
+    return current_app.extensions['posting_store']
+
+# Versions for conditional GETs: an unchanged version means an unchanged response
+def _applications_version():
+    return table_versions(get_db(), 'applications')
+
+def _posting_version():
+    # The posting endpoint also returns the snapshot's analysis, which a reanalysis rewrites
+    return table_versions(get_db(), 'applications', 'posting_snapshots')
+
+def _rates_version():
+    return rate_store.current().version
 
-# Initialize database on startup
-init_db()
+def _salary_field_error(data, rates, fields=('salary_currency', 'salary_type')):
+    # Same rules as the bulk importer: a salary in an unknown currency or period
+    # would be stored with a made-up salary_yearly_pln
+    if 'salary_currency' in fields and (not isinstance(data['salary_currency'], str)
+                                        or data['salary_currency'] not in rates.currencies):
+        return f"salary_currency must be one of {', '.join(rates.currencies)}"
+    if 'salary_type' in fields and (not isinstance(data['salary_type'], str)
+                                    or data['salary_type'] not in PERIODS_PER_YEAR):
+        return f"salary_type must be one of {', '.join(PERIODS_PER_YEAR)}"
+    return None
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
 @main_bp.route('/api/applications', methods=['GET'])
+@conditional(_applications_version)
 def get_applications():
-    conn = get_db_connection()
-    applications = conn.execute('SELECT * FROM applications').fetchall()
-    conn.close()
+    # Filtering, sorting and pagination all happen in SQL, see utils/query_utils.py
+    conn = get_db()
+    try:
+        result = query_applications(conn, request.args)
+    except QueryError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Convert to list of dictionaries
-    result = [dict(app) for app in applications]
     return jsonify(result)
 
 @main_bp.route('/api/applications', methods=['POST'])
@@ -59,79 +85,271 @@ def add_application():
     
     # Set default values for optional fields
     data.setdefault('salary', '')
+    data.setdefault('salary_amount', 0)
+    data.setdefault('salary_currency', 'PLN')
+    data.setdefault('salary_type', 'yearly')
     data.setdefault('date_posted', '')
     data.setdefault('date_applied', datetime.now().strftime('%Y-%m-%d'))
     data.setdefault('cv_path', '')
+    data.setdefault('cover_letter_path', '')
+    data.setdefault('status', 'Applied')
+    data.setdefault('notes', '')
+    data.setdefault('last_updated', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    
+    rates = rate_store.current()
+    error = _salary_field_error(data, rates)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    # Normalized salary used for filtering, sorting and stats
+    data['salary_yearly_pln'] = to_yearly_pln(data['salary_amount'], data['salary_currency'], data['salary_type'], rates=rates)
+    
+    conn = get_db()
+    # The posting analyzed for this URL: its text is kept with the application,
+    # and its skills/experience/location fill in whatever the client did not send
+    snapshot = _posting_store().latest(conn, data['url'])
+    data['posting_hash'] = snapshot['content_hash'] if snapshot else None
+    profile = merge_profile(data, snapshot['analysis'] if snapshot else None)
     
-    conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute('''
-    INSERT INTO applications (company, role, salary, url, date_posted, date_applied, cv_path)
-    VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', (data['company'], data['role'], data['salary'], data['url'], 
-          data['date_posted'], data['date_applied'], data['cv_path']))
-    conn.commit()
+    INSERT INTO applications (company, role, salary, salary_amount, salary_currency, salary_type, salary_yearly_pln, url, date_posted, date_applied, cv_path, cover_letter_path, status, notes, last_updated, posting_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (data['company'], data['role'], data['salary'], data['salary_amount'], data['salary_currency'], data['salary_type'], data['salary_yearly_pln'], data['url'], 
+          data['date_posted'], data['date_applied'], data['cv_path'], data['cover_letter_path'], 
+          data['status'], data['notes'], data['last_updated'], data['posting_hash']))
     
     # Get the ID of the inserted application
     app_id = cursor.lastrowid
-    conn.close()
+    save_profile(conn, app_id, profile)
+    data.update(profile)
+    # Company, role, notes and documents are indexed by triggers; the posting text here
+    index_posting(conn, app_id, data['url'], data['posting_hash'])
+    conn.commit()
     
     return jsonify({'id': app_id, **data}), 201
 
+@main_bp.route('/api/applications/import', methods=['POST'])
+def bulk_import_applications():
+    # CSV or JSONL as a multipart "file" upload or as the raw request body; valid rows
+    # are inserted in chunked transactions, invalid ones reported per line (utils/bulk_utils.py)
+    upload = request.files.get('file')
+    if upload is not None:
+        stream, filename, content_type = upload.stream, upload.filename, upload.content_type
+    else:
+        stream, filename, content_type = request.stream, '', request.content_type
+    dry_run = request.args.get('dry_run', '').lower() in ('1', 'true', 'yes')
+    
+    start = time.perf_counter()
+    try:
+        fmt = detect_format(request.args.get('format'), filename, content_type)
+        summary = import_applications(get_db(), stream, fmt, chunk_size=current_app.config['IMPORT_CHUNK_SIZE'],
+                                      dry_run=dry_run)
+    except BulkError as e:
+        return jsonify({'error': str(e)}), 400
+    summary['took_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return jsonify(summary), 201 if summary['inserted'] else 200
+
+@main_bp.route('/api/applications/export', methods=['GET'])
+def export_applications():
+    # Streams the (optionally filtered) applications; takes the list filters of GET /api/applications
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORTERS:
+        return jsonify({'error': f"Invalid format: {fmt}. Allowed: {', '.join(EXPORTERS)}"}), 400
+    try:
+        chunks = EXPORTERS[fmt](get_db(), request.args, chunk_size=current_app.config['EXPORT_CHUNK_SIZE'])
+    except (BulkError, QueryError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    filename = f"applications-{datetime.now().strftime('%Y%m%d')}.{fmt}"
+    return Response(stream_with_context(chunks), mimetype=EXPORT_FORMATS[fmt],
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+@main_bp.route('/api/search', methods=['GET'])
+def search():
+    # Ranked FTS5 search over company, role, notes, posting and document text, see utils/search_utils.py
+    start = time.perf_counter()
+    try:
+        result = search_applications(get_db(), request.args)
+    except QueryError as e:
+        return jsonify({'error': str(e)}), 400
+    result['took_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return jsonify(result)
+
 @main_bp.route('/api/applications/<int:app_id>', methods=['GET'])
+@conditional(_applications_version)
 def get_application(app_id):
-    conn = get_db_connection()
+    conn = get_db()
     application = conn.execute('SELECT * FROM applications WHERE id = ?', (app_id,)).fetchone()
-    conn.close()
     
     if application is None:
         return jsonify({'error': 'Application not found'}), 404
     
-    return jsonify(dict(application))
+    return jsonify({**dict(application), **read_profile(conn, app_id)})
+
+@main_bp.route('/api/applications/<int:app_id>/posting', methods=['GET'])
+@conditional(_posting_version)
+def get_application_posting(app_id):
+    # The posting text as scraped when the application was saved, and its last analysis
+    conn = get_db()
+    application = conn.execute('SELECT posting_hash FROM applications WHERE id = ?', (app_id,)).fetchone()
+    if application is None:
+        return jsonify({'error': 'Application not found'}), 404
+    snapshot = read_snapshot(conn, application['posting_hash']) if application['posting_hash'] else None
+    if snapshot is None:
+        return jsonify({'error': 'No posting snapshot for this application'}), 404
+    return jsonify(snapshot)
+
+@main_bp.route('/api/applications/<int:app_id>/reanalyze', methods=['POST'])
+def reanalyze_application(app_id):
+    # Re-derive skills, experience and location from the stored posting text:
+    # the stored analysis is reused unless {"refresh": true} asks for a new LLM call
+    data = request.get_json(silent=True) or {}
+    conn = get_db()
+    application = conn.execute('SELECT posting_hash FROM applications WHERE id = ?', (app_id,)).fetchone()
+    if application is None:
+        return jsonify({'error': 'Application not found'}), 404
+    snapshot = read_snapshot(conn, application['posting_hash']) if application['posting_hash'] else None
+    if snapshot is None:
+        return jsonify({'error': 'No posting snapshot for this application; analyze its URL first'}), 404
+    
+    analysis = snapshot['analysis']
+    reanalyzed = bool(data.get('refresh')) or analysis is None
+    if reanalyzed:
+        from utils.health_utils import CircuitOpenError
+        from utils.llm_utils import analyze_posting_text
+        try:
+            result = analyze_posting_text(snapshot['text'])
+        except CircuitOpenError as e:
+            return jsonify({'error': str(e)}), 503
+        if result is None:
+            return jsonify({'error': 'Failed to analyze the posting text'}), 502
+        _posting_store().save_analysis(snapshot['content_hash'], result)
+        analysis = json.loads(result)
+    
+    profile = merge_profile({}, analysis)
+    save_profile(conn, app_id, profile)
+    conn.execute('UPDATE applications SET last_updated = ? WHERE id = ?',
+                 (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), app_id))
+    conn.commit()
+    return jsonify({'id': app_id, 'reanalyzed': reanalyzed, 'analysis': analysis, **profile})
 
 @main_bp.route('/api/applications/<int:app_id>', methods=['PUT'])
 def update_application(app_id):
     data = request.json
     
-    conn = get_db_connection()
+    conn = get_db()
     # Check if application exists
     application = conn.execute('SELECT * FROM applications WHERE id = ?', (app_id,)).fetchone()
     if application is None:
-        conn.close()
         return jsonify({'error': 'Application not found'}), 404
     
+    # Stored rows keep whatever they have; only values sent now are checked
+    rates = rate_store.current()
+    error = _salary_field_error(data, rates, [field for field in ('salary_currency', 'salary_type') if field in data])
+    if error:
+        return jsonify({'error': error}), 400
+    
     # Update fields
-    fields = ['company', 'role', 'salary', 'url', 'date_posted', 'date_applied', 'cv_path']
+    fields = ['company', 'role', 'salary', 'salary_amount', 'salary_currency', 'salary_type', 'url', 'date_posted', 'date_applied', 'cv_path', 'cover_letter_path', 'status', 'notes']
     updates = {field: data.get(field, dict(application)[field]) for field in fields}
     
+    # Always update the last_updated timestamp
+    updates['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    updates['salary_yearly_pln'] = to_yearly_pln(updates['salary_amount'], updates['salary_currency'], updates['salary_type'], rates=rates)
+    
+    # A new URL brings the snapshot (and profile) of that posting; otherwise
+    # the stored profile is kept except for the fields sent
+    url_changed = updates['url'] != application['url']
+    if url_changed:
+        snapshot = _posting_store().latest(conn, updates['url'])
+        updates['posting_hash'] = snapshot['content_hash'] if snapshot else None
+        profile = merge_profile(data, snapshot['analysis'] if snapshot else None)
+    else:
+        updates['posting_hash'] = application['posting_hash']
+        profile = merge_profile(data, read_profile(conn, app_id))
+    
     cursor = conn.cursor()
     cursor.execute('''
     UPDATE applications
-    SET company = ?, role = ?, salary = ?, url = ?, date_posted = ?, date_applied = ?, cv_path = ?
+    SET company = ?, role = ?, salary = ?, salary_amount = ?, salary_currency = ?, salary_type = ?, salary_yearly_pln = ?, url = ?, date_posted = ?, date_applied = ?, cv_path = ?, cover_letter_path = ?, status = ?, notes = ?, last_updated = ?, posting_hash = ?
     WHERE id = ?
-    ''', (updates['company'], updates['role'], updates['salary'], updates['url'],
-          updates['date_posted'], updates['date_applied'], updates['cv_path'], app_id))
+    ''', (updates['company'], updates['role'], updates['salary'], updates['salary_amount'], updates['salary_currency'], updates['salary_type'], updates['salary_yearly_pln'], updates['url'],
+          updates['date_posted'], updates['date_applied'], updates['cv_path'], updates['cover_letter_path'], 
+          updates['status'], updates['notes'], updates['last_updated'], updates['posting_hash'], app_id))
+    save_profile(conn, app_id, profile)
+    updates.update(profile)
+    if url_changed:
+        index_posting(conn, app_id, updates['url'], updates['posting_hash'])
     conn.commit()
-    conn.close()
     
     return jsonify({'id': app_id, **updates})
 
 @main_bp.route('/api/applications/<int:app_id>', methods=['DELETE'])
 def delete_application(app_id):
-    conn = get_db_connection()
+    conn = get_db()
     # Check if application exists
     application = conn.execute('SELECT * FROM applications WHERE id = ?', (app_id,)).fetchone()
     if application is None:
-        conn.close()
         return jsonify({'error': 'Application not found'}), 404
     
     cursor = conn.cursor()
     cursor.execute('DELETE FROM applications WHERE id = ?', (app_id,))
     conn.commit()
-    conn.close()
     
     return jsonify({'message': 'Application deleted successfully'})
 
+@main_bp.route('/api/application-statuses', methods=['GET'])
+@constant()
+def get_application_statuses():
+    # Return a list of possible application statuses (bulk import validates against the same list)
+    return jsonify(list(APPLICATION_STATUSES))
+
+@main_bp.route('/api/salary-currencies', methods=['GET'])
+@conditional(_rates_version)
+def get_salary_currencies():
+    # Currencies with a known exchange rate (base currency first)
+    return jsonify(list(rate_store.current().currencies))
+
+@main_bp.route('/api/exchange-rates', methods=['GET'])
+@conditional(_rates_version)
+def get_exchange_rates():
+    # Rates in PLN per unit, with their date and source (refresh: flask --app run refresh-rates)
+    return jsonify(rate_store.current().describe())
+
+@main_bp.route('/api/salary-types', methods=['GET'])
+@constant()
+def get_salary_types():
+    # Return a list of salary types
+    types = [
+        'hourly',
+        'monthly',
+        'yearly'
+    ]
+    return jsonify(types)
+
+def parse_analysis_result(result):
+    """
+    Turn the output of process_job_posting_url into a response dict with
+    default values for the form fields. Raises ValueError on invalid JSON.
+    """
+    # If result is a string (JSON), parse it
+    if isinstance(result, str):
+        try:
+            result = json.loads(result)
+        except json.JSONDecodeError:
+            raise ValueError('Failed to parse LLM response')
+    
+    # Ensure required fields have default values
+    result.setdefault('company', '')
+    result.setdefault('role', '')
+    result.setdefault('salary', '')
+    result.setdefault('salary_amount', 0)
+    result.setdefault('salary_currency', 'PLN')
+    result.setdefault('salary_type', 'yearly')
+    result.setdefault('date_posted', '')
+    return result
+
 @main_bp.route('/api/analyze-url', methods=['POST'])
 def analyze_url():
     data = request.json
@@ -139,14 +357,409 @@ def analyze_url():
     if 'url' not in data:
         return jsonify({'error': 'URL is required'}), 400
     
-    # This is a placeholder for the LLM integration
-    # In a real implementation, this would call an LLM to analyze the job posting URL
-    # For now, return mock data
-    mock_analysis = {
-        'company': 'Example Company',
-        'role': 'Software Developer',
-        'salary': '$100,000 - $120,000',
-        'date_posted': datetime.now().strftime('%Y-%m-%d')
-    }
-    
-    return jsonify(mock_analysis)
+    try:
+        # Import the LLM utilities
+        from utils.llm_utils import process_job_posting_url
+        
+        # Process the URL
+        result = process_job_posting_url(data['url'], cache=_analysis_cache(), fetcher=_page_fetcher(), snapshots=_posting_store())
+        
+        try:
+            result = parse_analysis_result(result)
+        except ValueError as e:
+            # If parsing fails, return the error
+            return jsonify({'error': str(e)}), 500
+        
+        return jsonify(result)
+    except Exception as e:
+        print(f"Error in analyze_url: {str(e)}")
+        # Fallback to mock data if there's an error
+        mock_analysis = {
+            'company': 'Example Company',
+            'role': 'Software Developer',
+            'salary': '100,000 PLN per year',
+            'salary_amount': 100000,
+            'salary_currency': 'PLN',
+            'salary_type': 'yearly',
+            'date_posted': datetime.now().strftime('%Y-%m-%d'),
+            'error_message': str(e)
+        }
+        
+        return jsonify(mock_analysis)
+
+@main_bp.route('/api/analyze-url/stream', methods=['POST'])
+def analyze_url_stream():
+    # Server-sent events: one 'field' event per field as soon as it is known,
+    # then a final 'result' (same shape as /api/analyze-url) or 'error'
+    data = request.json or {}
+    
+    if 'url' not in data:
+        return jsonify({'error': 'URL is required'}), 400
+    
+    from utils.llm_utils import stream_job_posting_url
+    
+    def generate():
+        start = time.perf_counter()
+        first_field_ms = None
+        # Opening comment so proxies and the browser start delivering at once
+        yield ': stream open\n\n'
+        try:
+            for event, payload in stream_job_posting_url(data['url'], cache=_analysis_cache(), fetcher=_page_fetcher(), snapshots=_posting_store()):
+                if event == 'field':
+                    name, value = payload
+                    if first_field_ms is None:
+                        first_field_ms = (time.perf_counter() - start) * 1000
+                    yield format_sse('field', {'name': name, 'value': value})
+                elif event == 'result':
+                    result = parse_analysis_result(payload)
+                    result['timing'] = {
+                        'first_field_ms': first_field_ms,
+                        'total_ms': (time.perf_counter() - start) * 1000
+                    }
+                    yield format_sse('result', result)
+                else:
+                    yield format_sse('error', {'error': payload})
+        except Exception as e:
+            print(f"Error in analyze_url_stream: {str(e)}")
+            yield format_sse('error', {'error': str(e)})
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@main_bp.route('/api/jobs/analyze-url', methods=['POST'])
+def submit_analyze_url_job():
+    data = request.json or {}
+    
+    if 'url' not in data:
+        return jsonify({'error': 'URL is required'}), 400
+    
+    job_id = _job_queue().submit('analyze_url', {'url': data['url']})
+    return jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'poll_url': f'/api/jobs/{job_id}'
+    }), 202, {'Location': f'/api/jobs/{job_id}'}
+
+@main_bp.route('/api/jobs/metrics', methods=['GET'])
+def get_job_metrics():
+    return jsonify(_job_queue().metrics())
+
+@main_bp.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    # ?wait=N long-polls for up to N seconds until the job has finished
+    try:
+        wait = min(float(request.args.get('wait', 0)), current_app.config['JOB_MAX_WAIT'])
+    except ValueError:
+        return jsonify({'error': 'Invalid wait value'}), 400
+    
+    job_queue = _job_queue()
+    job_queue.ensure_started()
+    job = job_queue.wait(job_id, wait) if wait > 0 else job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(job)
+
+@main_bp.route('/api/analyze-urls', methods=['POST'])
+def analyze_urls():
+    data = request.json or {}
+    urls = data.get('urls')
+    
+    if not isinstance(urls, list) or not urls:
+        return jsonify({'error': 'urls must be a non-empty list'}), 400
+    config = current_app.config
+    if len(urls) > config['BATCH_MAX_URLS']:
+        return jsonify({'error': f"At most {config['BATCH_MAX_URLS']} URLs per batch"}), 400
+    if not all(isinstance(url, str) and url.strip() for url in urls):
+        return jsonify({'error': 'Every URL must be a non-empty string'}), 400
+    
+    # Concurrency knobs: integers, clamped to 1..the configured maximum
+    limits = {}
+    for name, setting in (('max_workers', 'BATCH_MAX_WORKERS'), ('per_host', 'BATCH_PER_HOST')):
+        value = data.get(name, config[setting])
+        try:
+            if isinstance(value, (bool, float)):
+                raise ValueError
+            value = int(value)
+        except (TypeError, ValueError):
+            return jsonify({'error': f'{name} must be an integer'}), 400
+        limits[name] = max(1, min(value, config[setting]))
+    max_workers, per_host = limits['max_workers'], limits['per_host']
+    
+    from utils.llm_utils import process_job_posting_url
+    
+    # Batch threads run outside the app context; resolve the services here
+    analysis_cache = _analysis_cache()
+    page_fetcher = _page_fetcher()
+    posting_store = _posting_store()
+    
+    def process(url):
+        return parse_analysis_result(process_job_posting_url(url, cache=analysis_cache, fetcher=page_fetcher,
+                                                             snapshots=posting_store))
+    
+    def generate():
+        # One NDJSON line per input URL as soon as its (possibly shared) result is ready
+        errors = 0
+        unique = 0
+        for key, indexes, url, result, error, elapsed_ms in run_batch(urls, process, max_workers, per_host):
+            unique += 1
+            if error is None and 'error' in result:
+                error = result['error']
+            if error is not None:
+                errors += len(indexes)
+            for index in indexes:
+                line = {
+                    'index': index,
+                    'url': urls[index],
+                    'normalized_url': key,
+                    'status': 'error' if error else 'ok',
+                    'elapsed_ms': round(elapsed_ms, 1)
+                }
+                if error:
+                    line['error'] = error
+                else:
+                    line['result'] = result
+                yield json.dumps(line) + '\n'
+        yield json.dumps({'done': True, 'total': len(urls), 'unique': unique, 'errors': errors}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@main_bp.route('/api/calculate-yearly-salary', methods=['POST'])
+def calculate_yearly_salary():
+    data = request.json
+    
+    # Validate required fields
+    required_fields = ['amount', 'currency', 'type']
+    for field in required_fields:
+        if field not in data:
+            print(f"[ERROR] Missing required field: {field}")
+            return jsonify({'error': f'Missing required field: {field}'}), 400
+    
+    try:
+        # Same conversion as the stored salary_yearly_pln column
+        rates = rate_store.current()
+        if not isinstance(data['currency'], str) or data['currency'] not in rates.currencies:
+            return jsonify({'error': f"currency must be one of {', '.join(rates.currencies)}"}), 400
+        if not isinstance(data['type'], str) or data['type'] not in PERIODS_PER_YEAR:
+            return jsonify({'error': f"type must be one of {', '.join(PERIODS_PER_YEAR)}"}), 400
+        yearly = to_yearly_pln(data['amount'], data['currency'], data['type'], rates=rates)
+        if yearly is None:
+            return jsonify({'error': 'amount must be a finite number'}), 400
+        return jsonify(salary_breakdown(yearly, rates=rates))
+    except Exception as e:
+        print(f"[ERROR] Error calculating salary: {str(e)}")
+        return jsonify({'error': f'Error calculating salary: {str(e)}'}), 500
+
+@main_bp.route('/api/calculate-salaries', methods=['POST'])
+def calculate_salaries():
+    # Batch version of /api/calculate-yearly-salary: {"items": [{"amount", "currency", "type"}, ...]}
+    data = request.json or {}
+    items = data.get('items')
+    
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return jsonify({'error': 'items must be a list of {amount, currency, type} objects'}), 400
+    if len(items) > current_app.config['SALARY_BATCH_MAX']:
+        return jsonify({'error': f"At most {current_app.config['SALARY_BATCH_MAX']} items per request"}), 400
+    
+    rates = rate_store.current()
+    yearly = to_yearly_pln_batch(
+        [item.get('amount') for item in items],
+        [item.get('currency', 'PLN') for item in items],
+        [item.get('type', 'yearly') for item in items],
+        rates=rates
+    )
+    # Columnar response: every leaf of the single-item layout is a list with one
+    # value per item (null where the amount is not a finite number or the currency is unknown)
+    breakdown = salary_breakdown_batch(yearly, rates=rates)
+    return jsonify({
+        'count': len(items),
+        'invalid': [index for index, value in enumerate(breakdown['yearly']['PLN']) if value is None],
+        'breakdown': breakdown
+    })
+
+@main_bp.route('/api/stats', methods=['GET'])
+@conditional(_applications_version)
+def get_stats():
+    # Summary tables are kept current by triggers; no full-table aggregation here
+    return jsonify(read_stats(get_db()))
+
+def _count_limit():
+    try:
+        return max(1, min(int(request.args.get('limit', 20)), 500))
+    except ValueError:
+        return 20
+
+@main_bp.route('/api/stats/skills', methods=['GET'])
+@conditional(_applications_version)
+def get_skill_stats():
+    # Most requested skills, grouped from the application_skills skill index
+    return jsonify(skill_counts(get_db(), _count_limit()))
+
+@main_bp.route('/api/stats/locations', methods=['GET'])
+@conditional(_applications_version)
+def get_location_stats():
+    return jsonify(location_counts(get_db(), _count_limit()))
+
+@main_bp.route('/api/health/db', methods=['GET'])
+def db_health():
+    # Connection pool hit/miss counters
+    return jsonify(get_pool().stats())
+
+@main_bp.route('/api/health/startup', methods=['GET'])
+def startup_health():
+    # Cold-start timings recorded by create_app (first_request_ms is null until then)
+    return jsonify(current_app.extensions['startup'])
+
+@main_bp.route('/api/health/http-cache', methods=['GET'])
+def http_cache_health():
+    # 304 (not modified) versus full responses per cached endpoint
+    return jsonify(conditional_stats.summary())
+
+@main_bp.route('/api/health/uploads', methods=['GET'])
+def uploads_health():
+    # Blob count, stored vs uploaded bytes and unreferenced blobs awaiting gc-uploads
+    return jsonify(_blob_store().stats())
+
+@main_bp.route('/api/health/analysis-cache', methods=['GET'])
+def analysis_cache_health():
+    return jsonify(_analysis_cache().stats())
+
+@main_bp.route('/api/health/scraper', methods=['GET'])
+def scraper_health():
+    # Conditional request counters for the shared scraping session
+    return jsonify(_page_fetcher().stats())
+
+@main_bp.route('/api/health/extraction', methods=['GET'])
+def extraction_health():
+    # Per-domain hit rate of the structured (pre-LLM) extraction stage
+    from utils.llm_utils import extraction_stats
+    return jsonify(extraction_stats.summary())
+
+@main_bp.route('/api/health/llm', methods=['GET'])
+def llm_health_status():
+    # Reads the state maintained by the background probe; never probes inline
+    from utils.llm_backend_utils import llm_metrics
+    from utils.llm_utils import compaction_stats, llm_backend, llm_health
+    llm_health.ensure_started()
+    status = llm_health.status()
+    status['backend'] = llm_backend.describe()
+    status['backends'] = llm_metrics.summary()
+    status['prompt_compaction'] = compaction_stats.summary()
+    return jsonify(status), 200 if status['healthy'] else 503
+
+@main_bp.route('/api/test-openai', methods=['GET'])
+def test_openai():
+    try:
+        # Use the configured completion backend (OpenAI unless LLM_BACKEND says otherwise)
+        from utils.llm_utils import llm_backend
+        
+        # Make a simple API call
+        response = llm_backend.complete(
+            [
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": "Say hello world!"}
+            ],
+            max_tokens=50
+        )
+        
+        # Return the response
+        return jsonify({
+            'status': 'success',
+            'message': f'{llm_backend.name} API call successful',
+            'backend': llm_backend.describe(),
+            'response': response
+        })
+    except Exception as e:
+        import traceback
+        return jsonify({
+            'status': 'error',
+            'message': f'Error calling OpenAI API: {str(e)}',
+            # Tracebacks are only exposed when debugging
+            'traceback': traceback.format_exc() if current_app.debug else None
+        }), 500
+
+@main_bp.route('/api/upload-file', methods=['POST'])
+def upload_file():
+    # Check if a file was included in the request
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file part in the request'}), 400
+    
+    file = request.files['file']
+    file_type = request.form.get('type', 'cv')  # Default to CV if not specified
+    
+    # If user submits an empty form
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+    
+    # Check if the file type is allowed
+    if file and allowed_file(file.filename):
+        # Secure the filename to prevent directory traversal attacks
+        filename = secure_filename(file.filename) or f"upload.{file.filename.rsplit('.', 1)[1].lower()}"
+        
+        # Stored once per content hash; re-uploading the same document writes nothing
+        saved = _blob_store().save(file.stream, filename)
+        # Text for the search index, extracted once per distinct file
+        index_document(get_db(), saved['sha256'], _blob_store().path_for(saved['sha256']), filename)
+        
+        # Return the path to be stored in the database (cv_path / cover_letter_path)
+        return jsonify({
+            'success': True,
+            'filename': filename,
+            'path': saved['path'],
+            'type': file_type,
+            'sha256': saved['sha256'],
+            'size': saved['size'],
+            'deduplicated': saved['deduplicated']
+        })
+    
+    return jsonify({'error': 'File type not allowed'}), 400
+
+@main_bp.route('/uploads/<path:subpath>', methods=['GET'])
+def download_file(subpath):
+    # Serves the paths stored in cv_path / cover_letter_path. Range and
+    # If-None-Match/If-Modified-Since are answered by send_file; the body is
+    # never read into Python (sendfile, X-Sendfile or X-Accel-Redirect).
+    ref = f"uploads/{subpath}"
+    store = _blob_store()
+    path = store.resolve(ref)
+    if path is None or not os.path.isfile(path):
+        return jsonify({'error': 'File not found'}), 404
+
+    blob = parse_blob_ref(ref)
+    filename = os.path.basename(blob[1] if blob else path)
+    sha256 = store.content_hash(ref, path)
+    etag = sha256
+    extension = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+    compressible = extension in COMPRESSIBLE_EXTENSIONS
+    compressed = compressible and request.args.get('compress') != '0' and 'gzip' in request.accept_encodings
+    if compressed:
+        path = store.compressed_path(sha256, path)
+        etag = f"{sha256}-gzip"
+
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    response = send_file(path, mimetype=mimetype, download_name=filename,
+                         as_attachment=request.args.get('download') == '1', etag=etag)
+    accel_prefix = current_app.config['X_ACCEL_REDIRECT_PREFIX']
+    if accel_prefix and response.status_code in (200, 206):
+        # nginx sends the file (and applies the Range itself); only the headers come from here
+        response.close()
+        headers = [(name, value) for name, value in response.headers if name not in ('Content-Length', 'Content-Range')]
+        response = current_app.response_class(headers=headers)
+        relative = os.path.relpath(path, current_app.config['UPLOAD_FOLDER']).replace(os.sep, '/')
+        response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{relative}"
+
+    if compressed:
+        response.content_encoding = 'gzip'
+    if compressible:
+        response.vary.add('Accept-Encoding')
+    if blob:
+        # The URL contains the content hash, so the response never changes
+        response.cache_control.no_cache = None
+        response.cache_control.private = True
+        response.cache_control.max_age = current_app.config['UPLOAD_CACHE_MAX_AGE']
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
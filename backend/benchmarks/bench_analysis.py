@@ -0,0 +1,122 @@
+"""
+Load-test the job posting analysis pipeline offline.
+
+Completions come from the replay backend (recorded responses in
+fixtures/llm/recordings.jsonl, served in turn) with injected latency, and
+pages from the saved HTML fixtures, so runs are repeatable and need no
+network or API key.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_analysis [--requests 60] [--concurrency 8]
+        [--latency-ms 1500] [--jitter-ms 300] [--chunk-ms 20] [--stream] [--force-llm]
+
+--force-llm requires every field to come from the LLM, which disables the
+structured-data shortcut; --stream measures time to the first field with the
+streaming pipeline.
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+FIXTURES_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'fixtures')
+
+
+class FixtureFetcher:
+    """
+    Serves https://<page>.bench.local/<n> from fixtures/html/<page>.html
+    """
+
+    def __init__(self):
+        self.pages = {}
+        for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, 'html', '*.html'))):
+            with open(path, encoding='utf-8') as f:
+                self.pages[os.path.basename(path)[:-len('.html')]] = f.read()
+
+    def urls(self, count):
+        names = sorted(self.pages)
+        return [f"https://{names[i % len(names)].replace('_', '-')}.bench.local/{i}" for i in range(count)]
+
+    def fetch(self, url):
+        return self.pages[url.split('//')[1].split('.')[0].replace('-', '_')]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=60)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency-ms', type=float, default=1500)
+    parser.add_argument('--jitter-ms', type=float, default=300)
+    parser.add_argument('--chunk-ms', type=float, default=20)
+    parser.add_argument('--stream', action='store_true')
+    parser.add_argument('--force-llm', action='store_true')
+    args = parser.parse_args()
+
+    # Backend selection is read when utils.llm_utils is imported
+    os.environ.update({
+        'LLM_BACKEND': 'replay',
+        'LLM_REPLAY_PATH': os.path.join(FIXTURES_DIR, 'llm', 'recordings.jsonl'),
+        'LLM_REPLAY_MATCH': 'sequential',
+        'LLM_REPLAY_LATENCY_MS': str(args.latency_ms),
+        'LLM_REPLAY_JITTER_MS': str(args.jitter_ms),
+        'LLM_REPLAY_CHUNK_MS': str(args.chunk_ms),
+    })
+    from utils.structured_utils import ANALYSIS_FIELDS
+    if args.force_llm:
+        os.environ['STRUCTURED_REQUIRED_FIELDS'] = ','.join(ANALYSIS_FIELDS)
+
+    from utils import llm_utils
+    from utils.llm_backend_utils import llm_metrics
+
+    fetcher = FixtureFetcher()
+
+    def run(url):
+        start = time.perf_counter()
+        first_field_ms = None
+        if args.stream:
+            for event, _ in llm_utils.stream_job_posting_url(url, fetcher=fetcher):
+                if event == 'field' and first_field_ms is None:
+                    first_field_ms = (time.perf_counter() - start) * 1000
+        else:
+            llm_utils.process_job_posting_url(url, fetcher=fetcher)
+        return (time.perf_counter() - start) * 1000, first_field_ms
+
+    # The pipeline logs every step; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(executor.map(run, fetcher.urls(args.requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies = [total for total, _ in results]
+    first_fields = [first for _, first in results if first is not None]
+    report = {
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'mode': 'stream' if args.stream else 'blocking',
+        'force_llm': args.force_llm,
+        'throughput_rps': args.requests / elapsed,
+        'p50_ms': percentile(latencies, 0.5),
+        'p95_ms': percentile(latencies, 0.95),
+        'p50_first_field_ms': percentile(first_fields, 0.5) if first_fields else None,
+        'backends': llm_metrics.summary(),
+        'extraction': llm_utils.extraction_stats.summary()
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
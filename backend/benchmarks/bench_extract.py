@@ -0,0 +1,120 @@
+"""
+Benchmark HTML-to-text extraction backends over saved job posting pages.
+
+Each backend runs in its own subprocess so peak RSS is measured in
+isolation. "legacy" is the original scrape_job_posting path
+(BeautifulSoup html.parser, script/style removal, regex whitespace
+collapse) for comparison.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_extract [--fixtures DIR] [--repeat 50] [--scale 1]
+
+--scale N concatenates the body of every page N times to simulate heavy
+job-board pages.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DEFAULT_FIXTURES = os.path.join(BACKEND_DIR, 'benchmarks', 'fixtures', 'html')
+
+
+def legacy_extract(html, main_content=False):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    for script in soup(["script", "style"]):
+        script.extract()
+    text = soup.get_text(separator=' ', strip=True)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def load_pages(fixtures, scale):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(fixtures, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        if scale > 1 and '<body' in html and '</body>' in html:
+            start = html.index('>', html.index('<body')) + 1
+            end = html.rindex('</body>')
+            html = html[:start] + html[start:end] * scale + html[end:]
+        pages.append((os.path.basename(path), html))
+    return pages
+
+
+def peak_rss_kb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return usage // 1024 if sys.platform == 'darwin' else usage
+
+
+def run_child(backend, fixtures, repeat, scale):
+    from utils.extract_utils import get_extractor
+    extractor = legacy_extract if backend == 'legacy' else get_extractor(backend)[1]
+    pages = load_pages(fixtures, scale)
+    baseline_kb = peak_rss_kb()
+
+    # Warm-up run so lazy imports are not counted as extraction time
+    for _, html in pages:
+        extractor(html, main_content=True)
+
+    per_page = {}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for name, html in pages:
+            page_start = time.perf_counter()
+            text = extractor(html, main_content=True)
+            per_page.setdefault(name, []).append((time.perf_counter() - page_start) * 1000)
+            per_page[name + ':chars'] = len(text)
+    total_ms = (time.perf_counter() - start) * 1000
+
+    print(json.dumps({
+        'backend': backend,
+        'ms_per_page': total_ms / (repeat * len(pages)),
+        'pages': {name: sum(v) / len(v) for name, v in per_page.items() if not name.endswith(':chars')},
+        'chars': {name[:-6]: v for name, v in per_page.items() if name.endswith(':chars')},
+        'peak_rss_kb': peak_rss_kb(),
+        'rss_delta_kb': peak_rss_kb() - baseline_kb
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.fixtures, args.repeat, args.scale)
+        return
+
+    from utils.extract_utils import available_extractors
+    backends = ['legacy'] + available_extractors()
+    pages = load_pages(args.fixtures, args.scale)
+    size_kb = sum(len(html.encode('utf-8')) for _, html in pages) / 1024
+    print(f"{len(pages)} pages ({size_kb:.0f} KB total, scale {args.scale}), {args.repeat} runs each\n")
+    print(f"{'backend':<12} {'ms/page':>10} {'peak RSS MB':>12} {'RSS delta MB':>13} {'chars':>8}")
+
+    for backend in backends:
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_extract', '--child', backend,
+             '--fixtures', args.fixtures, '--repeat', str(args.repeat), '--scale', str(args.scale)],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{backend:<12} {result['ms_per_page']:>10.3f} {result['peak_rss_kb'] / 1024:>12.1f} "
+              f"{result['rss_delta_kb'] / 1024:>13.1f} {sum(result['chars'].values()):>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Compare importing applications one POST /api/applications at a time with
+one bulk POST /api/applications/import, and time the streaming exports.
+
+Each import starts from a fresh throwaway database and goes through the
+Flask test client, so both paths pay for the validation, triggers and
+commits they would in production.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_import [--applications 2000]
+"""
+import argparse
+import contextlib
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+STATUSES = ['Applied', 'Phone Screen', 'Technical Interview', 'Offer', 'Rejected']
+SKILLS = ['Python', 'Django', 'Flask', 'SQL', 'Docker', 'Kubernetes', 'AWS', 'React', 'Go', 'Kafka']
+
+
+def make_rows(count, seed_value=0):
+    rng = random.Random(seed_value)
+    return [{
+        'company': f"Company {i % 300}",
+        'role': rng.choice(['Backend Developer', 'Data Engineer', 'Platform Engineer']),
+        'salary_amount': rng.randrange(8000, 30000, 500),
+        'salary_currency': rng.choice(['PLN', 'PLN', 'EUR']),
+        'salary_type': 'monthly',
+        'url': f"https://jobs.example/{i}",
+        'date_applied': f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        'status': rng.choice(STATUSES),
+        'notes': 'Imported from the old tracker',
+        'skills': ', '.join(rng.sample(SKILLS, 3)),
+    } for i in range(count)]
+
+
+def to_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+
+def fresh_client(tmp, name):
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import create_app
+        app = create_app({'DB_PATH': os.path.join(tmp, f'{name}.db'),
+                          'UPLOAD_FOLDER': os.path.join(tmp, 'uploads')})
+    return app.test_client()
+
+
+def timed(func):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--applications', type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.applications)
+    with tempfile.TemporaryDirectory() as tmp:
+        client = fresh_client(tmp, 'single')
+
+        def post_each():
+            for row in rows:
+                response = client.post('/api/applications', json=dict(row, skills=row['skills'].split(', ')))
+                assert response.status_code == 201, response.get_json()
+
+        single_ms, _ = timed(post_each)
+
+        client = fresh_client(tmp, 'bulk')
+        body = to_csv(rows)
+        bulk_ms, response = timed(lambda: client.post('/api/applications/import', data=body, content_type='text/csv'))
+        summary = response.get_json()
+        assert summary['inserted'] == len(rows), summary
+
+        print(f"Importing {len(rows)} applications")
+        print(f"  one POST per row       {single_ms:>9.0f} ms  ({len(rows) / single_ms * 1000:>8.0f} rows/s)")
+        print(f"  bulk CSV import        {bulk_ms:>9.0f} ms  ({len(rows) / bulk_ms * 1000:>8.0f} rows/s, "
+              f"{summary['chunks']} transactions)")
+
+        print(f"Exporting {len(rows)} applications")
+        for fmt in ('csv', 'jsonl', 'parquet'):
+            export_ms, response = timed(lambda: client.get('/api/applications/export', query_string={'format': fmt}))
+            if response.status_code != 200:
+                print(f"  {fmt:<22} {response.get_json()['error']}")
+                continue
+            print(f"  {fmt:<22} {export_ms:>9.0f} ms  ({len(response.data) / 1024:>8.0f} KiB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare salary conversion paths for a batch of (amount, currency, type).
+
+- per-request: one POST /api/calculate-yearly-salary per item (what the
+  form does today), through the Flask test client
+- scalar: to_yearly_pln + salary_breakdown per item in a Python loop
+- vectorized: to_yearly_pln_batch + salary_breakdown_batch (columnar output)
+- batch endpoint: a single POST /api/calculate-salaries
+
+Runs against a throwaway database; no server or network needed.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_salary [--items 10000] [--per-request-items 1000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from utils.rates_utils import DEFAULT_RATES  # noqa: E402
+from utils.salary_utils import (  # noqa: E402
+    PERIODS_PER_YEAR, salary_breakdown, salary_breakdown_batch, to_yearly_pln, to_yearly_pln_batch
+)
+
+
+def make_items(count, seed=0):
+    rng = random.Random(seed)
+    currencies = list(DEFAULT_RATES)
+    types = list(PERIODS_PER_YEAR)
+    return [{'amount': round(rng.uniform(20, 300000), 2), 'currency': rng.choice(currencies), 'type': rng.choice(types)}
+            for _ in range(count)]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def report(name, items, elapsed_ms):
+    print(f"  {name:<16} {elapsed_ms:10.1f} ms  {elapsed_ms * 1000 / items:8.2f} us/item  {items / elapsed_ms * 1000:12.0f} items/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--per-request-items', type=int, default=1000,
+                        help='items sent one request at a time (the slowest path)')
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    amounts = [item['amount'] for item in items]
+    currencies = [item['currency'] for item in items]
+    types = [item['type'] for item in items]
+
+    # Warm up imports (pandas/NumPy) outside the timed sections
+    salary_breakdown_batch(to_yearly_pln_batch(amounts[:10], currencies[:10], types[:10]))
+
+    scalar_ms, scalar = timed(lambda: [salary_breakdown(to_yearly_pln(a, c, t)) for a, c, t in zip(amounts, currencies, types)])
+    vector_ms, vector = timed(lambda: salary_breakdown_batch(to_yearly_pln_batch(amounts, currencies, types)))
+    worst = max(abs(s['yearly']['PLN'] - v) for s, v in zip(scalar, vector['yearly']['PLN']))
+
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        from app import create_app
+        client = create_app({'DB_PATH': os.path.join(tmp, 'applications.db'),
+                             'SALARY_BATCH_MAX': max(args.items, 1)}).test_client()
+        client.post('/api/calculate-yearly-salary', json=items[0])
+
+        sample = items[:args.per_request_items]
+        per_request_ms, _ = timed(lambda: [client.post('/api/calculate-yearly-salary', json=item) for item in sample])
+        batch_ms, response = timed(lambda: client.post('/api/calculate-salaries', json={'items': items}))
+    assert response.status_code == 200, response.get_json()
+
+    print(f"Salary conversion, {args.items} items (per-request path: {len(sample)} items)")
+    report('per-request', len(sample), per_request_ms)
+    report('scalar', args.items, scalar_ms)
+    report('vectorized', args.items, vector_ms)
+    report('batch endpoint', args.items, batch_ms)
+    print(f"Max |scalar - vectorized| yearly PLN difference: {worst:.3g}")
+
+
+if __name__ == '__main__':
+    main()
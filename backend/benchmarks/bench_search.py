@@ -0,0 +1,109 @@
+"""
+Compare full-text search with the FTS5 index against a LIKE scan over the
+same text (what searching notes, postings and documents would cost without
+the index).
+
+Seeds a throwaway database with synthetic applications, each with notes,
+posting text and an attached document text, then times /api/search through
+the Flask test client and the equivalent LIKE query.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_search [--applications 5000] [--repeat 50]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Terms the queries look for; each appears in a small share of the texts
+TERMS = ('python django flask kubernetes docker terraform aws azure gcp react typescript java spring kotlin '
+         'postgres redis kafka grpc rust golang scala spark airflow linux networking security payments '
+         'fintech startup remote hybrid warsaw krakow berlin senior junior lead platform backend frontend '
+         'observability microservices mentoring').split()
+
+QUERIES = ['kubernetes', 'terraform aws', 'kafka', '"platform engineer"', 'observ', 'payments senior remote']
+
+
+def make_vocabulary(rng, size=20000):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(size)]
+
+
+def make_text(rng, vocabulary, words, term_rate=0.005):
+    # Zipf-like filler (a few very common words, a long tail) with query terms mixed in
+    return ' '.join(rng.choice(TERMS) if rng.random() < term_rate
+                    else vocabulary[min(int(rng.paretovariate(1.2)) - 1, len(vocabulary) - 1)]
+                    for _ in range(words))
+
+
+def seed(conn, count, seed_value=0):
+    rng = random.Random(seed_value)
+    vocabulary = make_vocabulary(rng)
+    conn.executemany('''
+        INSERT INTO applications (company, role, url, status, notes, cv_path)
+        VALUES (?, ?, ?, 'Applied', ?, ?)
+    ''', [(f"Company {i}", f"{rng.choice(TERMS).title()} {rng.choice(('Engineer', 'Developer', 'Lead'))}",
+           f"https://jobs.example/{i}", make_text(rng, vocabulary, 30), '') for i in range(count)])
+    # Posting and document text as index_posting / the document trigger would store it
+    conn.executemany('UPDATE applications_fts SET posting = ?, documents = ? WHERE rowid = ?',
+                     [(make_text(rng, vocabulary, 400), make_text(rng, vocabulary, 300), row[0])
+                      for row in conn.execute('SELECT id FROM applications').fetchall()])
+    conn.commit()
+
+
+def timed(func, repeat):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def like_scan(conn, query):
+    words = [word.strip('"') for word in query.split()]
+    columns = ('company', 'role', 'notes', 'posting', 'documents')
+    clauses = ' AND '.join('(' + ' OR '.join(f"{column} LIKE ?" for column in columns) + ')' for _ in words)
+    params = [f"%{word}%" for word in words for _ in columns]
+    # Counting every match, like /api/search does for its total
+    return conn.execute(f'SELECT COUNT(*) FROM applications_fts WHERE {clauses}', params).fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--applications', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            from app import create_app
+            app = create_app({'DB_PATH': os.path.join(tmp, 'applications.db'),
+                              'UPLOAD_FOLDER': os.path.join(tmp, 'uploads')})
+        client = app.test_client()
+        pool = app.extensions['db_pool']
+        conn = pool.acquire()
+        try:
+            start = time.perf_counter()
+            seed(conn, args.applications)
+            seed_ms = (time.perf_counter() - start) * 1000
+
+            print(f"Search over {args.applications} applications (seeded and indexed in {seed_ms:.0f} ms)")
+            print(f"  {'query':<26} {'hits':>6} {'/api/search':>12} {'LIKE scan':>12}")
+            for query in QUERIES:
+                search_ms, response = timed(lambda: client.get('/api/search', query_string={'q': query}), args.repeat)
+                assert response.status_code == 200, response.get_json()
+                scan_ms, _ = timed(lambda: like_scan(conn, query), max(1, args.repeat // 10))
+                print(f"  {query:<26} {response.get_json()['total']:>6} {search_ms:>9.2f} ms {scan_ms:>9.2f} ms")
+        finally:
+            pool.release(conn)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Load-test the API under gunicorn at several worker counts (and optionally
+the Werkzeug development server for comparison).
+
+Each configuration starts its own server on a throwaway database seeded
+with applications, then keep-alive client threads request a mix of read
+endpoints for a fixed duration.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_serving [--workers 1 2 4] [--threads 4]
+        [--clients 16] [--duration 10] [--rows 500] [--dev]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (weight, path) of the request mix
+REQUEST_MIX = [
+    (5, '/api/applications?limit=50'),
+    (2, '/api/applications?limit=50&sort=monthly_salary&order=desc'),
+    (2, '/api/stats'),
+    (1, '/api/application-statuses'),
+    (1, '/api/health/db'),
+]
+
+
+def start_server(command, env, base_url):
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(base_url + '/api/health/db', timeout=1).status_code == 200:
+                return process
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"Server did not start: {' '.join(command)}")
+
+
+def seed(base_url, rows):
+    session = requests.Session()
+    statuses = ['Applied', 'Interview', 'Offer', 'Rejected']
+    for i in range(rows):
+        session.post(base_url + '/api/applications', json={
+            'company': f"Company {i % 97}",
+            'role': f"Engineer {i}",
+            'url': f"https://example.com/jobs/{i}",
+            'salary_amount': 5000 + (i * 37) % 20000,
+            'salary_type': 'monthly',
+            'status': statuses[i % len(statuses)],
+            'date_applied': f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}"
+        })
+
+
+def load(base_url, clients, duration):
+    paths = [path for weight, path in REQUEST_MIX for _ in range(weight)]
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(seed_value):
+        rng = random.Random(seed_value)
+        session = requests.Session()  # keep-alive connection per client
+        local, failed = [], 0
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                ok = session.get(base_url + rng.choice(paths), timeout=10).status_code == 200
+            except requests.RequestException:
+                ok = False
+            local.append((time.perf_counter() - start) * 1000)
+            failed += not ok
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': len(latencies) / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] if latencies else 0.0,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+    }
+
+
+def run(name, command, env, port, args):
+    base_url = f"http://127.0.0.1:{port}"
+    data_dir = tempfile.mkdtemp(prefix='jobapp-bench-')
+    env = dict(env, DB_PATH=os.path.join(data_dir, 'applications.db'))
+    process = start_server(command, env, base_url)
+    try:
+        seed(base_url, args.rows)
+        return dict(server=name, **load(base_url, args.clients, args.duration))
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--dev', action='store_true', help='also measure the Werkzeug development server')
+    args = parser.parse_args()
+
+    env = dict(os.environ, PORT=str(args.port), GUNICORN_ACCESS_LOG='/dev/null', FLASK_DEBUG='0')
+    results = []
+    if args.dev:
+        results.append(run('werkzeug (python run.py)', [sys.executable, 'run.py'], env, args.port, args))
+    for workers in args.workers:
+        worker_env = dict(env, GUNICORN_WORKERS=str(workers), GUNICORN_THREADS=str(args.threads))
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app']
+        results.append(run(f"gunicorn {workers}w x {args.threads}t", command, worker_env, args.port, args))
+
+    for result in results:
+        print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
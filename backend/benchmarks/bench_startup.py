@@ -0,0 +1,160 @@
+"""
+Measure database initialization cost at startup.
+
+Compares the legacy init_db (sqlite_master + PRAGMA table_info probing on
+every start) with the user_version migration runner, on a fresh database
+and on one that is already current.
+
+With --cold, also measures application cold start in fresh interpreters:
+time to import the app package, run create_app() and serve the first
+request. --record appends the cold-start medians (with the git revision) to
+a JSONL file so regressions show up between commits.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_startup [--runs 200] [--cold] [--cold-runs 10]
+        [--record benchmarks/results/startup.jsonl]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from utils.migration_utils import run_migrations  # noqa: E402
+
+
+def connect(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def legacy_init(path):
+    # Mirrors the pre-migration init_db: probe, ALTER as needed, commit
+    conn = connect(path)
+    cursor = conn.cursor()
+    table_exists = cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='applications'").fetchone()
+    if not table_exists:
+        cursor.execute('CREATE TABLE applications (id INTEGER PRIMARY KEY, company TEXT, role TEXT, salary TEXT, '
+                       'salary_amount REAL, salary_currency TEXT, salary_type TEXT, url TEXT, date_posted TEXT, '
+                       'date_applied TEXT, cv_path TEXT, cover_letter_path TEXT, status TEXT, notes TEXT, last_updated TEXT)')
+    else:
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(applications)').fetchall()]
+        for name in ('salary_amount', 'salary_currency', 'salary_type'):
+            if name not in columns:
+                cursor.execute(f'ALTER TABLE applications ADD COLUMN {name} TEXT')
+    conn.commit()
+    conn.close()
+
+
+def migrated_init(path):
+    conn = connect(path)
+    run_migrations(conn)
+    conn.close()
+
+
+def time_runs(func, path, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(path)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+# Run in a fresh interpreter per sample; prints one JSON line of timings
+COLD_START_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+app.test_client().get('/api/application-statuses')
+served = time.perf_counter()
+heavy = [name for name in ('openai', 'requests', 'bs4', 'lxml', 'selectolax', 'tiktoken') if name in sys.modules]
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (served - created) * 1000,
+    'total_ms': (served - start) * 1000,
+    'heavy_modules': heavy
+}))
+"""
+
+
+def cold_start(runs):
+    samples = []
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DB_PATH=os.path.join(tmp, 'applications.db'), FLASK_DEBUG='0')
+        # Every sample after the first starts against an already-migrated database
+        for _ in range(runs + 1):
+            output = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT], cwd=BACKEND_DIR, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            samples.append(json.loads(output.strip().splitlines()[-1]))
+    warm = samples[1:]
+    result = {key: statistics.median(sample[key] for sample in warm)
+              for key in ('import_ms', 'create_app_ms', 'first_request_ms', 'total_ms')}
+    result['first_run_total_ms'] = samples[0]['total_ms']
+    result['heavy_modules'] = warm[-1]['heavy_modules']
+    return result
+
+
+def record(path, result):
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                                  capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        revision = None
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(dict(result, timestamp=time.strftime('%Y-%m-%dT%H:%M:%S'), revision=revision)) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--cold', action='store_true', help='also measure app cold start in fresh interpreters')
+    parser.add_argument('--cold-runs', type=int, default=10)
+    parser.add_argument('--record', metavar='PATH', help='append the cold-start result to this JSONL file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, 'legacy.db')
+        migrated_path = os.path.join(tmp, 'migrated.db')
+
+        start = time.perf_counter()
+        migrated_init(migrated_path)
+        fresh_ms = (time.perf_counter() - start) * 1000
+        legacy_init(legacy_path)
+
+        legacy_median, legacy_max = time_runs(legacy_init, legacy_path, args.runs)
+        migrated_median, migrated_max = time_runs(migrated_init, migrated_path, args.runs)
+
+    print(f"Fresh database, all migrations: {fresh_ms:.2f} ms")
+    print(f"Current database over {args.runs} runs (median / max):")
+    print(f"  legacy probing init_db: {legacy_median:.3f} / {legacy_max:.3f} ms")
+    print(f"  user_version runner:    {migrated_median:.3f} / {migrated_max:.3f} ms")
+
+    if args.cold or args.record:
+        result = cold_start(args.cold_runs)
+        print(f"Cold start over {args.cold_runs} fresh interpreters (median):")
+        print(f"  import app package: {result['import_ms']:.1f} ms")
+        print(f"  create_app():       {result['create_app_ms']:.1f} ms")
+        print(f"  first request:      {result['first_request_ms']:.1f} ms")
+        print(f"  total:              {result['total_ms']:.1f} ms (first run, fresh database: {result['first_run_total_ms']:.1f} ms)")
+        print(f"  heavy modules loaded: {', '.join(result['heavy_modules']) or 'none'}")
+        if args.record:
+            record(args.record, result)
+            print(f"Recorded to {args.record}")
+
+
+if __name__ == '__main__':
+    main()
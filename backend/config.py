@@ -1,7 +1,67 @@
 import os
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-key-for-development-only')
-    DEBUG = os.environ.get('FLASK_DEBUG', 'True') == 'True'
-    UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
+    DEBUG = os.environ.get('FLASK_DEBUG', '0').lower() in ('1', 'true', 'yes')
+
+    # SQLite database and connection pool (DB_BUSY_TIMEOUT: seconds a writer
+    # waits for the lock held by another thread or worker process)
+    DB_PATH = os.environ.get('DB_PATH', os.path.join(BASE_DIR, 'data', 'applications.db'))
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+    DB_BUSY_TIMEOUT = float(os.environ.get('DB_BUSY_TIMEOUT', 5))
+
+    # File uploads
+    UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max upload size
+    ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt', 'rtf'}
+
+    # File downloads. Without a proxy, gunicorn streams files with sendfile().
+    # USE_X_SENDFILE hands the transfer to Apache/lighttpd (X-Sendfile header);
+    # X_ACCEL_REDIRECT_PREFIX (e.g. /protected-uploads/) to an nginx internal
+    # location aliased to UPLOAD_FOLDER. Blob downloads are immutable and kept
+    # by the browser for UPLOAD_CACHE_MAX_AGE seconds.
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', '0').lower() in ('1', 'true', 'yes')
+    X_ACCEL_REDIRECT_PREFIX = os.environ.get('X_ACCEL_REDIRECT_PREFIX', '')
+    UPLOAD_CACHE_MAX_AGE = int(os.environ.get('UPLOAD_CACHE_MAX_AGE', 365 * 24 * 3600))
+
+    # Analysis cache (in-process LRU backed by the analysis_cache table)
+    ANALYSIS_CACHE_TTL = int(os.environ.get('ANALYSIS_CACHE_TTL', 7 * 24 * 3600))
+    ANALYSIS_CACHE_URL_TTL = int(os.environ.get('ANALYSIS_CACHE_URL_TTL', 3600))
+    ANALYSIS_CACHE_MEMORY_SIZE = int(os.environ.get('ANALYSIS_CACHE_MEMORY_SIZE', 256))
+    ANALYSIS_CACHE_MAX_ROWS = int(os.environ.get('ANALYSIS_CACHE_MAX_ROWS', 5000))
+
+    # Scraping session
+    SCRAPE_TIMEOUT = float(os.environ.get('SCRAPE_TIMEOUT', 10))
+    HTTP_CACHE_MAX_ROWS = int(os.environ.get('HTTP_CACHE_MAX_ROWS', 2000))
+
+    # Days an analyzed posting's text is kept when no application refers to it
+    POSTING_SNAPSHOT_RETENTION = float(os.environ.get('POSTING_SNAPSHOT_RETENTION_DAYS', 30)) * 24 * 3600
+
+    # Bulk import/export: rows per import transaction and per export read
+    IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 500))
+    EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 1000))
+
+    # Background job queue
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+    JOB_TIMEOUT = float(os.environ.get('JOB_TIMEOUT', 120))
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+    JOB_RETRY_BACKOFF = float(os.environ.get('JOB_RETRY_BACKOFF', 5))
+    JOB_RETENTION = float(os.environ.get('JOB_RETENTION_DAYS', 7)) * 24 * 3600  # finished jobs are deleted after this
+    JOB_MAX_WAIT = 30  # seconds a GET /api/jobs/<id>?wait= long-poll may block
+
+    # Browser cache lifetime (seconds) of the fixed status and salary type lists
+    CONSTANT_LIST_MAX_AGE = int(os.environ.get('CONSTANT_LIST_MAX_AGE', 24 * 3600))
+
+    # Exchange rates: seconds between checks for rates refreshed by another
+    # process; RATES_LOADER / RATES_FILE select the feed for flask refresh-rates
+    RATES_CHECK_INTERVAL = float(os.environ.get('RATES_CHECK_INTERVAL', 60))
+
+    # Maximum items per /api/calculate-salaries request
+    SALARY_BATCH_MAX = int(os.environ.get('SALARY_BATCH_MAX', 10000))
+
+    # Batch analysis limits for /api/analyze-urls
+    BATCH_MAX_URLS = int(os.environ.get('BATCH_MAX_URLS', 500))
+    BATCH_MAX_WORKERS = int(os.environ.get('BATCH_MAX_WORKERS', 8))
+    BATCH_PER_HOST = int(os.environ.get('BATCH_PER_HOST', 2))
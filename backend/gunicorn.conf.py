@@ -0,0 +1,56 @@
+# Gunicorn settings for the production entry point (wsgi.py).
+#
+#   gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Every value can be overridden through the environment variables below.
+# Graceful reload: `kill -HUP <master pid>` replaces the workers one by one
+# after they finish their in-flight requests (graceful_timeout). With
+# preload_app the code is loaded once in the master, so a code change needs
+# `kill -USR2` (start a new master) followed by `kill -QUIT` of the old one.
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+
+# Pre-forked worker processes, each serving requests on a thread pool.
+# Threads matter here: SSE streams, job long-polls and LLM calls keep a
+# request open for seconds while waiting on I/O.
+workers = int(os.environ.get('GUNICORN_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+# Load the app (and run the schema migrations) once in the master before
+# forking. Connection pools, job queue threads and health probes are
+# per-process and are recreated lazily in each worker (they check the pid).
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+# LLM analysis can take up to LLM_REQUEST_TIMEOUT (60s) plus scraping
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+# Keep-alive for clients talking to gunicorn directly (the React dev server
+# polls the API); keep below the idle timeout of any proxy in front
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers periodically (jittered so they don't restart together) to
+# bound memory growth of long-lived in-process caches
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+# Bound request sizes; uploads are limited separately by MAX_CONTENT_LENGTH
+limit_request_line = 8190
+limit_request_fields = 100
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    server.log.info(f"Serving with {workers} workers x {threads} threads ({worker_class}), keepalive {keepalive}s")
+
+
+def post_fork(server, worker):
+    # SQLite: every worker opens its own connections (WAL mode lets readers
+    # run alongside the single writer; writers wait up to DB_BUSY_TIMEOUT)
+    server.log.info(f"Worker {worker.pid} started")
@@ -1,6 +1,15 @@
-from backend.app import create_app
+"""
+Development server: python run.py (production: see wsgi.py)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
 
 app = create_app()
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # The interactive debugger allows arbitrary code execution; never enable it on a reachable host
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)), debug=app.config['DEBUG'])
@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+from utils.cache_utils import normalize_url
+
+
+def run_batch(urls, process, max_workers=8, per_host=2):
+    """
+    Run process(url) for a batch of URLs and yield results as they finish.
+
+    Identical URLs (after normalization) are processed once. At most
+    max_workers calls run at the same time and at most per_host of them
+    target the same host; URLs waiting on a busy host never occupy a worker.
+
+    Yields (key, indexes, url, result, error, elapsed_ms) per unique URL,
+    where indexes are the positions of every input URL sharing that key.
+    """
+    groups = OrderedDict()  # normalized URL -> input positions
+    originals = {}
+    for index, url in enumerate(urls):
+        key = normalize_url(url)
+        groups.setdefault(key, []).append(index)
+        originals.setdefault(key, url)
+
+    # Per-host queues, served round-robin so one slow board can't hog the pool
+    pending = OrderedDict()
+    for key in groups:
+        host = urlsplit(key).hostname or ''
+        pending.setdefault(host, deque()).append(key)
+    active_per_host = {host: 0 for host in pending}
+
+    def timed(url):
+        start = time.perf_counter()
+        try:
+            return process(url), None, (time.perf_counter() - start) * 1000
+        except Exception as e:
+            return None, str(e), (time.perf_counter() - start) * 1000
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analyze-batch')
+    running = {}  # future -> (key, host)
+
+    def fill():
+        progress = True
+        while len(running) < max_workers and progress:
+            progress = False
+            for host, queue in pending.items():
+                if len(running) >= max_workers:
+                    break
+                if queue and active_per_host[host] < per_host:
+                    key = queue.popleft()
+                    active_per_host[host] += 1
+                    running[executor.submit(timed, originals[key])] = (key, host)
+                    progress = True
+
+    try:
+        fill()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, host = running.pop(future)
+                active_per_host[host] -= 1
+                result, error, elapsed_ms = future.result()
+                yield key, groups[key], originals[key], result, error, elapsed_ms
+            fill()
+    finally:
+        # Also reached when the client disconnects mid-stream
+        executor.shutdown(wait=False, cancel_futures=True)
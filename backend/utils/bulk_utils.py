@@ -0,0 +1,436 @@
+"""
+Bulk import and export of applications.
+
+Import reads CSV or JSONL as a stream and validates every row. Valid rows go
+in with one executemany per chunk of rows and one transaction per chunk, so
+importing a spreadsheet costs a few commits instead of one request and
+fsync per application. Invalid rows are skipped and reported with their
+line number. Triggers keep stats, search, change counters and upload
+reference counts current, as they do for single inserts.
+
+Export walks the applications in id order with fetchmany() and yields CSV
+or JSONL text chunk by chunk. Parquet is written one row group per chunk
+through pandas and pyarrow (imported on first use) into a sink that is
+drained after every row group. Memory stays at one chunk in every format.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+
+from utils.posting_utils import PROFILE_FIELDS, merge_profile, save_profile
+from utils.query_utils import build_filters
+from utils.rates_utils import rate_store
+from utils.salary_utils import PERIODS_PER_YEAR, to_yearly_pln
+
+APPLICATION_STATUSES = (
+    'Applied',
+    'Phone Screen',
+    'Technical Interview',
+    'Onsite Interview',
+    'Offer',
+    'Rejected',
+    'Withdrawn',
+    'Not Interested',
+)
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# Columns an import may set, in INSERT order; id and salary_yearly_pln are
+# assigned by the database and the importer
+IMPORT_COLUMNS = (
+    'company', 'role', 'salary', 'salary_amount', 'salary_currency', 'salary_type', 'url',
+    'date_posted', 'date_applied', 'cv_path', 'cover_letter_path', 'status', 'notes', 'last_updated',
+)
+REQUIRED_COLUMNS = ('company', 'role')
+# Profile columns last, skills at the very end (exporters rely on it)
+EXPORT_COLUMNS = ('id', *IMPORT_COLUMNS, 'salary_yearly_pln', 'experience', 'location', 'skills')
+
+IMPORT_CHUNK_SIZE = 500
+EXPORT_CHUNK_SIZE = 1000
+
+# Per-row errors listed in an import summary (all of them are counted)
+MAX_REPORTED_ERRORS = 1000
+
+MAX_TEXT_LENGTH = 100000
+
+_INSERT_SQL = f'''
+    INSERT INTO applications ({', '.join(IMPORT_COLUMNS)}, salary_yearly_pln)
+    VALUES ({', '.join('?' for _ in IMPORT_COLUMNS)}, ?)
+'''
+
+# The export query joins skill names with the unit separator, which no name
+# contains; CSV cells list them comma separated, quoting names with commas
+_SKILL_SEPARATOR = '\x1f'
+
+_EXPORT_SQL = f'''
+    SELECT {', '.join(f'a.{column}' for column in EXPORT_COLUMNS[:-3])}, a.experience,
+           (SELECT name FROM locations WHERE id = a.location_id) AS location,
+           (SELECT group_concat(name, char(31)) FROM (
+               SELECT s.name FROM application_skills x JOIN skills s ON s.id = x.skill_id
+               WHERE x.application_id = a.id ORDER BY s.name
+           )) AS skills
+    FROM applications a
+    {{where}}
+    ORDER BY a.id
+'''
+
+
+class BulkError(ValueError):
+    """
+    Raised when an import or export request as a whole is invalid
+    """
+
+
+def detect_format(requested, filename='', content_type=''):
+    """
+    Import format from an explicit format parameter, the file extension or
+    the content type
+    """
+    if requested:
+        if requested not in IMPORT_FORMATS:
+            raise BulkError(f"Invalid format: {requested}. Allowed: {', '.join(IMPORT_FORMATS)}")
+        return requested
+    extension = filename.rsplit('.', 1)[1].lower() if '.' in (filename or '') else ''
+    if extension == 'csv' or 'csv' in (content_type or ''):
+        return 'csv'
+    if extension in ('jsonl', 'ndjson') or 'ndjson' in (content_type or '') or 'jsonl' in (content_type or ''):
+        return 'jsonl'
+    raise BulkError('Cannot tell the import format (csv or jsonl) from the file name or content type')
+
+
+def read_rows(stream, fmt):
+    """
+    Yield (line, row, error) for every record of a binary CSV/JSONL stream;
+    row is a dict, or None when the record could not be parsed
+    """
+    if isinstance(stream, io.RawIOBase):
+        stream = io.BufferedReader(stream)
+    # utf-8-sig drops the byte order mark spreadsheet programs put in CSV files
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        if fmt == 'csv':
+            reader = csv.DictReader(text)
+            missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or ())]
+            if missing:
+                raise BulkError(f"CSV header is missing required columns: {', '.join(missing)}")
+            start = reader.line_num + 1
+            for row in reader:
+                # Quoted fields may span lines; report where the record starts
+                line, start = start, reader.line_num + 1
+                if None in row:
+                    yield line, None, f'{len(row[None])} more fields than the header'
+                else:
+                    yield line, row, None
+        else:
+            for line, record in enumerate(text, 1):
+                if not record.strip():
+                    continue
+                try:
+                    row = json.loads(record)
+                except ValueError as e:
+                    yield line, None, f'invalid JSON: {e}'
+                    continue
+                if isinstance(row, dict):
+                    yield line, row, None
+                else:
+                    yield line, None, 'expected a JSON object'
+    except UnicodeDecodeError:
+        raise BulkError('Import data must be UTF-8 encoded')
+    except csv.Error as e:
+        raise BulkError(f'Malformed CSV: {e}')
+    finally:
+        text.detach()
+
+
+def _text(row, column, errors):
+    value = row.get(column)
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list, bool)):
+        errors.append(f'{column} must be text')
+        return ''
+    value = str(value).strip()
+    if len(value) > MAX_TEXT_LENGTH:
+        errors.append(f'{column} is longer than {MAX_TEXT_LENGTH} characters')
+    return value
+
+
+def validate_row(row, rates, now):
+    """
+    Check one imported record and fill in the defaults add_application uses.
+    Returns (values in IMPORT_COLUMNS order + salary_yearly_pln, profile or
+    None, errors).
+    """
+    errors = []
+    data = {column: _text(row, column, errors) for column in IMPORT_COLUMNS if column != 'salary_amount'}
+
+    for column in REQUIRED_COLUMNS:
+        if not data[column]:
+            errors.append(f'{column} is required')
+
+    amount = row.get('salary_amount')
+    if amount is None or (isinstance(amount, str) and not amount.strip()):
+        amount = 0
+    elif isinstance(amount, bool):
+        errors.append('salary_amount must be a number')
+        amount = 0
+    else:
+        try:
+            amount = float(amount.replace(' ', '') if isinstance(amount, str) else amount)
+            if amount < 0 or amount != amount or amount in (float('inf'), float('-inf')):
+                raise ValueError
+        except (TypeError, ValueError):
+            errors.append(f'salary_amount must be a non-negative number, got {row.get("salary_amount")!r}')
+            amount = 0
+
+    data['salary_currency'] = data['salary_currency'].upper() or 'PLN'
+    if data['salary_currency'] not in rates.currencies:
+        errors.append(f"unknown salary_currency {data['salary_currency']!r}")
+    data['salary_type'] = data['salary_type'].lower() or 'yearly'
+    if data['salary_type'] not in PERIODS_PER_YEAR:
+        errors.append(f"salary_type must be one of {', '.join(PERIODS_PER_YEAR)}")
+
+    data['status'] = data['status'] or 'Applied'
+    if data['status'] not in APPLICATION_STATUSES:
+        errors.append(f"unknown status {data['status']!r}")
+
+    data['date_applied'] = data['date_applied'] or now.strftime('%Y-%m-%d')
+    for column in ('date_posted', 'date_applied'):
+        if data[column]:
+            try:
+                datetime.strptime(data[column], '%Y-%m-%d')
+            except ValueError:
+                errors.append(f'{column} must be a YYYY-MM-DD date')
+    data['last_updated'] = data['last_updated'] or now.strftime('%Y-%m-%d %H:%M:%S')
+
+    # Only references into the upload folder; the files themselves are not imported
+    for column in ('cv_path', 'cover_letter_path'):
+        if data[column] and not data[column].startswith('uploads/'):
+            errors.append(f'{column} must be empty or an uploads/ path')
+
+    profile = None
+    if any(row.get(field) not in (None, '', []) for field in PROFILE_FIELDS):
+        profile = merge_profile(dict(row, skills=parse_skills(row['skills'])) if 'skills' in row else row)
+
+    data['salary_amount'] = amount
+    values = tuple(data[column] for column in IMPORT_COLUMNS)
+    yearly = to_yearly_pln(amount, data['salary_currency'], data['salary_type'], rates=rates)
+    return values + (yearly,), profile, errors
+
+
+def _insert_chunk(conn, rows):
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        conn.executemany(_INSERT_SQL, [values for values, _ in rows])
+        # Rows inserted in one write transaction get consecutive ids
+        first_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0] - len(rows) + 1
+        for offset, (_, profile) in enumerate(rows):
+            if profile is not None:
+                save_profile(conn, first_id + offset, profile)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def import_applications(conn, stream, fmt, chunk_size=IMPORT_CHUNK_SIZE, dry_run=False):
+    """
+    Validate and insert the records of a CSV/JSONL stream. Every chunk of
+    valid rows is committed on its own, so a failure part way keeps the
+    chunks before it. With dry_run nothing is written. Returns a summary
+    dict; raises BulkError when the input as a whole is unusable.
+    """
+    rates = rate_store.current()
+    now = datetime.now()
+    summary = {'format': fmt, 'rows': 0, 'inserted': 0, 'invalid': 0, 'chunks': 0, 'dry_run': dry_run, 'errors': []}
+    pending = []
+
+    def flush():
+        if pending and not dry_run:
+            _insert_chunk(conn, pending)
+            summary['inserted'] += len(pending)
+            summary['chunks'] += 1
+        pending.clear()
+
+    try:
+        for line, row, error in read_rows(stream, fmt):
+            summary['rows'] += 1
+            errors = [error] if error else []
+            if row is not None:
+                values, profile, errors = validate_row(row, rates, now)
+            if errors:
+                summary['invalid'] += 1
+                if len(summary['errors']) < MAX_REPORTED_ERRORS:
+                    summary['errors'].append({'line': line, 'errors': errors})
+                continue
+            pending.append((values, profile))
+            if len(pending) >= chunk_size:
+                flush()
+    except BulkError as e:
+        if summary['inserted']:
+            raise BulkError(f"{e} (after row {summary['rows']}; {summary['inserted']} rows before it were imported)")
+        raise
+    flush()
+
+    if summary['invalid'] > len(summary['errors']):
+        summary['errors_truncated'] = True
+    return summary
+
+
+def _export_query(args):
+    clauses, params = build_filters(args or {})
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    return _EXPORT_SQL.format(where=where), params
+
+
+def _iter_chunks(conn, sql, params, chunk_size):
+    cursor = conn.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield [tuple(row) for row in rows]
+
+
+def join_skills(names):
+    """
+    Skill names as one CSV cell: comma separated, names containing a comma
+    or quote quoted CSV-style (Django, "C, C++")
+    """
+    return ', '.join('"' + name.replace('"', '""') + '"' if ',' in name or '"' in name else name for name in names)
+
+
+def parse_skills(value):
+    """
+    Inverse of join_skills for text cells; lists (JSONL) pass through
+    """
+    if not isinstance(value, str):
+        return value
+    return next(csv.reader([value], skipinitialspace=True), [])
+
+
+def _split_skills(value):
+    # pandas reads a NULL group_concat as None or NaN
+    return value.split(_SKILL_SEPARATOR) if isinstance(value, str) and value else []
+
+
+# The exporters check the filters when called and return the generator, so a
+# bad parameter is reported before the response starts
+def export_csv(conn, args=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Generator of the filtered applications as CSV text, one chunk of rows at
+    a time (skills as written by join_skills, which import reads back)
+    """
+    sql, params = _export_query(args)
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for rows in _iter_chunks(conn, sql, params, chunk_size):
+            writer.writerows(row[:-1] + (join_skills(_split_skills(row[-1])),) for row in rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    return generate()
+
+
+def export_jsonl(conn, args=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Generator of the filtered applications as JSON lines, skills as a list
+    """
+    sql, params = _export_query(args)
+
+    def generate():
+        for rows in _iter_chunks(conn, sql, params, chunk_size):
+            yield ''.join(
+                json.dumps(dict(zip(EXPORT_COLUMNS, row[:-1] + (_split_skills(row[-1]),))), ensure_ascii=False) + '\n'
+                for row in rows
+            )
+
+    return generate()
+
+
+class _DrainSink:
+    # Write-only file object for pyarrow; the generator empties it after every row group
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def parquet_schema():
+    import pyarrow as pa
+
+    types = {'id': pa.int64(), 'salary_amount': pa.float64(), 'salary_yearly_pln': pa.float64(),
+             'skills': pa.list_(pa.string())}
+    return pa.schema([(column, types.get(column, pa.string())) for column in EXPORT_COLUMNS])
+
+
+def export_parquet(conn, args=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Generator of the filtered applications as a Parquet file, one row group
+    per chunk read by pandas. Raises BulkError when pyarrow is not installed.
+    """
+    try:
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise BulkError(f'Parquet export needs pandas and pyarrow: {e}')
+
+    sql, params = _export_query(args)
+    schema = parquet_schema()
+
+    def generate():
+        sink = _DrainSink()
+        # The schema is fixed up front so a chunk of all-empty values keeps its column types
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema, compression='snappy')
+        try:
+            for frame in pd.read_sql_query(sql, conn, params=params, chunksize=chunk_size):
+                frame['skills'] = frame['skills'].map(_split_skills)
+                # Old rows and PUT may have stored text in the numeric columns; it exports as null
+                for column in ('salary_amount', 'salary_yearly_pln'):
+                    frame[column] = pd.to_numeric(frame[column], errors='coerce')
+                writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    return generate()
+
+
+EXPORTERS = {
+    'csv': export_csv,
+    'jsonl': export_jsonl,
+    'parquet': export_parquet,
+}
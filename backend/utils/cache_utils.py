@@ -0,0 +1,196 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from and never change
+# the posting that is served
+TRACKING_PARAMS = {
+    'gclid', 'fbclid', 'dclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid',
+    'ref', 'ref_src', 'refid', 'referrer', 'source', 'src', 'trk', 'trkinfo',
+    'trackingid', 'tracking_id', 'si', 'igshid', '_hsenc', '_hsmi',
+}
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    """
+    Normalize a job posting URL so that equivalent links share a cache key:
+    lowercase scheme and host, default port and fragment dropped, tracking
+    parameters removed, remaining query parameters sorted
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or 'https'
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ''))
+
+
+def hash_content(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Two-level cache for job posting analysis results.
+
+    Level 1 is an in-process LRU keyed by normalized URL. Level 2 is the
+    analysis_cache SQLite table keyed by (normalized URL, content hash), so
+    results survive restarts and are shared between worker processes.
+
+    get_recent() answers from the URL alone while an entry is younger than
+    url_ttl, which skips the scrape as well as the LLM call. get() requires
+    the hash of freshly scraped text and is valid for the full ttl, so a
+    posting that was edited is re-analyzed.
+    """
+
+    def __init__(self, pool, ttl=7 * 24 * 3600, url_ttl=3600, memory_size=256, max_rows=5000):
+        self.pool = pool
+        self.ttl = ttl
+        self.url_ttl = url_ttl
+        self.memory_size = memory_size
+        self.max_rows = max_rows
+
+        self._memory = OrderedDict()  # url_key -> (content_hash, created_at, result)
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def _remember(self, url_key, content_hash, created_at, result):
+        with self._lock:
+            self._memory[url_key] = (content_hash, created_at, result)
+            self._memory.move_to_end(url_key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _memory_lookup(self, url_key, content_hash, max_age):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(url_key)
+            if entry is None:
+                return None
+            cached_hash, created_at, result = entry
+            if now - created_at > self.ttl:
+                del self._memory[url_key]
+                return None
+            if now - created_at > max_age or (content_hash and cached_hash != content_hash):
+                return None
+            self._memory.move_to_end(url_key)
+            self.memory_hits += 1
+            return result
+
+    def _db_lookup(self, url_key, content_hash, max_age):
+        now = time.time()
+        conn = self.pool.acquire()
+        try:
+            if content_hash:
+                row = conn.execute(
+                    'SELECT content_hash, created_at, result FROM analysis_cache '
+                    'WHERE url_key = ? AND content_hash = ? AND created_at >= ?',
+                    (url_key, content_hash, now - max_age)
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    'SELECT content_hash, created_at, result FROM analysis_cache '
+                    'WHERE url_key = ? AND created_at >= ? ORDER BY created_at DESC LIMIT 1',
+                    (url_key, now - max_age)
+                ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                'UPDATE analysis_cache SET last_accessed = ?, hits = hits + 1 WHERE url_key = ? AND content_hash = ?',
+                (now, url_key, row['content_hash'])
+            )
+            conn.commit()
+        finally:
+            self.pool.release(conn)
+
+        with self._lock:
+            self.db_hits += 1
+        self._remember(url_key, row['content_hash'], row['created_at'], row['result'])
+        return row['result']
+
+    def _lookup(self, url_key, content_hash, max_age):
+        result = self._memory_lookup(url_key, content_hash, max_age)
+        if result is None:
+            result = self._db_lookup(url_key, content_hash, max_age)
+        if result is None:
+            with self._lock:
+                self.misses += 1
+        return result
+
+    def get_recent(self, url_key):
+        """
+        Return the newest result for a URL if it is younger than url_ttl
+        """
+        return self._lookup(url_key, None, self.url_ttl)
+
+    def get(self, url_key, content_hash):
+        """
+        Return the result for this exact scraped content if it is within ttl
+        """
+        return self._lookup(url_key, content_hash, self.ttl)
+
+    def put(self, url_key, content_hash, result):
+        now = time.time()
+        self._remember(url_key, content_hash, now, result)
+
+        conn = self.pool.acquire()
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO analysis_cache (url_key, content_hash, result, created_at, last_accessed, hits) '
+                'VALUES (?, ?, ?, ?, ?, 0)',
+                (url_key, content_hash, result, now, now)
+            )
+            # TTL eviction, then trim to max_rows by least recent access
+            conn.execute('DELETE FROM analysis_cache WHERE created_at < ?', (now - self.ttl,))
+            conn.execute('''
+                DELETE FROM analysis_cache WHERE rowid IN (
+                    SELECT rowid FROM analysis_cache ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_rows,))
+            conn.commit()
+        finally:
+            self.pool.release(conn)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        conn = self.pool.acquire()
+        try:
+            conn.execute('DELETE FROM analysis_cache')
+            conn.commit()
+        finally:
+            self.pool.release(conn)
+
+    def stats(self):
+        conn = self.pool.acquire()
+        try:
+            rows = conn.execute('SELECT COUNT(*) FROM analysis_cache').fetchone()[0]
+        finally:
+            self.pool.release(conn)
+        with self._lock:
+            lookups = self.memory_hits + self.db_hits + self.misses
+            return {
+                'memory_entries': len(self._memory),
+                'memory_size': self.memory_size,
+                'db_rows': rows,
+                'max_rows': self.max_rows,
+                'ttl_seconds': self.ttl,
+                'url_ttl_seconds': self.url_ttl,
+                'memory_hits': self.memory_hits,
+                'db_hits': self.db_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.db_hits) / lookups if lookups else 0.0
+            }
@@ -0,0 +1,135 @@
+import os
+import queue
+import sqlite3
+import threading
+from flask import current_app, g
+
+# Pragmas applied once when a pooled connection is first opened
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,  # 256MB memory-mapped I/O
+    'cache_size': -16000,  # negative value = size in KiB (~16MB page cache)
+    'temp_store': 'MEMORY',
+}
+
+
+class ConnectionPool:
+    """
+    A small thread-safe pool of SQLite connections.
+
+    Connections are opened lazily with the pragmas applied once, handed out
+    with acquire() and returned with release(). Idle connections beyond
+    max_size are closed instead of being kept around.
+    """
+
+    def __init__(self, db_path, max_size=8, timeout=5.0, pragmas=None):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+    def _connect(self):
+        # check_same_thread is disabled because a connection may be released
+        # by a different thread than the one that opened it; the pool ensures
+        # only one thread uses a connection at a time.
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _check_fork(self):
+        # SQLite connections must not be shared across fork(); a worker
+        # process starts with an empty pool of its own.
+        if os.getpid() != self._pid:
+            with self._lock:
+                if os.getpid() != self._pid:
+                    self._idle = queue.LifoQueue(maxsize=self.max_size)
+                    self._pid = os.getpid()
+
+    def acquire(self):
+        """
+        Get a connection from the pool, opening a new one if none is idle
+        """
+        self._check_fork()
+        try:
+            conn = self._idle.get_nowait()
+            with self._lock:
+                self.hits += 1
+            return conn
+        except queue.Empty:
+            with self._lock:
+                self.misses += 1
+            return self._connect()
+
+    def release(self, conn):
+        """
+        Return a connection to the pool (any open transaction is rolled back)
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put_nowait(conn)
+        except (queue.Full, sqlite3.Error):
+            with self._lock:
+                self.discarded += 1
+            conn.close()
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'db_path': self.db_path,
+                'max_size': self.max_size,
+                'idle': self._idle.qsize(),
+                'hits': self.hits,
+                'misses': self.misses,
+                'discarded': self.discarded,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+
+def init_app(app, db_path, **pool_kwargs):
+    """
+    Attach a connection pool to the Flask app and return the connection
+    to the pool when each app context is torn down
+    """
+    pool = ConnectionPool(db_path, **pool_kwargs)
+    app.extensions['db_pool'] = pool
+    app.teardown_appcontext(close_db)
+    return pool
+
+
+def get_pool():
+    return current_app.extensions['db_pool']
+
+
+def get_db():
+    """
+    Get the connection bound to the current request, acquiring one on first use
+    """
+    if 'db' not in g:
+        g.db = get_pool().acquire()
+    return g.db
+
+
+def close_db(exception=None):
+    conn = g.pop('db', None)
+    if conn is not None:
+        get_pool().release(conn)
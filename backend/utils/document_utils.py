@@ -0,0 +1,120 @@
+"""
+Plain-text extraction from uploaded documents, for the search index.
+
+PDF text needs pypdf; DOCX is read with the standard library (it is a zip
+of XML parts), as are TXT and RTF. Legacy binary .doc files are not
+supported. Extraction runs once per stored blob (see search_utils), so the
+cost is paid at upload time, not at query time.
+"""
+import codecs
+import re
+import zipfile
+from xml.etree import ElementTree
+
+# Upper bound on indexed text per document; a CV is a few thousand characters
+MAX_DOCUMENT_CHARS = 200000
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Destination groups that carry no visible text ({\*\...} groups are ignorable by definition)
+RTF_SKIP_GROUPS = re.compile(r'\{(?:\\\*\\[a-zA-Z]+|\\(?:fonttbl|colortbl|stylesheet|info|pict|header|footer))[^{}]*(?:\{[^{}]*\}[^{}]*)*\}')
+# Hex escapes, control words, escaped characters, braces and text runs
+RTF_TOKENS = re.compile(r"\\'([0-9a-fA-F]{2})|\\([a-zA-Z]+)(-?\d+)? ?|\\([{}\\])|([{}])|[\r\n]+|([^\\{}\r\n]+)")
+
+
+def _collapse_lines(text):
+    lines = (' '.join(line.split()) for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def _extract_pdf(path):
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def _extract_docx(path):
+    paragraphs = []
+    with zipfile.ZipFile(path) as archive:
+        with archive.open('word/document.xml') as document:
+            # iterparse keeps memory flat for long documents
+            for _, element in ElementTree.iterparse(document):
+                if element.tag == f'{WORD_NAMESPACE}p':
+                    paragraphs.append(''.join(node.text or '' for node in element.iter(f'{WORD_NAMESPACE}t')))
+                    element.clear()
+    return '\n'.join(paragraphs)
+
+
+def _extract_rtf(path):
+    with open(path, 'rb') as f:
+        source = f.read().decode('latin-1')
+    source = RTF_SKIP_GROUPS.sub('', source)
+    out = []
+    skip = 0
+    for match in RTF_TOKENS.finditer(source):
+        hex_char, word, number, escaped, _, text = match.groups()
+        if hex_char:
+            if skip:
+                skip -= 1
+                continue
+            out.append(bytes([int(hex_char, 16)]).decode('cp1252', errors='replace'))
+        elif word == 'u' and number:
+            # \uN is followed by one fallback character for old readers
+            out.append(chr(int(number) % 65536))
+            skip = 1
+        elif word in ('par', 'line', 'row'):
+            out.append('\n')
+        elif word == 'tab':
+            out.append('\t')
+        elif escaped:
+            out.append(escaped)
+        elif text:
+            out.append(text[skip:])
+            skip = 0
+    return ''.join(out)
+
+
+def _extract_txt(path):
+    limit = MAX_DOCUMENT_CHARS * 4
+    with open(path, 'rb') as f:
+        data = f.read(limit)
+    try:
+        # A read cut at the limit may end inside a multi-byte character; the
+        # incremental decoder holds back that tail instead of failing on it
+        return codecs.getincrementaldecoder('utf-8')().decode(data, final=len(data) < limit)
+    except UnicodeDecodeError:
+        pass
+    try:
+        return data.decode('cp1250')
+    except UnicodeDecodeError:
+        return data.decode('latin-1')
+
+
+EXTRACTORS = {
+    'pdf': _extract_pdf,
+    'docx': _extract_docx,
+    'rtf': _extract_rtf,
+    'txt': _extract_txt,
+}
+
+
+def extract_document_text(path, filename):
+    """
+    Return the text of a stored document, chosen by the extension of its
+    original file name, or None when the format is not supported or the
+    file cannot be read (e.g. pypdf is not installed or the PDF is broken).
+    """
+    extension = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+    extractor = EXTRACTORS.get(extension)
+    if extractor is None:
+        return None
+    try:
+        text = extractor(path)
+    except ImportError as e:
+        print(f"[WARNING] Cannot extract text from {filename}: {e}")
+        return None
+    except Exception as e:
+        print(f"[ERROR] Text extraction failed for {filename}: {e}")
+        return None
+    return _collapse_lines(text)[:MAX_DOCUMENT_CHARS]
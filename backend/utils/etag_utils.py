@@ -0,0 +1,108 @@
+"""
+Conditional GET support for read endpoints.
+
+Tables that back cached responses carry a change counter (change_counters,
+bumped by triggers on every write), so an ETag can be computed from one
+primary-key read before the view runs. When the client's If-None-Match
+matches, the view is skipped and a bodiless 304 goes back.
+"""
+import functools
+import hashlib
+import threading
+
+from flask import current_app, make_response, request
+
+# Part of every version-based ETag; bump when the JSON layout of a cached
+# endpoint changes so clients do not keep a stale body across a deploy
+CACHE_FORMAT_VERSION = 1
+
+def table_versions(conn, *tables):
+    """
+    Current change counters of the given tables, e.g. (('applications', 42),)
+    """
+    placeholders = ', '.join('?' for _ in tables)
+    rows = conn.execute(f'SELECT name, version FROM change_counters WHERE name IN ({placeholders}) ORDER BY name',
+                        tables).fetchall()
+    return tuple((row[0], row[1]) for row in rows)
+
+
+class ConditionalStats:
+    """
+    Counts 304 answers versus full responses per endpoint
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, not_modified):
+        with self._lock:
+            entry = self._endpoints.setdefault(endpoint, {'not_modified': 0, 'full': 0})
+            entry['not_modified' if not_modified else 'full'] += 1
+
+    def summary(self):
+        with self._lock:
+            return {
+                endpoint: dict(entry, hit_rate=entry['not_modified'] / (entry['not_modified'] + entry['full']))
+                for endpoint, entry in self._endpoints.items()
+            }
+
+
+conditional_stats = ConditionalStats()
+
+
+def _cache_headers(response, tag, max_age, public):
+    response.set_etag(tag)
+    if max_age:
+        response.cache_control.public = public
+        response.cache_control.max_age = max_age
+    else:
+        # Browsers may store the body but must revalidate it (cheap with the ETag)
+        response.cache_control.no_cache = True
+    return response
+
+
+def conditional(version, max_age=0, public=False):
+    """
+    Decorate a GET view whose output only depends on the request URL and
+    on version() (e.g. table change counters or a snapshot version).
+
+    The ETag is derived from the URL (path and query) and the version, so
+    it is known without running the view.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            token = repr((CACHE_FORMAT_VERSION, request.full_path, version()))
+            tag = hashlib.sha1(token.encode('utf-8')).hexdigest()[:32]
+            if request.if_none_match.contains(tag):
+                conditional_stats.record(request.endpoint, True)
+                return _cache_headers(current_app.response_class(status=304), tag, max_age, public)
+
+            response = make_response(view(*args, **kwargs))
+            conditional_stats.record(request.endpoint, False)
+            if response.status_code != 200:
+                return response
+            return _cache_headers(response, tag, max_age, public)
+        return wrapper
+    return decorator
+
+
+def constant(max_age=None):
+    """
+    Decorate a GET view that returns a fixed list: long-lived public
+    Cache-Control (CONSTANT_LIST_MAX_AGE unless max_age is given) plus a
+    content-hash ETag for revalidation after expiry
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            response = make_response(view(*args, **kwargs))
+            response.add_etag()
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age or current_app.config['CONSTANT_LIST_MAX_AGE']
+            response = response.make_conditional(request)
+            conditional_stats.record(request.endpoint, response.status_code == 304)
+            return response
+        return wrapper
+    return decorator
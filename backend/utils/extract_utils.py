@@ -0,0 +1,188 @@
+import os
+
+# Elements whose text never belongs to the posting
+STRIP_TAGS = ['script', 'style', 'noscript', 'template', 'svg', 'iframe', 'head']
+
+# Containers that usually hold the posting body, most specific first
+MAIN_CONTENT_SELECTOR = ', '.join([
+    '[class*="job-description"]', '[id*="job-description"]',
+    '[class*="jobDescription"]', '[id*="jobDescription"]',
+    '[class*="job-details"]', '[id*="job-details"]',
+    '[class*="offer-description"]', '[class*="posting"]', '[class*="vacancy"]',
+    '[itemtype*="JobPosting"]',
+    'main', 'article', '[role="main"]',
+])
+
+# XPath equivalent for lxml (cssselect is not a dependency)
+MAIN_CONTENT_XPATH = ' | '.join([
+    '//*[contains(@class, "job-description") or contains(@id, "job-description")]',
+    '//*[contains(@class, "jobDescription") or contains(@id, "jobDescription")]',
+    '//*[contains(@class, "job-details") or contains(@id, "job-details")]',
+    '//*[contains(@class, "offer-description") or contains(@class, "posting") or contains(@class, "vacancy")]',
+    '//*[contains(@itemtype, "JobPosting")]',
+    '//main', '//article', '//*[@role="main"]',
+])
+
+# Block-level elements; their boundaries become line breaks so later stages
+# (prompt compaction) can work on paragraphs and list items
+BLOCK_TAGS = [
+    'p', 'div', 'li', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'br', 'tr', 'td', 'th',
+    'section', 'article', 'aside', 'header', 'footer', 'nav', 'main', 'dt', 'dd', 'blockquote', 'form',
+]
+
+# A main-content candidate shorter than this is treated as a false positive
+MIN_MAIN_CONTENT_CHARS = 200
+
+
+def _collapse(text):
+    # str.split() without arguments collapses all whitespace runs
+    return ' '.join(text.split())
+
+
+def _collapse_lines(text):
+    # Collapse whitespace within each line and drop empty lines
+    return '\n'.join(line for line in (_collapse(part) for part in text.split('\n')) if line)
+
+
+def _assemble(title, heading, body_text, main_text):
+    """
+    Use the detected main content when it is substantial, prefixed by the
+    page title and first heading, which usually carry role and company
+    """
+    if main_text and len(main_text) >= MIN_MAIN_CONTENT_CHARS:
+        parts = [part for part in (title, heading) if part and part not in main_text]
+        return '\n'.join(parts + [main_text])
+    return body_text
+
+
+def _extract_selectolax(html, main_content=True):
+    try:
+        from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    except ImportError:
+        from selectolax.parser import HTMLParser
+
+    tree = HTMLParser(html)
+    title_node = tree.css_first('title')
+    title = _collapse(title_node.text()) if title_node else ''
+    tree.strip_tags(STRIP_TAGS)
+    for node in tree.css(', '.join(BLOCK_TAGS)):
+        node.insert_before('\n')
+        node.insert_after('\n')
+
+    root = tree.body or tree.root
+    if root is None:
+        return title
+    body_text = _collapse_lines(root.text(separator=' '))
+
+    main_text = heading = ''
+    if main_content:
+        candidates = [_collapse_lines(node.text(separator=' ')) for node in tree.css(MAIN_CONTENT_SELECTOR)]
+        main_text = max(candidates, key=len, default='')
+        heading_node = tree.css_first('h1')
+        heading = _collapse(heading_node.text()) if heading_node else ''
+    return _assemble(title, heading, body_text, main_text)
+
+
+def _extract_lxml(html, main_content=True):
+    import lxml.html
+    from lxml import etree
+
+    try:
+        doc = lxml.html.document_fromstring(html)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        doc = lxml.html.document_fromstring(html.encode('utf-8'))
+    title = _collapse(doc.findtext('.//title') or '')
+    etree.strip_elements(doc, *STRIP_TAGS, etree.Comment, with_tail=False)
+    for element in doc.iter(*BLOCK_TAGS):
+        element.text = '\n' + (element.text or '')
+        element.tail = '\n' + (element.tail or '')
+
+    body = doc.find('body')
+    root = body if body is not None else doc
+    body_text = _collapse_lines(' '.join(root.itertext()))
+
+    main_text = heading = ''
+    if main_content:
+        candidates = [_collapse_lines(' '.join(node.itertext())) for node in doc.xpath(MAIN_CONTENT_XPATH)]
+        main_text = max(candidates, key=len, default='')
+        heading_node = doc.find('.//h1')
+        heading = _collapse(' '.join(heading_node.itertext())) if heading_node is not None else ''
+    return _assemble(title, heading, body_text, main_text)
+
+
+def _extract_html_parser(html, main_content=True):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    title = _collapse(soup.title.get_text()) if soup.title else ''
+    for element in soup(STRIP_TAGS):
+        element.decompose()
+    for element in soup(BLOCK_TAGS):
+        element.insert_before('\n')
+        element.insert_after('\n')
+
+    root = soup.body or soup
+    body_text = _collapse_lines(root.get_text(separator=' '))
+
+    main_text = heading = ''
+    if main_content:
+        candidates = [_collapse_lines(node.get_text(separator=' ')) for node in soup.select(MAIN_CONTENT_SELECTOR)]
+        main_text = max(candidates, key=len, default='')
+        heading_node = soup.find('h1')
+        heading = _collapse(heading_node.get_text(separator=' ', strip=True)) if heading_node else ''
+    return _assemble(title, heading, body_text, main_text)
+
+
+# Backends in order of preference; the first importable one is the default
+EXTRACTORS = {
+    'selectolax': (('selectolax',), _extract_selectolax),
+    'lxml': (('lxml',), _extract_lxml),
+    'html.parser': (('bs4',), _extract_html_parser),
+}
+
+
+def _importable(modules):
+    for module in modules:
+        try:
+            __import__(module)
+        except ImportError:
+            return False
+    return True
+
+
+def available_extractors():
+    return [name for name, (modules, _) in EXTRACTORS.items() if _importable(modules)]
+
+
+def get_extractor(name=None):
+    """
+    Return (name, function) for the requested backend, or the fastest
+    installed one. HTML_EXTRACTOR in the environment overrides the default.
+    """
+    name = name or os.getenv('HTML_EXTRACTOR')
+    if name:
+        if name not in EXTRACTORS:
+            raise ValueError(f"Unknown HTML extractor: {name}. Available: {', '.join(EXTRACTORS)}")
+        if not _importable(EXTRACTORS[name][0]):
+            raise ImportError(f"HTML extractor {name} is not installed")
+        return name, EXTRACTORS[name][1]
+    for candidate in available_extractors():
+        return candidate, EXTRACTORS[candidate][1]
+    raise ImportError('No HTML extractor available; install selectolax, lxml or beautifulsoup4')
+
+
+_resolved = {}
+
+
+def extract_text(html, backend=None, main_content=True, keep_lines=False):
+    """
+    Convert a job posting page to plain text with the named backend (or the
+    fastest installed one), restricted to the main posting content when it
+    can be detected. With keep_lines, block elements stay on separate lines;
+    otherwise all whitespace is collapsed to single spaces.
+    """
+    if backend not in _resolved:
+        _resolved[backend] = get_extractor(backend)
+    text = _resolved[backend][1](html, main_content=main_content)
+    return text if keep_lines else _collapse(text)
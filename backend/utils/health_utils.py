@@ -0,0 +1,188 @@
+import os
+import threading
+import time
+import requests
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a call is refused because the upstream is marked unhealthy
+    """
+
+
+class CircuitBreaker:
+    """
+    Classic three-state circuit breaker.
+
+    closed: calls go through; failure_threshold consecutive failures open it.
+    open: calls are refused until reset_timeout has passed.
+    half_open: a single trial call is let through; success closes the
+    breaker, failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow_request(self):
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            state = self._current_state()
+            return {
+                'state': state,
+                'consecutive_failures': self._failures,
+                'failure_threshold': self.failure_threshold,
+                'reset_timeout_seconds': self.reset_timeout,
+                'rejected': self.rejected,
+                'retry_in_seconds': max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)) if state == self.OPEN else 0.0
+            }
+
+
+class HealthMonitor:
+    """
+    Probe an upstream URL periodically on a background thread and feed the
+    results into a circuit breaker, so request handlers only read state.
+
+    Only a 2xx response counts as a success. Other responses below 500
+    (e.g. 401 from a probe sent without credentials) show the upstream is
+    reachable but leave the breaker alone, so they cannot close it while
+    real calls are failing. Timeouts, connection errors and 5xx count as
+    failures.
+    """
+
+    def __init__(self, name, probe_url, breaker, interval=30.0, timeout=5.0):
+        self.name = name
+        self.probe_url = probe_url
+        self.breaker = breaker
+        self.interval = interval
+        self.timeout = timeout
+
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.probes = 0
+        self.last_probe_at = None
+        self.last_probe_ok = None
+        self.last_probe_reachable = None
+        self.last_status_code = None
+        self.last_latency_ms = None
+        self.last_error = None
+
+    def ensure_started(self):
+        # Started lazily (and again after fork) because threads started in
+        # a parent process do not exist in pre-forked workers. Without a probe
+        # URL (e.g. replayed completions) only real calls feed the breaker.
+        if self.probe_url is None:
+            return
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-health", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.probe()
+            self._stop.wait(self.interval)
+
+    def probe(self):
+        start = time.perf_counter()
+        ok, reachable, status_code, error = False, False, None, None
+        try:
+            response = requests.get(self.probe_url, timeout=self.timeout)
+            status_code = response.status_code
+            ok = 200 <= status_code < 300
+            reachable = status_code < 500
+        except requests.RequestException as e:
+            error = str(e)
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.probes += 1
+            self.last_probe_at = time.time()
+            self.last_probe_ok = ok
+            self.last_probe_reachable = reachable
+            self.last_status_code = status_code
+            self.last_latency_ms = latency_ms
+            self.last_error = error
+
+        if ok:
+            self.breaker.record_success()
+        elif not reachable:
+            print(f"[WARNING] {self.name} health probe failed: {error or status_code}")
+            self.breaker.record_failure()
+        return ok
+
+    def status(self):
+        with self._lock:
+            probe = {
+                'url': self.probe_url,
+                'interval_seconds': self.interval,
+                'probes': self.probes,
+                'last_probe_at': self.last_probe_at,
+                'last_probe_ok': self.last_probe_ok,
+                'last_probe_reachable': self.last_probe_reachable,
+                'last_status_code': self.last_status_code,
+                'last_latency_ms': self.last_latency_ms,
+                'last_error': self.last_error
+            }
+        breaker = self.breaker.stats()
+        return {
+            'name': self.name,
+            'healthy': breaker['state'] != CircuitBreaker.OPEN,
+            'circuit': breaker,
+            'probe': probe
+        }
@@ -0,0 +1,156 @@
+import threading
+import time
+import zlib
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Brotli is only advertised when a decoder is installed, otherwise urllib3
+# would hand back undecodable bodies
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+
+def create_session(pool_connections=16, pool_maxsize=16, retries=3, backoff_factor=0.5):
+    """
+    Create a requests.Session with keep-alive connection pools per host,
+    compression negotiation and bounded retries with exponential backoff
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Encoding': ACCEPT_ENCODING,
+    })
+    return session
+
+
+class PageFetcher:
+    """
+    Fetch job posting pages through one shared session.
+
+    When a connection pool is given, responses carrying an ETag or
+    Last-Modified header are kept (zlib-compressed) in the http_cache table
+    and later requests for the same URL are revalidated with
+    If-None-Match / If-Modified-Since, so an unchanged page costs a 304.
+    """
+
+    def __init__(self, pool=None, session=None, timeout=10, max_rows=2000):
+        self.pool = pool
+        self.session = session or create_session()
+        self.timeout = timeout
+        self.max_rows = max_rows
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+        self.full_downloads = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+
+    def _load(self, url):
+        if self.pool is None:
+            return None
+        conn = self.pool.acquire()
+        try:
+            return conn.execute(
+                'SELECT etag, last_modified, encoding, body FROM http_cache WHERE url = ?', (url,)
+            ).fetchone()
+        finally:
+            self.pool.release(conn)
+
+    def _store(self, url, response):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if self.pool is None or not (etag or last_modified):
+            return
+        conn = self.pool.acquire()
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO http_cache (url, etag, last_modified, encoding, body, fetched_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (url, etag, last_modified, response.encoding or response.apparent_encoding, zlib.compress(response.content), time.time())
+            )
+            # Keep the store bounded: drop the least recently fetched pages
+            conn.execute('''
+                DELETE FROM http_cache WHERE url IN (
+                    SELECT url FROM http_cache ORDER BY fetched_at DESC LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_rows,))
+            conn.commit()
+        finally:
+            self.pool.release(conn)
+
+    def _touch(self, url):
+        conn = self.pool.acquire()
+        try:
+            conn.execute('UPDATE http_cache SET fetched_at = ? WHERE url = ?', (time.time(), url))
+            conn.commit()
+        finally:
+            self.pool.release(conn)
+
+    def fetch(self, url):
+        """
+        Return the decoded text of the page at url, revalidating a stored
+        copy when one exists. Raises requests.HTTPError on error statuses.
+        """
+        stored = self._load(url)
+        headers = {}
+        if stored is not None:
+            if stored['etag']:
+                headers['If-None-Match'] = stored['etag']
+            if stored['last_modified']:
+                headers['If-Modified-Since'] = stored['last_modified']
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        with self._lock:
+            self.requests += 1
+
+        if response.status_code == 304 and stored is not None:
+            body = zlib.decompress(stored['body'])
+            with self._lock:
+                self.not_modified += 1
+                self.bytes_saved += len(body)
+            self._touch(url)
+            return body.decode(stored['encoding'] or 'utf-8', errors='replace')
+
+        response.raise_for_status()
+        with self._lock:
+            self.full_downloads += 1
+            self.bytes_downloaded += len(response.content)
+        self._store(url, response)
+        return response.text
+
+    def stats(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'not_modified': self.not_modified,
+                'full_downloads': self.full_downloads,
+                'bytes_downloaded': self.bytes_downloaded,
+                'bytes_saved': self.bytes_saved,
+                'accept_encoding': ACCEPT_ENCODING
+            }
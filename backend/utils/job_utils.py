@@ -0,0 +1,291 @@
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+FINISHED_STATES = (SUCCEEDED, FAILED)
+
+
+class JobTimeoutError(Exception):
+    """
+    Raised when a job handler runs longer than the queue's timeout
+    """
+
+
+class JobQueue:
+    """
+    SQLite-backed job queue executed by a local pool of worker threads.
+
+    Jobs live in the jobs table, so they survive restarts and any process
+    sharing the database can submit, claim or poll them. Claiming is done
+    under BEGIN IMMEDIATE so two workers never run the same job. Failed or
+    timed out jobs are retried with exponential backoff up to max_attempts.
+    Finished jobs are deleted retention seconds after they finished.
+    """
+
+    def __init__(self, pool, workers=2, timeout=120.0, max_attempts=3, backoff=5.0, poll_interval=1.0,
+                 retention=7 * 24 * 3600, prune_interval=3600.0):
+        self.pool = pool
+        self.workers = workers
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.prune_interval = prune_interval
+
+        self._handlers = {}
+        self._threads = []
+        self._pid = None
+        self._lock = threading.Lock()
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self._executor = None
+        # Timed out handlers still occupying an executor thread
+        self._abandoned = set()
+        self._next_prune = 0.0
+
+    def register(self, kind, handler):
+        """
+        Register handler(payload) -> JSON-serializable result for a job kind
+        """
+        self._handlers[kind] = handler
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def ensure_started(self):
+        # Worker threads are started lazily and again after fork, because
+        # threads from a parent process do not exist in pre-forked workers
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            # Handlers run on their own executor so a worker can give up on
+            # one that exceeds the timeout and move on to the next job
+            self._executor = self._new_executor()
+            self._abandoned = set()
+            self._requeue_stale()
+            self._prune_finished()
+            self._threads = []
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _new_executor(self):
+        return ThreadPoolExecutor(max_workers=self.workers * 2, thread_name_prefix='job-handler')
+
+    def stop(self):
+        self._stop.set()
+        self._notify()
+
+    def _notify(self):
+        with self._changed:
+            self._changed.notify_all()
+
+    # -- database helpers ----------------------------------------------------
+
+    def _execute(self, sql, params=(), fetch=None):
+        conn = self.pool.acquire()
+        try:
+            cursor = conn.execute(sql, params)
+            rows = cursor.fetchone() if fetch == 'one' else cursor.fetchall() if fetch == 'all' else None
+            conn.commit()
+            return rows
+        finally:
+            self.pool.release(conn)
+
+    def _requeue_stale(self):
+        # Jobs left running by a crashed process are put back in the queue
+        cutoff = time.time() - self.timeout * 2
+        self._execute(
+            'UPDATE jobs SET status = ?, locked_by = NULL WHERE status = ? AND started_at < ?',
+            (QUEUED, RUNNING, cutoff)
+        )
+
+    def _prune_finished(self):
+        # Finished jobs are only kept long enough for clients to poll their result
+        self._next_prune = time.time() + self.prune_interval
+        self._execute(
+            'DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?',
+            (SUCCEEDED, FAILED, time.time() - self.retention)
+        )
+
+    @staticmethod
+    def _row_to_dict(row):
+        job = dict(row)
+        job['payload'] = json.loads(job['payload']) if job['payload'] else None
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job.pop('locked_by', None)
+        return job
+
+    # -- public API ----------------------------------------------------------
+
+    def submit(self, kind, payload, max_attempts=None):
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        self.ensure_started()
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._execute(
+            'INSERT INTO jobs (id, kind, payload, status, attempts, max_attempts, created_at, run_after) '
+            'VALUES (?, ?, ?, ?, 0, ?, ?, ?)',
+            (job_id, kind, json.dumps(payload), QUEUED, max_attempts or self.max_attempts, now, now)
+        )
+        self._notify()
+        return job_id
+
+    def get(self, job_id):
+        row = self._execute('SELECT * FROM jobs WHERE id = ?', (job_id,), fetch='one')
+        return self._row_to_dict(row) if row else None
+
+    def wait(self, job_id, timeout):
+        """
+        Long-poll: return the job once it has finished or timeout has passed
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job['status'] in FINISHED_STATES or remaining <= 0:
+                return job
+            # Woken early by local workers; the interval bounds the delay for
+            # jobs finished by another process
+            with self._changed:
+                self._changed.wait(min(remaining, self.poll_interval))
+
+    def metrics(self):
+        rows = self._execute('SELECT status, COUNT(*) AS count FROM jobs GROUP BY status', fetch='all')
+        counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+        counts.update({row['status']: row['count'] for row in rows})
+
+        now = time.time()
+        oldest = self._execute(
+            'SELECT MIN(created_at) AS oldest FROM jobs WHERE status = ?', (QUEUED,), fetch='one'
+        )['oldest']
+        timings = self._execute('''
+            SELECT AVG(started_at - created_at) AS wait, AVG(finished_at - started_at) AS run, AVG(attempts) AS attempts
+            FROM (SELECT * FROM jobs WHERE status = ? ORDER BY finished_at DESC LIMIT 100)
+        ''', (SUCCEEDED,), fetch='one')
+
+        return {
+            'queue_depth': counts[QUEUED],
+            'running': counts[RUNNING],
+            'succeeded': counts[SUCCEEDED],
+            'failed': counts[FAILED],
+            'oldest_queued_age_seconds': now - oldest if oldest else 0.0,
+            'recent_avg_wait_seconds': timings['wait'] or 0.0,
+            'recent_avg_run_seconds': timings['run'] or 0.0,
+            'recent_avg_attempts': timings['attempts'] or 0.0,
+            'workers': self.workers,
+            'workers_alive': sum(1 for thread in self._threads if thread.is_alive()) if self._pid == os.getpid() else 0,
+            'timeout_seconds': self.timeout,
+            'max_attempts': self.max_attempts
+        }
+
+    # -- worker --------------------------------------------------------------
+
+    def _claim(self, worker_name):
+        conn = self.pool.acquire()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            now = time.time()
+            row = conn.execute(
+                'SELECT id FROM jobs WHERE status = ? AND run_after <= ? ORDER BY run_after, created_at LIMIT 1',
+                (QUEUED, now)
+            ).fetchone()
+            if row is None:
+                conn.rollback()
+                return None
+            conn.execute(
+                'UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1, locked_by = ? WHERE id = ?',
+                (RUNNING, now, worker_name, row['id'])
+            )
+            job = conn.execute('SELECT * FROM jobs WHERE id = ?', (row['id'],)).fetchone()
+            conn.commit()
+            return self._row_to_dict(job)
+        finally:
+            self.pool.release(conn)
+
+    def _finish(self, job, result=None, error=None):
+        now = time.time()
+        if error is None:
+            self._execute(
+                'UPDATE jobs SET status = ?, result = ?, error = NULL, finished_at = ?, locked_by = NULL WHERE id = ?',
+                (SUCCEEDED, json.dumps(result), now, job['id'])
+            )
+        elif job['attempts'] < job['max_attempts']:
+            delay = self.backoff * (2 ** (job['attempts'] - 1))
+            print(f"[WARNING] Job {job['id']} attempt {job['attempts']} failed ({error}), retrying in {delay:.1f}s")
+            self._execute(
+                'UPDATE jobs SET status = ?, error = ?, run_after = ?, locked_by = NULL WHERE id = ?',
+                (QUEUED, error, now + delay, job['id'])
+            )
+        else:
+            print(f"[ERROR] Job {job['id']} failed after {job['attempts']} attempts: {error}")
+            self._execute(
+                'UPDATE jobs SET status = ?, error = ?, finished_at = ?, locked_by = NULL WHERE id = ?',
+                (FAILED, error, now, job['id'])
+            )
+        self._notify()
+
+    def _work(self):
+        worker_name = f"{os.getpid()}:{threading.current_thread().name}"
+        while not self._stop.is_set():
+            try:
+                job = self._claim(worker_name)
+            except Exception as e:
+                print(f"[ERROR] Job worker failed to claim a job: {str(e)}")
+                job = None
+
+            if job is None:
+                if time.time() >= self._next_prune:
+                    try:
+                        self._prune_finished()
+                    except Exception as e:
+                        print(f"[ERROR] Job worker failed to prune finished jobs: {str(e)}")
+                with self._changed:
+                    self._changed.wait(self.poll_interval)
+                continue
+
+            handler = self._handlers.get(job['kind'])
+            if handler is None:
+                self._finish(job, error=f"No handler registered for {job['kind']}")
+                continue
+
+            with self._lock:
+                future = self._executor.submit(handler, job['payload'])
+            try:
+                self._finish(job, result=future.result(timeout=self.timeout))
+            except FutureTimeoutError:
+                # The handler thread can't be killed; its late result is discarded
+                self._abandon(future)
+                self._finish(job, error=str(JobTimeoutError(f"Job exceeded {self.timeout:.0f}s timeout")))
+            except Exception as e:
+                self._finish(job, error=str(e))
+
+    def _abandon(self, future):
+        # Hung handlers keep their executor threads. Once they could take the
+        # slots the workers need, new jobs go to a fresh executor and the old
+        # one is left to wind down as its handlers return.
+        with self._lock:
+            if future.done():
+                return
+            self._abandoned.add(future)
+            future.add_done_callback(self._abandoned.discard)
+            if len(self._abandoned) < self.workers:
+                return
+            print(f"[WARNING] {len(self._abandoned)} timed out job handlers still running, replacing the handler pool")
+            old, self._executor, self._abandoned = self._executor, self._new_executor(), set()
+        old.shutdown(wait=False)
@@ -0,0 +1,332 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+
+
+class LLMBackendError(Exception):
+    """
+    Raised when a backend cannot produce a completion
+    """
+
+
+class BackendMetrics:
+    """
+    Latency, token usage and error counters for every LLM backend in one place
+    """
+
+    def __init__(self, window=500):
+        self.window = window
+        self._lock = threading.Lock()
+        self._backends = {}
+
+    def record(self, backend, latency_ms, prompt_tokens=0, completion_tokens=0, error=None, streamed=False):
+        with self._lock:
+            entry = self._backends.setdefault(backend, {
+                'calls': 0, 'errors': 0, 'streamed': 0, 'prompt_tokens': 0, 'completion_tokens': 0,
+                'latencies': deque(maxlen=self.window), 'last_error': None
+            })
+            entry['calls'] += 1
+            entry['streamed'] += int(streamed)
+            entry['prompt_tokens'] += prompt_tokens
+            entry['completion_tokens'] += completion_tokens
+            entry['latencies'].append(latency_ms)
+            if error is not None:
+                entry['errors'] += 1
+                entry['last_error'] = error
+
+    @staticmethod
+    def _percentile(values, fraction):
+        return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+    def summary(self):
+        with self._lock:
+            result = {}
+            for backend, entry in self._backends.items():
+                latencies = sorted(entry['latencies'])
+                result[backend] = {
+                    'calls': entry['calls'],
+                    'streamed': entry['streamed'],
+                    'errors': entry['errors'],
+                    'error_rate': entry['errors'] / entry['calls'],
+                    'prompt_tokens': entry['prompt_tokens'],
+                    'completion_tokens': entry['completion_tokens'],
+                    'avg_latency_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+                    'p50_latency_ms': self._percentile(latencies, 0.5),
+                    'p95_latency_ms': self._percentile(latencies, 0.95),
+                    'last_error': entry['last_error']
+                }
+            return result
+
+
+llm_metrics = BackendMetrics()
+
+
+class LLMBackend:
+    """
+    Chat completion backend.
+
+    Subclasses implement _complete(messages, params) -> (content, usage) and
+    _stream(messages, params) -> iterator of (content_delta, usage or None).
+    complete() and stream() record latency, tokens and errors in llm_metrics
+    under the backend name.
+    """
+
+    name = 'base'
+    probe_url = None
+
+    def __init__(self, model):
+        self.model = model
+
+    def complete(self, messages, **params):
+        """
+        Return the completion text for messages
+        """
+        start = time.perf_counter()
+        try:
+            content, usage = self._complete(messages, params)
+        except Exception as e:
+            llm_metrics.record(self.name, (time.perf_counter() - start) * 1000, error=str(e))
+            raise
+        llm_metrics.record(
+            self.name, (time.perf_counter() - start) * 1000,
+            usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0)
+        )
+        return content
+
+    def stream(self, messages, **params):
+        """
+        Yield the completion text for messages in chunks as it is generated
+        """
+        start = time.perf_counter()
+        usage = {}
+        chunks = 0
+        try:
+            for delta, chunk_usage in self._stream(messages, params):
+                if chunk_usage:
+                    usage = chunk_usage
+                if delta:
+                    chunks += 1
+                    yield delta
+        except Exception as e:
+            llm_metrics.record(self.name, (time.perf_counter() - start) * 1000, error=str(e), streamed=True)
+            raise
+        # Streamed responses rarely report usage; count chunks (~1 token each) instead
+        llm_metrics.record(
+            self.name, (time.perf_counter() - start) * 1000,
+            usage.get('prompt_tokens', 0), usage.get('completion_tokens', chunks), streamed=True
+        )
+
+    def describe(self):
+        return {'name': self.name, 'model': self.model, 'probe_url': self.probe_url}
+
+    def _complete(self, messages, params):
+        raise NotImplementedError
+
+    def _stream(self, messages, params):
+        # Default: one chunk holding the whole completion
+        yield self._complete(messages, params)
+
+
+class OpenAIBackend(LLMBackend):
+    """
+    OpenAI chat completions through the openai v0.28 client. The client is
+    imported and the API key read on first use, not at import time.
+    """
+
+    name = 'openai'
+
+    def __init__(self, model='gpt-3.5-turbo', api_key=None, api_base=None,
+                 probe_url='https://api.openai.com/v1/models'):
+        super().__init__(model)
+        self.api_key = api_key
+        self.api_base = api_base
+        self.probe_url = probe_url
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _openai(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import openai
+                    self.api_key = self.api_key or os.getenv('OPENAI_API_KEY')
+                    masked_key = f"{self.api_key[:4]}...{self.api_key[-4:]}" if self.api_key and len(self.api_key) > 8 else "Not found"
+                    print(f"[DEBUG] {self.name} backend using model {self.model}, API key (masked): {masked_key}")
+                    self._client = openai
+        return self._client
+
+    def _request(self, messages, params, stream=False):
+        kwargs = dict(params, model=self.model, messages=messages, api_key=self.api_key, stream=stream)
+        if self.api_base:
+            kwargs['api_base'] = self.api_base
+        return self._openai().ChatCompletion.create(**kwargs)
+
+    def _complete(self, messages, params):
+        response = self._request(messages, params)
+        usage = response.get('usage') or {}
+        return response.choices[0].message.content, dict(usage)
+
+    def _stream(self, messages, params):
+        for chunk in self._request(messages, params, stream=True):
+            delta = chunk.choices[0].get('delta', {}).get('content') if chunk.choices else None
+            yield delta, dict(chunk.get('usage') or {})
+
+
+class LocalBackend(OpenAIBackend):
+    """
+    A local OpenAI-compatible server (llama.cpp server, vLLM, Ollama, ...)
+    """
+
+    name = 'local'
+
+    def __init__(self, model='local-model', api_base='http://localhost:8000/v1', api_key='local'):
+        super().__init__(model, api_key=api_key, api_base=api_base.rstrip('/'),
+                         probe_url=api_base.rstrip('/') + '/models')
+
+
+class ReplayBackend(LLMBackend):
+    """
+    Record/replay backend for offline load tests and benchmarks.
+
+    In record mode completions from the wrapped backend are appended to a
+    JSONL file keyed by a hash of (model, messages). In replay mode they are
+    served from that file; with match='sequential', requests without an
+    exact recording get the recordings in turn. latency_ms (plus a seeded,
+    repeatable jitter) is injected before the first chunk, and streamed
+    replies are split into chunk_chars pieces spaced chunk_ms apart.
+    """
+
+    name = 'replay'
+
+    def __init__(self, path, inner=None, model='gpt-3.5-turbo', match='exact',
+                 latency_ms=0.0, jitter_ms=0.0, chunk_chars=8, chunk_ms=0.0, seed=0):
+        super().__init__(inner.model if inner else model)
+        self.path = path
+        self.inner = inner
+        self.match = match
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.chunk_chars = chunk_chars
+        self.chunk_ms = chunk_ms
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recordings = {}
+        self._order = []
+        self._next = 0
+        if inner is not None:
+            self.name = f"record:{inner.name}"
+            self.probe_url = inner.probe_url
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if record['key'] not in self._recordings:
+                        self._order.append(record['key'])
+                    self._recordings[record['key']] = record
+
+    def _key(self, messages):
+        payload = json.dumps({'model': self.model, 'messages': messages}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _lookup(self, messages):
+        key = self._key(messages)
+        with self._lock:
+            if key in self._recordings:
+                return self._recordings[key]
+            if self.match == 'sequential' and self._order:
+                record = self._recordings[self._order[self._next % len(self._order)]]
+                self._next += 1
+                return record
+        raise LLMBackendError(f"No recorded completion for request {key[:12]} in {self.path}")
+
+    def _record(self, messages, content, usage):
+        record = {'key': self._key(messages), 'model': self.model, 'content': content, 'usage': usage,
+                  'recorded_at': time.time()}
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+            if record['key'] not in self._recordings:
+                self._order.append(record['key'])
+            self._recordings[record['key']] = record
+
+    def _delay(self):
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        delay = max(0.0, self.latency_ms + jitter) / 1000
+        if delay:
+            time.sleep(delay)
+
+    def _complete(self, messages, params):
+        if self.inner is not None:
+            content, usage = self.inner._complete(messages, params)
+            self._record(messages, content, usage)
+            return content, usage
+        record = self._lookup(messages)
+        self._delay()
+        return record['content'], record.get('usage') or {}
+
+    def _stream(self, messages, params):
+        if self.inner is not None:
+            # Recording needs the whole reply; the wrapped backend streams it
+            parts, usage = [], {}
+            for delta, chunk_usage in self.inner._stream(messages, params):
+                usage = chunk_usage or usage
+                if delta:
+                    parts.append(delta)
+                yield delta, chunk_usage
+            self._record(messages, ''.join(parts), usage)
+            return
+        record = self._lookup(messages)
+        self._delay()
+        content = record['content']
+        for i in range(0, len(content), self.chunk_chars):
+            if i and self.chunk_ms:
+                time.sleep(self.chunk_ms / 1000)
+            yield content[i:i + self.chunk_chars], None
+        yield None, record.get('usage') or {}
+
+    def describe(self):
+        return dict(super().describe(), path=self.path, match=self.match, recordings=len(self._order),
+                    latency_ms=self.latency_ms, jitter_ms=self.jitter_ms, chunk_ms=self.chunk_ms)
+
+
+BACKENDS = ('openai', 'local', 'replay', 'record')
+
+
+def create_backend(name=None, model=None):
+    """
+    Create the backend selected by name or LLM_BACKEND (default openai).
+
+    openai: OPENAI_API_KEY, LLM_MODEL, LLM_HEALTH_PROBE_URL
+    local: LLM_LOCAL_BASE_URL, LLM_LOCAL_MODEL
+    replay/record: LLM_REPLAY_PATH, LLM_REPLAY_MATCH, LLM_REPLAY_LATENCY_MS,
+    LLM_REPLAY_JITTER_MS, LLM_REPLAY_CHUNK_MS; record wraps LLM_RECORD_BACKEND
+    """
+    name = name or os.getenv('LLM_BACKEND', 'openai')
+    model = model or os.getenv('LLM_MODEL', 'gpt-3.5-turbo')
+    if name == 'openai':
+        return OpenAIBackend(model, probe_url=os.getenv('LLM_HEALTH_PROBE_URL', 'https://api.openai.com/v1/models'))
+    if name == 'local':
+        return LocalBackend(os.getenv('LLM_LOCAL_MODEL', 'local-model'),
+                            api_base=os.getenv('LLM_LOCAL_BASE_URL', 'http://localhost:8000/v1'))
+    if name in ('replay', 'record'):
+        path = os.getenv('LLM_REPLAY_PATH', os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'llm_recordings.jsonl'))
+        inner = create_backend(os.getenv('LLM_RECORD_BACKEND', 'openai'), model) if name == 'record' else None
+        return ReplayBackend(
+            path, inner=inner, model=model,
+            match=os.getenv('LLM_REPLAY_MATCH', 'exact'),
+            latency_ms=float(os.getenv('LLM_REPLAY_LATENCY_MS', 0)),
+            jitter_ms=float(os.getenv('LLM_REPLAY_JITTER_MS', 0)),
+            chunk_ms=float(os.getenv('LLM_REPLAY_CHUNK_MS', 0))
+        )
+    raise ValueError(f"Unknown LLM backend: {name}. Available: {', '.join(BACKENDS)}")
@@ -1,68 +1,223 @@
 import os
-import re
 import json
-import requests
+import time
 import traceback
-from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
+from utils.cache_utils import hash_content, normalize_url
+from utils.extract_utils import extract_text
+from utils.health_utils import CircuitBreaker, CircuitOpenError, HealthMonitor
+from utils.http_utils import PageFetcher
+from utils.llm_backend_utils import create_backend
+from utils.prompt_utils import CompactionStats, TokenCounter, compact_text
+from utils.stream_utils import IncrementalJSONParser
+from utils.structured_utils import ANALYSIS_FIELDS, ExtractionStats, extract_structured
 
 # Load environment variables
 load_dotenv()
 
-# Get API key and print a masked version for debugging
-api_key = os.getenv('OPENAI_API_KEY')
-masked_key = f"{api_key[:4]}...{api_key[-4:]}" if api_key and len(api_key) > 8 else "Not found"
-print(f"OpenAI API Key (masked): {masked_key}")
+# Completion backend (openai, local, replay or record), see LLM_BACKEND;
+# the OpenAI client and API key are only loaded on first use
+llm_backend = create_backend()
 
-# Import and configure OpenAI with v0.28 compatibility
-import openai
-openai.api_key = api_key
+# Upstream health is tracked off the request path: a background probe and
+# the outcome of real completions both feed the breaker, and analysis fails
+# fast while it is open.
+llm_health = HealthMonitor(
+    llm_backend.name,
+    llm_backend.probe_url,
+    CircuitBreaker(
+        failure_threshold=int(os.getenv('LLM_BREAKER_FAILURES', 3)),
+        reset_timeout=float(os.getenv('LLM_BREAKER_RESET_SECONDS', 30))
+    ),
+    interval=float(os.getenv('LLM_HEALTH_INTERVAL', 30))
+)
 
-def scrape_job_posting(url):
+# Prompt for analyze_job_posting_with_llm, assembled from the requested fields;
+# the compacted posting text is appended
+ANALYSIS_PROMPT_HEADER = """You are an expert job application assistant. Analyze the following job posting text and extract the key information.
+Return the results in JSON format with the following fields:
+"""
+
+FIELD_INSTRUCTIONS = {
+    'company': "- company: The company name",
+    'role': "- role: The job title/role",
+    'salary': "- salary: The full salary text as mentioned in the posting (if available)",
+    'salary_amount': """- salary_amount: The numeric salary amount (if available, otherwise 0). If a range is given, use the average or the lower bound.
+  For hourly rates, just extract the hourly amount (e.g., for "110,00–130,00 zł netto (+ VAT) / godz.", extract 110 or 120).
+  For monthly rates, extract the monthly amount.
+  For yearly rates, extract the yearly amount.
+  ALWAYS convert the amount to a number without currency symbols or thousand separators.""",
+    'salary_currency': "- salary_currency: The currency of the salary (PLN, EUR, USD, GBP, etc.). Look for currency symbols (zł, €, $, £) or abbreviations.",
+    'salary_type': "- salary_type: The type of salary (hourly, monthly, yearly). Look for indicators like \"per hour\", \"per month\", \"per year\", \"godz.\", etc.",
+    'date_posted': "- date_posted: The date the job was posted (in YYYY-MM-DD format if available)",
+    'skills': "- skills: A list of key skills required for the job",
+    'experience': "- experience: The required experience level",
+    'location': "- location: The job location",
+}
+
+FIELD_DEFAULTS = {
+    'salary_amount': "For salary_amount, use 0 if not available.",
+    'salary_currency': "For salary_currency, default to \"PLN\" if not specified.",
+    'salary_type': "For salary_type, default to \"yearly\" if not specified.",
+}
+
+ANALYSIS_PROMPT_FOOTER = """
+IMPORTANT: Your response must be valid JSON format only, with no additional text before or after the JSON.
+
+Job Posting Text:
+"""
+
+# Fields that must be found without the LLM for the model call to be skipped;
+# fields outside this list are left empty in that case
+STRUCTURED_REQUIRED_FIELDS = [
+    field.strip() for field in
+    os.getenv('STRUCTURED_REQUIRED_FIELDS', 'company,role,salary_amount,salary_currency,salary_type').split(',')
+    if field.strip()
+]
+extraction_stats = ExtractionStats()
+
+
+def build_analysis_prompt(fields=None):
     """
-    Scrape content from a job posting URL
+    Build the analysis prompt asking only for fields (all fields by default)
+    """
+    fields = [field for field in ANALYSIS_FIELDS if fields is None or field in fields]
+    lines = [FIELD_INSTRUCTIONS[field] for field in fields]
+    lines.append("")
+    lines.append("If any information is not available, use null or empty values. " + " ".join(
+        FIELD_DEFAULTS[field] for field in fields if field in FIELD_DEFAULTS
+    ))
+    return ANALYSIS_PROMPT_HEADER + "\n".join(lines).rstrip() + "\n" + ANALYSIS_PROMPT_FOOTER
+
+# Token budget for the posting text in the prompt, and a memory cap on scraped text
+PROMPT_TOKEN_BUDGET = int(os.getenv('LLM_PROMPT_TOKEN_BUDGET', 2500))
+MAX_SCRAPED_CHARS = 200000
+token_counter = TokenCounter(llm_backend.model)
+compaction_stats = CompactionStats()
+
+# Shared keep-alive session used when no fetcher is passed in
+default_fetcher = PageFetcher()
+
+def fetch_job_posting(url, fetcher=None):
+    """
+    Download a job posting page and extract its text.
+    Returns (html, text), or (None, None) on failure.
     """
     print(f"\n[DEBUG] Scraping job posting from URL: {url}")
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        fetcher = fetcher or default_fetcher
         print("[DEBUG] Sending HTTP request...")
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        print(f"[DEBUG] HTTP request successful. Status code: {response.status_code}")
-        
-        # Parse HTML content
-        print("[DEBUG] Parsing HTML content...")
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.extract()
-        
-        # Get text content
-        text = soup.get_text(separator=' ', strip=True)
+        html = fetcher.fetch(url)
+        print("[DEBUG] HTTP request successful")
         
-        # Clean up text (remove extra whitespace)
-        text = re.sub(r'\s+', ' ', text).strip()
+        # Extract the posting text (fastest installed parser, main content only),
+        # one block per line so the prompt compaction stage can rank them
+        print("[DEBUG] Extracting text from HTML content...")
+        text = extract_text(html, keep_lines=True)
         
-        # Truncate if too long (context window limitation)
-        original_length = len(text)
-        if len(text) > 15000:
-            text = text[:15000] + "..."
-            print(f"[DEBUG] Text truncated from {original_length} to 15000 characters")
+        # Token budgeting happens in analyze_job_posting_with_llm; this cap
+        # only bounds memory for pathological pages
+        if len(text) > MAX_SCRAPED_CHARS:
+            print(f"[DEBUG] Text capped from {len(text)} to {MAX_SCRAPED_CHARS} characters")
+            text = text[:MAX_SCRAPED_CHARS]
         else:
             print(f"[DEBUG] Extracted text length: {len(text)} characters")
             
-        return text
+        return html, text
     except Exception as e:
         print(f"[ERROR] Error scraping job posting: {str(e)}")
         print(traceback.format_exc())
-        return None
+        return None, None
+
+def scrape_job_posting(url, fetcher=None):
+    """
+    Scrape content from a job posting URL
+    """
+    return fetch_job_posting(url, fetcher=fetcher)[1]
 
-def analyze_job_posting_with_llm(text):
+def normalize_salary_amount(value):
     """
-    Analyze job posting text using OpenAI API
+    Coerce a model-provided salary_amount to a number (0 when unusable)
+    """
+    if value is None:
+        return 0
+    try:
+        # Remove any non-numeric characters except decimal point
+        salary_str = str(value)
+        # Replace comma with dot for decimal point
+        salary_str = salary_str.replace(',', '.')
+        # Extract only digits and decimal point
+        salary_str = ''.join(c for c in salary_str if c.isdigit() or c == '.')
+        return float(salary_str) if salary_str else 0
+    except (ValueError, TypeError):
+        return 0
+
+SYSTEM_PROMPT = "You are a job posting analyzer that extracts structured data from job descriptions. Always respond with valid JSON only. When extracting salary_amount, always convert to a numeric value without currency symbols or thousand separators."
+
+def build_analysis_messages(text, fields=None):
+    """
+    Compact the posting text into the token budget and build the chat
+    messages. Returns (messages, prompt_stats).
+    """
+    # Drop boilerplate and duplicates, keep salary/role/company lines and
+    # fit the rest into the token budget
+    compacted, prompt_stats = compact_text(text, PROMPT_TOKEN_BUDGET, token_counter)
+    compaction_stats.record(prompt_stats)
+    print(f"[DEBUG] Prompt compaction: {prompt_stats['original_tokens']} -> {prompt_stats['compacted_tokens']} tokens "
+          f"({prompt_stats['tokens_saved']} saved, exact tokenizer: {prompt_stats['exact_tokenizer']})")
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": build_analysis_prompt(fields) + compacted}
+    ]
+    return messages, prompt_stats
+
+def parse_llm_response(result, prompt_stats):
+    """
+    Validate the model output and return it as a JSON string, falling back
+    to default values (with the raw response) when it is not valid JSON
+    """
+    # Try to parse the result as JSON to validate it
+    try:
+        # Try to extract JSON if it's wrapped in markdown code blocks or other text
+        if result.find('{') >= 0 and result.rfind('}') > result.find('{'):
+            potential_json = result[result.find('{'):result.rfind('}')+1]
+            json_result = json.loads(potential_json)
+            print("[DEBUG] Successfully extracted and parsed JSON from response")
+        else:
+            # Try parsing the whole response as JSON
+            json_result = json.loads(result)
+            print("[DEBUG] Successfully parsed response as JSON")
+        
+        # Post-process the salary_amount to ensure it's a number
+        json_result['salary_amount'] = normalize_salary_amount(json_result.get('salary_amount'))
+        
+        # Convert back to string for consistent return type
+        json_result['prompt_stats'] = prompt_stats
+        return json.dumps(json_result)
+    except json.JSONDecodeError as e:
+        print(f"[WARNING] Response is not valid JSON: {str(e)}. Returning default JSON.")
+        # Create a default JSON response with the raw text included
+        default_json = {
+            "company": "Unknown",
+            "role": "Unknown",
+            "salary": None,
+            "salary_amount": 0,
+            "salary_currency": "PLN",
+            "salary_type": "yearly",
+            "date_posted": None,
+            "skills": [],
+            "experience": None,
+            "location": None,
+            "raw_response": result,
+            "prompt_stats": prompt_stats
+        }
+        return json.dumps(default_json)
+
+def analyze_job_posting_with_llm(text, fields=None):
+    """
+    Analyze job posting text with the configured LLM backend, asking only for fields
+    (a subset of ANALYSIS_FIELDS) when given
     """
     if not text:
         print("[ERROR] No text provided for analysis")
@@ -70,157 +225,230 @@ def analyze_job_posting_with_llm(text):
     
     print(f"\n[DEBUG] Analyzing job posting text ({len(text)} characters)")
     try:
-        prompt = f"""
-        You are an expert job application assistant. Analyze the following job posting text and extract the key information.
-        Return the results in JSON format with the following fields:
-        - company: The company name
-        - role: The job title/role
-        - salary: The full salary text as mentioned in the posting (if available)
-        - salary_amount: The numeric salary amount (if available, otherwise 0). If a range is given, use the average or the lower bound.
-          For hourly rates, just extract the hourly amount (e.g., for "110,00–130,00 zł netto (+ VAT) / godz.", extract 110 or 120).
-          For monthly rates, extract the monthly amount.
-          For yearly rates, extract the yearly amount.
-          ALWAYS convert the amount to a number without currency symbols or thousand separators.
-        - salary_currency: The currency of the salary (PLN, EUR, USD, GBP, etc.). Look for currency symbols (zł, €, $, £) or abbreviations.
-        - salary_type: The type of salary (hourly, monthly, yearly). Look for indicators like "per hour", "per month", "per year", "godz.", etc.
-        - date_posted: The date the job was posted (in YYYY-MM-DD format if available)
-        - skills: A list of key skills required for the job
-        - experience: The required experience level
-        - location: The job location
+        messages, prompt_stats = build_analysis_messages(text, fields)
         
-        If any information is not available, use null or empty values. For salary_amount, use 0 if not available.
-        For salary_currency, default to "PLN" if not specified.
-        For salary_type, default to "yearly" if not specified.
-        
-        IMPORTANT: Your response must be valid JSON format only, with no additional text before or after the JSON.
-        
-        Job Posting Text:
-        {text}
-        """
-        
-        print("[DEBUG] Sending request to OpenAI API...")
-        # Test network connectivity to OpenAI
+        print(f"[DEBUG] Sending request to {llm_backend.name} backend ({llm_backend.model})...")
         try:
-            conn_test = requests.get("https://api.openai.com/v1", timeout=5)
-            print(f"[DEBUG] Connection test to OpenAI API: Status code {conn_test.status_code}")
-        except Exception as conn_err:
-            print(f"[ERROR] Connection test to OpenAI API failed: {str(conn_err)}")
+            result = llm_backend.complete(
+                messages,
+                temperature=0.3,
+                max_tokens=1000,
+                request_timeout=float(os.getenv('LLM_REQUEST_TIMEOUT', 60))
+            )
+        except Exception:
+            llm_health.breaker.record_failure()
+            raise
+        llm_health.breaker.record_success()
         
-        # Use OpenAI v0.28 format with a current model
-        print("[DEBUG] Creating OpenAI ChatCompletion...")
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a job posting analyzer that extracts structured data from job descriptions. Always respond with valid JSON only. When extracting salary_amount, always convert to a numeric value without currency symbols or thousand separators."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1000
-        )
-        
-        print("[DEBUG] OpenAI API request successful")
-        result = response.choices[0].message.content.strip()
+        print("[DEBUG] Completion request successful")
+        result = result.strip()
         print(f"[DEBUG] Response length: {len(result)} characters")
         print(f"[DEBUG] Raw response: {result}")
         
-        # Try to parse the result as JSON to validate it
+        return parse_llm_response(result, prompt_stats)
+    except Exception as e:
+        print(f"[ERROR] Error analyzing job posting with LLM: {str(e)}")
+        print(traceback.format_exc())
+        return None
+
+def stream_job_posting_analysis(text, fields=None):
+    """
+    Streaming variant of analyze_job_posting_with_llm: yields (name, value)
+    for each top-level field as soon as the model has finished writing it,
+    and returns the same JSON string (or None on failure) when done
+    """
+    if not text:
+        print("[ERROR] No text provided for analysis")
+        return None
+    
+    print(f"\n[DEBUG] Streaming analysis of job posting text ({len(text)} characters)")
+    try:
+        messages, prompt_stats = build_analysis_messages(text, fields)
+        parser = IncrementalJSONParser()
         try:
-            # Try to extract JSON if it's wrapped in markdown code blocks or other text
-            if result.find('{') >= 0 and result.rfind('}') > result.find('{'):
-                potential_json = result[result.find('{'):result.rfind('}')+1]
-                json_result = json.loads(potential_json)
-                print("[DEBUG] Successfully extracted and parsed JSON from response")
-                
-                # Post-process the salary_amount to ensure it's a number
-                if 'salary_amount' in json_result:
-                    try:
-                        # Remove any non-numeric characters except decimal point
-                        salary_str = str(json_result['salary_amount'])
-                        # Replace comma with dot for decimal point
-                        salary_str = salary_str.replace(',', '.')
-                        # Extract only digits and decimal point
-                        salary_str = ''.join(c for c in salary_str if c.isdigit() or c == '.')
-                        if salary_str:
-                            json_result['salary_amount'] = float(salary_str)
-                        else:
-                            json_result['salary_amount'] = 0
-                    except (ValueError, TypeError):
-                        json_result['salary_amount'] = 0
-                else:
-                    json_result['salary_amount'] = 0
-                
-                # Convert back to string for consistent return type
-                result = json.dumps(json_result)
-            else:
-                # Try parsing the whole response as JSON
-                json_result = json.loads(result)
-                print("[DEBUG] Successfully parsed response as JSON")
-                
-                # Post-process the salary_amount to ensure it's a number
-                if 'salary_amount' in json_result:
-                    try:
-                        # Remove any non-numeric characters except decimal point
-                        salary_str = str(json_result['salary_amount'])
-                        # Replace comma with dot for decimal point
-                        salary_str = salary_str.replace(',', '.')
-                        # Extract only digits and decimal point
-                        salary_str = ''.join(c for c in salary_str if c.isdigit() or c == '.')
-                        if salary_str:
-                            json_result['salary_amount'] = float(salary_str)
-                        else:
-                            json_result['salary_amount'] = 0
-                    except (ValueError, TypeError):
-                        json_result['salary_amount'] = 0
-                else:
-                    json_result['salary_amount'] = 0
-                
-                # Convert back to string for consistent return type
-                result = json.dumps(json_result)
-        except json.JSONDecodeError as e:
-            print(f"[WARNING] Response is not valid JSON: {str(e)}. Returning default JSON.")
-            # Create a default JSON response with the raw text included
-            default_json = {
-                "company": "Unknown",
-                "role": "Unknown",
-                "salary": None,
-                "salary_amount": 0,
-                "salary_currency": "PLN",
-                "salary_type": "yearly",
-                "date_posted": None,
-                "skills": [],
-                "experience": None,
-                "location": None,
-                "raw_response": result
-            }
-            result = json.dumps(default_json)
+            for delta in llm_backend.stream(
+                messages,
+                temperature=0.3,
+                max_tokens=1000,
+                request_timeout=float(os.getenv('LLM_REQUEST_TIMEOUT', 60))
+            ):
+                yield from parser.feed(delta)
+        except Exception:
+            llm_health.breaker.record_failure()
+            raise
+        llm_health.breaker.record_success()
         
-        return result
+        result = parser.buffer.strip()
+        print(f"[DEBUG] Streamed response length: {len(result)} characters")
+        return parse_llm_response(result, prompt_stats)
     except Exception as e:
-        print(f"[ERROR] Error analyzing job posting with LLM: {str(e)}")
+        print(f"[ERROR] Error streaming job posting analysis: {str(e)}")
         print(traceback.format_exc())
         return None
 
-def process_job_posting_url(url):
+def _analysis_events(url, cache=None, fetcher=None, stream=False, snapshots=None):
     """
-    Process a job posting URL: scrape content and analyze with LLM
+    Pipeline shared by process_job_posting_url and stream_job_posting_url.
+
+    Yields ('field', (name, value)) as soon as a field is known, then one
+    ('result', analysis_json) or ('error', message). With stream, the LLM
+    response is streamed and its fields are yielded as they complete.
+    Scraped text and its analysis are kept in snapshots (a PostingStore)
+    when given.
     """
     print(f"\n[DEBUG] Processing job posting URL: {url}")
+    llm_health.ensure_started()
+    
+    def cached_events(cached):
+        for name, value in json.loads(cached).items():
+            if name in ANALYSIS_FIELDS:
+                yield 'field', (name, value)
+        yield 'result', cached
+    
+    url_key = normalize_url(url) if cache else None
+    if cache:
+        cached = cache.get_recent(url_key)
+        if cached:
+            print(f"[DEBUG] Analysis cache hit for {url_key} (skipped scrape and LLM call)")
+            yield from cached_events(cached)
+            return
     
     # Scrape the job posting
-    content = scrape_job_posting(url)
+    html, content = fetch_job_posting(url, fetcher=fetcher)
     if not content:
         print("[ERROR] Failed to scrape job posting content")
-        return {
-            "error": "Failed to scrape job posting content"
-        }
+        yield 'error', "Failed to scrape job posting content"
+        return
     
-    # Analyze with LLM
-    analysis = analyze_job_posting_with_llm(content)
-    if not analysis:
-        print("[ERROR] Failed to analyze job posting content")
-        return {
-            "error": "Failed to analyze job posting content"
-        }
+    content_hash = hash_content(content) if cache or snapshots else None
+    if snapshots:
+        try:
+            snapshots.save(url, content, content_hash)
+        except Exception as e:
+            print(f"[WARNING] Could not store posting snapshot: {e}")
+    if cache:
+        cached = cache.get(url_key, content_hash)
+        if cached:
+            print(f"[DEBUG] Analysis cache hit for {url_key} with unchanged content (skipped LLM call)")
+            if snapshots:
+                snapshots.save_analysis(content_hash, cached)
+            yield from cached_events(cached)
+            return
+    
+    # Deterministic extraction before (or instead of) the LLM
+    domain = urlsplit(url).hostname or ''
+    start = time.perf_counter()
+    fields, sources = extract_structured(html, content)
+    extract_ms = (time.perf_counter() - start) * 1000
+    missing = [field for field in ANALYSIS_FIELDS if field not in fields]
+    print(f"[DEBUG] Structured extraction found {len(fields)} fields in {extract_ms:.1f} ms, missing: {missing}")
+    for name, value in fields.items():
+        yield 'field', (name, value)
+    
+    extraction = {'sources': sources, 'missing': missing, 'llm_called': False, 'extract_ms': round(extract_ms, 2)}
+    if not any(field in missing for field in STRUCTURED_REQUIRED_FIELDS):
+        extraction_stats.record(domain, len(fields), extract_ms, llm_called=False)
+        analysis = json.dumps(dict(fields, extraction=extraction))
+        print("[DEBUG] All required fields found without the LLM (skipped LLM call)")
+    else:
+        # Fail fast while the LLM upstream is known to be down; a partial
+        # structured result is still better than nothing
+        if not llm_health.breaker.allow_request():
+            if fields:
+                print("[WARNING] LLM circuit open, returning partial structured result")
+                yield 'result', json.dumps(dict(fields, extraction=dict(extraction, incomplete=True)))
+                return
+            raise CircuitOpenError("LLM backend is unavailable (circuit open), skipping analysis")
+        
+        # Analyze with LLM, asking only for what is still missing
+        start = time.perf_counter()
+        if stream:
+            analysis = None
+            streamed = stream_job_posting_analysis(content, fields=missing)
+            while True:
+                try:
+                    name, value = next(streamed)
+                except StopIteration as done:
+                    analysis = done.value
+                    break
+                # Structured values take precedence over the model's answers
+                if name in missing:
+                    if name == 'salary_amount':
+                        value = normalize_salary_amount(value)
+                    yield 'field', (name, value)
+        else:
+            analysis = analyze_job_posting_with_llm(content, fields=missing)
+        llm_ms = (time.perf_counter() - start) * 1000
+        extraction_stats.record(domain, len(fields), extract_ms, llm_called=True, llm_ms=llm_ms)
+        if not analysis:
+            print("[ERROR] Failed to analyze job posting content")
+            yield 'error', "Failed to analyze job posting content"
+            return
+        
+        # Structured values take precedence over the model's answers
+        merged = json.loads(analysis)
+        merged.update(fields)
+        merged['extraction'] = dict(extraction, llm_called=True)
+        analysis = json.dumps(merged)
+    
+    # Only cache clean results; the fallback JSON carries the raw response
+    if 'raw_response' not in json.loads(analysis):
+        if cache:
+            cache.put(url_key, content_hash, analysis)
+        if snapshots:
+            snapshots.save_analysis(content_hash, analysis)
     
     print("[DEBUG] Successfully processed job posting URL")
-    return analysis
+    yield 'result', analysis
+
+def analyze_posting_text(text):
+    """
+    Analyze stored posting text (a snapshot) without scraping: salary
+    patterns are read from the text and the LLM is asked for the remaining
+    fields. Returns the analysis JSON, or None when the LLM call failed.
+    """
+    llm_health.ensure_started()
+    fields, sources = extract_structured('', text)
+    missing = [field for field in ANALYSIS_FIELDS if field not in fields]
+    if not llm_health.breaker.allow_request():
+        raise CircuitOpenError("LLM backend is unavailable (circuit open), skipping analysis")
+    analysis = analyze_job_posting_with_llm(text, fields=missing)
+    if not analysis:
+        return None
+    merged = json.loads(analysis)
+    merged.update(fields)
+    merged['extraction'] = {'sources': sources, 'missing': missing, 'llm_called': True, 'snapshot': True}
+    return json.dumps(merged)
+
+def process_job_posting_url(url, cache=None, fetcher=None, snapshots=None):
+    """
+    Process a job posting URL: scrape content and analyze with LLM
+
+    If an AnalysisCache is given, a recent result for the normalized URL is
+    returned without scraping, and a result for identical scraped content is
+    returned without calling the LLM. The page is downloaded with fetcher
+    (a PageFetcher) when given, or the shared default session otherwise.
+
+    Structured data on the page (JSON-LD, microdata, OpenGraph, salary
+    patterns) is extracted first; the LLM is only asked for the fields still
+    missing, and is skipped when all STRUCTURED_REQUIRED_FIELDS were found.
+
+    With a PostingStore as snapshots, the scraped text and its analysis are
+    kept so the posting can be searched and re-analyzed later.
+    """
+    for event, data in _analysis_events(url, cache=cache, fetcher=fetcher, snapshots=snapshots):
+        if event == 'result':
+            return data
+        if event == 'error':
+            return {
+                "error": data
+            }
+
+def stream_job_posting_url(url, cache=None, fetcher=None, snapshots=None):
+    """
+    Streaming variant of process_job_posting_url. Yields ('field', (name,
+    value)) events as each field becomes known (structured fields first,
+    then fields from the streamed LLM response) and finally ('result',
+    analysis_json) or ('error', message).
+    """
+    return _analysis_events(url, cache=cache, fetcher=fetcher, stream=True, snapshots=snapshots)
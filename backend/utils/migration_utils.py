@@ -0,0 +1,595 @@
+import json
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Migrations are frozen once they ship: each one carries its own DDL, trigger
+# bodies and data transforms instead of calling the live helpers in other
+# modules, which keep evolving. The _vN_ helpers and constants below belong
+# to migration N (and the later migrations that name them) and are never
+# edited; a schema change is a new migration with its own copy.
+
+# Columns added to the applications table after its first release. Databases
+# created before they existed are upgraded by the baseline migration.
+LEGACY_COLUMNS = [
+    ('salary_amount', 'REAL DEFAULT 0'),
+    ('salary_currency', "TEXT DEFAULT 'PLN'"),
+    ('salary_type', "TEXT DEFAULT 'yearly'"),
+    ('cover_letter_path', 'TEXT'),
+    ('status', "TEXT DEFAULT 'Applied'"),
+    ('notes', 'TEXT'),
+    ('last_updated', 'TEXT'),
+]
+
+# Added by migration 2 and replaced by idx_applications_salary_yearly
+LEGACY_MONTHLY_SALARY_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_applications_monthly_salary ON applications ("
+    "IFNULL(salary_amount, 0) * CASE salary_type "
+    "WHEN 'hourly' THEN 173.2 WHEN 'yearly' THEN 1.0 / 12 ELSE 1 END, id)"
+)
+
+
+def _baseline_schema(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS applications (
+        id INTEGER PRIMARY KEY,
+        company TEXT,
+        role TEXT,
+        salary TEXT,
+        salary_amount REAL,
+        salary_currency TEXT DEFAULT 'PLN',
+        salary_type TEXT DEFAULT 'yearly',
+        url TEXT,
+        date_posted TEXT,
+        date_applied TEXT,
+        cv_path TEXT,
+        cover_letter_path TEXT,
+        status TEXT DEFAULT 'Applied',
+        notes TEXT,
+        last_updated TEXT
+    )
+    ''')
+
+    # Pre-versioning databases may lack some columns; this is the only place
+    # table_info is probed and it runs once per database.
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(applications)').fetchall()}
+    for name, definition in LEGACY_COLUMNS:
+        if name not in columns:
+            cursor.execute(f'ALTER TABLE applications ADD COLUMN {name} {definition}')
+
+
+# Keyset pagination / sort indexes used by GET /api/applications (the
+# expressions match SORT_KEYS in utils/query_utils.py)
+_V2_APPLICATION_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_applications_date_applied ON applications (IFNULL(date_applied, ''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_applications_date_posted ON applications (IFNULL(date_posted, ''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_applications_company ON applications (IFNULL(company, ''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_applications_role ON applications (IFNULL(role, ''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (IFNULL(status, ''), id)",
+    "CREATE INDEX IF NOT EXISTS idx_applications_status_date ON applications (status, date_applied)",
+]
+
+
+def _list_and_stats_indexes(cursor):
+    for statement in _V2_APPLICATION_INDEXES:
+        cursor.execute(statement)
+    cursor.execute(LEGACY_MONTHLY_SALARY_INDEX)
+
+    # Covering indexes for /api/stats: GROUP BY status and company are served
+    # from the index alone, and salary aggregates read a partial index.
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_applications_company_plain ON applications (company)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_applications_salary_amount ON applications (salary_amount) WHERE salary_amount > 0')
+    cursor.execute('ANALYZE')
+
+
+def _analysis_cache_table(cursor):
+    # Level-2 store for utils/cache_utils.AnalysisCache
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS analysis_cache (
+        url_key TEXT NOT NULL,
+        content_hash TEXT NOT NULL,
+        result TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        last_accessed REAL NOT NULL,
+        hits INTEGER DEFAULT 0,
+        PRIMARY KEY (url_key, content_hash)
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_analysis_cache_url_created ON analysis_cache (url_key, created_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_analysis_cache_created ON analysis_cache (created_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_accessed ON analysis_cache (last_accessed)')
+
+
+def _jobs_table(cursor):
+    # Background job queue for utils/job_utils.JobQueue
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        payload TEXT,
+        status TEXT NOT NULL,
+        attempts INTEGER DEFAULT 0,
+        max_attempts INTEGER DEFAULT 3,
+        result TEXT,
+        error TEXT,
+        created_at REAL NOT NULL,
+        run_after REAL NOT NULL,
+        started_at REAL,
+        finished_at REAL,
+        locked_by TEXT
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status_run_after ON jobs (status, run_after, created_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status_finished ON jobs (status, finished_at)')
+
+
+def _http_cache_table(cursor):
+    # Validator store for conditional requests in utils/http_utils.PageFetcher
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS http_cache (
+        url TEXT PRIMARY KEY,
+        etag TEXT,
+        last_modified TEXT,
+        encoding TEXT,
+        body BLOB NOT NULL,
+        fetched_at REAL NOT NULL
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_http_cache_fetched_at ON http_cache (fetched_at)')
+
+
+_V6_STATS_TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS stats_summary (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        total INTEGER NOT NULL DEFAULT 0,
+        salary_count INTEGER NOT NULL DEFAULT 0,
+        salary_sum REAL NOT NULL DEFAULT 0
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS stats_groups (
+        dimension TEXT NOT NULL,
+        value TEXT,
+        count INTEGER NOT NULL DEFAULT 0
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_stats_groups_value ON stats_groups (dimension, value)',
+    'CREATE INDEX IF NOT EXISTS idx_stats_groups_count ON stats_groups (dimension, count)',
+]
+_V6_STATS_DIMENSIONS = ('status', 'company')
+
+
+def _v6_stats_triggers(salary_column):
+    # Triggers of utils/stats_utils.py over the given salary column
+    def summary(row, sign):
+        return (f"UPDATE stats_summary SET total = total {sign} 1, "
+                f"salary_count = salary_count {sign} (CASE WHEN {row}.{salary_column} > 0 THEN 1 ELSE 0 END), "
+                f"salary_sum = salary_sum {sign} (CASE WHEN {row}.{salary_column} > 0 THEN {row}.{salary_column} ELSE 0 END) "
+                "WHERE id = 1;")
+
+    def add(row):
+        return ''.join(
+            f"INSERT INTO stats_groups (dimension, value, count) SELECT '{d}', {row}.{d}, 0 "
+            f"WHERE NOT EXISTS (SELECT 1 FROM stats_groups WHERE dimension = '{d}' AND value IS {row}.{d});"
+            f"UPDATE stats_groups SET count = count + 1 WHERE dimension = '{d}' AND value IS {row}.{d};"
+            for d in _V6_STATS_DIMENSIONS)
+
+    def remove(row):
+        return ''.join(
+            f"UPDATE stats_groups SET count = count - 1 WHERE dimension = '{d}' AND value IS {row}.{d};"
+            f"DELETE FROM stats_groups WHERE dimension = '{d}' AND value IS {row}.{d} AND count <= 0;"
+            for d in _V6_STATS_DIMENSIONS)
+
+    def update_groups():
+        return ''.join(
+            f"UPDATE stats_groups SET count = count - 1 WHERE dimension = '{d}' AND value IS OLD.{d};"
+            f"DELETE FROM stats_groups WHERE dimension = '{d}' AND value IS OLD.{d} AND count <= 0;"
+            f"INSERT INTO stats_groups (dimension, value, count) SELECT '{d}', NEW.{d}, 0 "
+            f"WHERE NOT EXISTS (SELECT 1 FROM stats_groups WHERE dimension = '{d}' AND value IS NEW.{d});"
+            f"UPDATE stats_groups SET count = count + 1 WHERE dimension = '{d}' AND value IS NEW.{d};"
+            for d in _V6_STATS_DIMENSIONS)
+
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS trg_stats_insert AFTER INSERT ON applications BEGIN "
+        f"{summary('NEW', '+')}{add('NEW')} END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_stats_delete AFTER DELETE ON applications BEGIN "
+        f"{summary('OLD', '-')}{remove('OLD')} END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_stats_update AFTER UPDATE OF {salary_column}, "
+        f"{', '.join(_V6_STATS_DIMENSIONS)} ON applications BEGIN "
+        f"{summary('OLD', '-')}{summary('NEW', '+')}{update_groups()} END",
+    ]
+
+
+def _v6_fill_stats(cursor, salary_column):
+    cursor.execute('DELETE FROM stats_summary')
+    cursor.execute('DELETE FROM stats_groups')
+    cursor.execute(f'''
+        INSERT INTO stats_summary (id, total, salary_count, salary_sum)
+        SELECT 1, COUNT(*),
+               IFNULL(SUM(CASE WHEN {salary_column} > 0 THEN 1 ELSE 0 END), 0),
+               IFNULL(SUM(CASE WHEN {salary_column} > 0 THEN {salary_column} ELSE 0 END), 0)
+        FROM applications
+    ''')
+    for dimension in _V6_STATS_DIMENSIONS:
+        cursor.execute(f'''
+            INSERT INTO stats_groups (dimension, value, count)
+            SELECT '{dimension}', {dimension}, COUNT(*) FROM applications GROUP BY {dimension}
+        ''')
+
+
+def _stats_tables(cursor):
+    # Materialized /api/stats aggregates maintained by triggers (utils/stats_utils.py),
+    # over the raw salary amount at this version
+    for statement in _V6_STATS_TABLES:
+        cursor.execute(statement)
+    for statement in _v6_stats_triggers('salary_amount'):
+        cursor.execute(statement)
+    _v6_fill_stats(cursor, 'salary_amount')
+
+
+# Built-in exchange rates (PLN per unit) as shipped with migrations 7 and 8
+_V7_RATES = {'PLN': 1.0, 'EUR': 4.17, 'USD': 3.84, 'GBP': 4.96}
+_V7_RATES_AS_OF = '2025-03-01'
+_V7_PERIODS_PER_YEAR = {'hourly': 40 * 52, 'monthly': 12, 'yearly': 1}
+
+
+def _v7_yearly_pln(amount, currency, salary_type):
+    if amount is None or amount == '':
+        return None
+    try:
+        amount = float(amount)
+    except (TypeError, ValueError):
+        return None
+    return amount * _V7_RATES.get(currency, 1.0) * _V7_PERIODS_PER_YEAR.get(salary_type, 1)
+
+
+def _salary_yearly_pln(cursor):
+    # Currency- and period-normalized salary, written by the API on insert/update
+    cursor.execute('ALTER TABLE applications ADD COLUMN salary_yearly_pln REAL')
+    rows = cursor.execute('SELECT id, salary_amount, salary_currency, salary_type FROM applications').fetchall()
+    # The built-in rates: the exchange_rates table does not exist yet at this version
+    cursor.executemany('UPDATE applications SET salary_yearly_pln = ? WHERE id = ?',
+                       [(_v7_yearly_pln(row[1], row[2], row[3]), row[0]) for row in rows])
+    # Superseded by idx_applications_salary_yearly (sorting, salary filters, and stats min/max)
+    cursor.execute('DROP INDEX IF EXISTS idx_applications_monthly_salary')
+    cursor.execute('DROP INDEX IF EXISTS idx_applications_salary_amount')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_applications_salary_yearly ON applications '
+                   '(IFNULL(salary_yearly_pln, 0), id)')
+    # Stats now aggregate the normalized column instead of raw amounts
+    for name in ('trg_stats_insert', 'trg_stats_delete', 'trg_stats_update'):
+        cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+    for statement in _v6_stats_triggers('salary_yearly_pln'):
+        cursor.execute(statement)
+    _v6_fill_stats(cursor, 'salary_yearly_pln')
+    cursor.execute('ANALYZE')
+
+
+def _exchange_rates_table(cursor):
+    # Persistent store behind utils/rates_utils.RateStore, seeded with the built-in rates
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS exchange_rates (
+        currency TEXT PRIMARY KEY,
+        rate REAL NOT NULL,
+        as_of TEXT,
+        source TEXT,
+        updated_at REAL NOT NULL
+    )
+    ''')
+    cursor.executemany(
+        'INSERT OR IGNORE INTO exchange_rates (currency, rate, as_of, source, updated_at) VALUES (?, ?, ?, ?, ?)',
+        [(currency, rate, _V7_RATES_AS_OF, 'default', time.time()) for currency, rate in _V7_RATES.items()]
+    )
+
+
+def _change_counters(cursor):
+    # Per-table write counters for ETags (utils/etag_utils.py); any insert,
+    # update or delete bumps the table's version in the same transaction
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS change_counters (
+        name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    ''')
+    for table in ('applications',):
+        cursor.execute('INSERT OR IGNORE INTO change_counters (name, version) VALUES (?, 0)', (table,))
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()} AFTER {event} ON {table}
+            BEGIN
+                UPDATE change_counters SET version = version + 1 WHERE name = '{table}';
+            END
+            ''')
+
+
+def _v10_blob_sha(column):
+    # Hash part of an uploads/blobs/<sha256>/<name> reference, NULL for other paths
+    return f"(CASE WHEN {column} LIKE 'uploads/blobs/%' THEN substr({column}, 15, 64) END)"
+
+
+def _file_blobs_table(cursor):
+    # Content-addressed upload store (utils/upload_utils.BlobStore); ref_count
+    # follows cv_path / cover_letter_path through triggers
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS file_blobs (
+        sha256 TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        ref_count INTEGER NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL,
+        last_uploaded REAL NOT NULL,
+        uploads INTEGER NOT NULL DEFAULT 1
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_file_blobs_unreferenced ON file_blobs (last_uploaded) WHERE ref_count <= 0')
+
+    def adjust(row, sign):
+        return ''.join(f"UPDATE file_blobs SET ref_count = ref_count {sign} 1 WHERE sha256 = {_v10_blob_sha(f'{row}.{column}')};"
+                       for column in ('cv_path', 'cover_letter_path'))
+
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_file_refs_insert AFTER INSERT ON applications BEGIN {adjust('NEW', '+')} END")
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_file_refs_delete AFTER DELETE ON applications BEGIN {adjust('OLD', '-')} END")
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_file_refs_update AFTER UPDATE OF cv_path, cover_letter_path ON applications "
+                   f"BEGIN {adjust('OLD', '-')}{adjust('NEW', '+')} END")
+
+
+def _v11_documents_sql(row):
+    # Text of the documents referenced by row, '' when none were extracted
+    parts = [f"IFNULL((SELECT text FROM document_texts WHERE sha256 = {_v10_blob_sha(f'{row}.{column}')}), '')"
+             for column in ('cv_path', 'cover_letter_path')]
+    return f"trim({' || char(10) || '.join(parts)})"
+
+
+def _search_index(cursor):
+    # FTS5 index over applications and attached documents (utils/search_utils.py);
+    # posting and document texts are filled by flask reindex-search
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS document_texts (
+        sha256 TEXT PRIMARY KEY,
+        text TEXT NOT NULL,
+        extracted_at REAL NOT NULL
+    )
+    ''')
+    cursor.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts USING fts5(
+        company, role, notes, posting, documents,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    ''')
+    documents_new = _v11_documents_sql('NEW')
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_search_insert AFTER INSERT ON applications BEGIN
+        INSERT INTO applications_fts (rowid, company, role, notes, posting, documents)
+        VALUES (NEW.id, NEW.company, NEW.role, NEW.notes, '', {documents_new});
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_search_delete AFTER DELETE ON applications BEGIN
+        DELETE FROM applications_fts WHERE rowid = OLD.id;
+    END
+    ''')
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_search_update AFTER UPDATE OF company, role, notes, cv_path, cover_letter_path
+    ON applications BEGIN
+        UPDATE applications_fts
+        SET company = NEW.company, role = NEW.role, notes = NEW.notes, documents = {documents_new}
+        WHERE rowid = NEW.id;
+    END
+    ''')
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_search_document AFTER INSERT ON document_texts BEGIN
+        UPDATE applications_fts
+        SET documents = (SELECT {_v11_documents_sql('a')} FROM applications a WHERE a.id = applications_fts.rowid)
+        WHERE rowid IN (SELECT id FROM applications WHERE cv_path LIKE 'uploads/blobs/' || NEW.sha256 || '/%'
+                                                       OR cover_letter_path LIKE 'uploads/blobs/' || NEW.sha256 || '/%');
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_search_blob_delete AFTER DELETE ON file_blobs BEGIN
+        DELETE FROM document_texts WHERE sha256 = OLD.sha256;
+    END
+    ''')
+    cursor.execute('DELETE FROM applications_fts')
+    cursor.execute(f'''
+        INSERT INTO applications_fts (rowid, company, role, notes, posting, documents)
+        SELECT a.id, a.company, a.role, a.notes, '', {_v11_documents_sql('a')} FROM applications a
+    ''')
+
+
+# URL normalization of utils/cache_utils.py as of migration 12, to match the
+# analysis_cache keys written until then
+_V12_TRACKING_PARAMS = {
+    'gclid', 'fbclid', 'dclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid',
+    'ref', 'ref_src', 'refid', 'referrer', 'source', 'src', 'trk', 'trkinfo',
+    'trackingid', 'tracking_id', 'si', 'igshid', '_hsenc', '_hsmi',
+}
+_V12_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def _v12_normalize_url(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or 'https'
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != _V12_DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _V12_TRACKING_PARAMS and not key.lower().startswith('utm_')
+    ]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ''))
+
+
+def _v12_name(value):
+    if value is None:
+        return None
+    name = ' '.join(str(value).split())[:100]
+    return name or None
+
+
+def _v12_profile(result):
+    # Skills, experience and location of a cached analysis, normalized as
+    # utils/posting_utils.profile_from_analysis did at this version
+    try:
+        analysis = json.loads(result)
+    except ValueError:
+        analysis = None
+    if not isinstance(analysis, dict):
+        analysis = {}
+    skills, seen = [], set()
+    value = analysis.get('skills')
+    if isinstance(value, str):
+        value = value.split(',')
+    for item in (value if isinstance(value, (list, tuple)) else [value] if value is not None else []):
+        name = _v12_name(item)
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            skills.append(name)
+    location = analysis.get('location')
+    if isinstance(location, (list, tuple)):
+        location = ', '.join(str(item) for item in location if item)
+    return skills[:50], _v12_name(analysis.get('experience')), _v12_name(location)
+
+
+def _posting_profiles(cursor):
+    # Posting snapshots and skills/experience/location tables (utils/posting_utils.py)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS posting_snapshots (
+        content_hash TEXT PRIMARY KEY,
+        url_key TEXT NOT NULL,
+        url TEXT NOT NULL,
+        text BLOB NOT NULL,
+        text_size INTEGER NOT NULL,
+        analysis TEXT,
+        fetched_at REAL NOT NULL
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_posting_snapshots_url ON posting_snapshots (url_key, fetched_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_posting_snapshots_fetched ON posting_snapshots (fetched_at)')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS skills (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL COLLATE NOCASE UNIQUE
+    )
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS application_skills (
+        application_id INTEGER NOT NULL,
+        skill_id INTEGER NOT NULL,
+        PRIMARY KEY (application_id, skill_id)
+    ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_application_skills_skill ON application_skills (skill_id, application_id)')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS locations (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL COLLATE NOCASE UNIQUE
+    )
+    ''')
+    cursor.execute('ALTER TABLE applications ADD COLUMN experience TEXT')
+    cursor.execute('ALTER TABLE applications ADD COLUMN location_id INTEGER')
+    cursor.execute('ALTER TABLE applications ADD COLUMN posting_hash TEXT')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_applications_location ON applications (location_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_applications_posting_hash ON applications (posting_hash) '
+                   'WHERE posting_hash IS NOT NULL')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_application_skills_delete AFTER DELETE ON applications BEGIN
+        DELETE FROM application_skills WHERE application_id = OLD.id;
+    END
+    ''')
+
+    # Profiles of existing applications from their cached analysis, if any
+    latest = {}
+    for url_key, result in cursor.execute('SELECT url_key, result FROM analysis_cache ORDER BY created_at'):
+        latest[url_key] = result
+    rows = cursor.execute("SELECT id, url FROM applications WHERE url IS NOT NULL AND url != ''").fetchall()
+    for app_id, url in rows:
+        result = latest.get(_v12_normalize_url(url))
+        if result is None:
+            continue
+        skills, experience, location = _v12_profile(result)
+        location_id = None
+        if location:
+            cursor.execute('INSERT OR IGNORE INTO locations (name) VALUES (?)', (location,))
+            location_id = cursor.execute('SELECT id FROM locations WHERE name = ?', (location,)).fetchone()[0]
+        cursor.execute('UPDATE applications SET experience = ?, location_id = ? WHERE id = ?',
+                       (experience, location_id, app_id))
+        cursor.executemany('INSERT OR IGNORE INTO skills (name) VALUES (?)', [(name,) for name in skills])
+        cursor.executemany('''
+            INSERT OR IGNORE INTO application_skills (application_id, skill_id)
+            SELECT ?, id FROM skills WHERE name = ?
+        ''', [(app_id, name) for name in skills])
+
+
+def _posting_snapshots_counter(cursor):
+    # Change counter for posting_snapshots, so ETags of the posting endpoint
+    # change when a reanalysis rewrites the stored analysis
+    cursor.execute("INSERT OR IGNORE INTO change_counters (name, version) VALUES ('posting_snapshots', 0)")
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_posting_snapshots_version_{event.lower()} AFTER {event} ON posting_snapshots
+        BEGIN
+            UPDATE change_counters SET version = version + 1 WHERE name = 'posting_snapshots';
+        END
+        ''')
+
+
+# Ordered list of (version, description, function). Append new migrations to
+# the end with the next version number; never edit one that has shipped.
+MIGRATIONS = [
+    (1, 'baseline applications schema', _baseline_schema),
+    (2, 'list and stats indexes', _list_and_stats_indexes),
+    (3, 'analysis cache table', _analysis_cache_table),
+    (4, 'background jobs table', _jobs_table),
+    (5, 'http response store', _http_cache_table),
+    (6, 'materialized stats tables', _stats_tables),
+    (7, 'normalized yearly PLN salary column', _salary_yearly_pln),
+    (8, 'exchange rates table', _exchange_rates_table),
+    (9, 'table change counters', _change_counters),
+    (10, 'content-addressed upload store', _file_blobs_table),
+    (11, 'full-text search index', _search_index),
+    (12, 'posting snapshots and skills/location tables', _posting_profiles),
+    (13, 'posting snapshots change counter', _posting_snapshots_counter),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def run_migrations(conn, migrations=None):
+    """
+    Bring the database up to the latest schema version.
+
+    The current version is read from PRAGMA user_version, so an up-to-date
+    database costs a single pragma read. Pending migrations run inside one
+    transaction together with the version bump and are rolled back as a
+    whole if any of them fails. Returns the list of applied versions.
+    """
+    migrations = MIGRATIONS if migrations is None else migrations
+    current = get_schema_version(conn)
+    pending = [m for m in migrations if m[0] > current]
+    if not pending:
+        return []
+
+    start = time.perf_counter()
+    cursor = conn.cursor()
+    cursor.execute('BEGIN IMMEDIATE')
+    try:
+        # Re-read inside the write lock in case another process migrated first
+        current = get_schema_version(conn)
+        pending = [m for m in pending if m[0] > current]
+        for version, description, migrate in pending:
+            print(f"[DB] Applying migration {version}: {description}")
+            migrate(cursor)
+        if pending:
+            cursor.execute(f'PRAGMA user_version = {pending[-1][0]}')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"[DB] Schema migrated to version {get_schema_version(conn)} in {elapsed_ms:.1f} ms")
+    return [m[0] for m in pending]
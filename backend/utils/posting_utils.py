@@ -0,0 +1,262 @@
+"""
+Posting snapshots and the profile (skills, experience, location) taken from
+the analysis of a posting.
+
+- posting_snapshots keeps the scraped text of every analyzed posting,
+  zlib-compressed and keyed by content hash, together with the latest
+  analysis of that text. applications.posting_hash points at the snapshot
+  an application was saved with, so its posting can be shown, searched and
+  re-analyzed without scraping the page again.
+- skills and locations are lookup tables (one row per distinct name, case
+  insensitive); application_skills joins applications to skills and is
+  indexed by skill, so "applications asking for Kubernetes" and the skill
+  counts are index reads. experience is a plain column on applications.
+
+The tables are created by migration 12 (utils/migration_utils.py).
+"""
+import json
+import time
+import zlib
+
+from utils.cache_utils import hash_content, normalize_url
+
+# Bounds on what is stored per application
+MAX_SKILLS = 50
+MAX_NAME_LENGTH = 100
+
+PROFILE_FIELDS = ('skills', 'experience', 'location')
+
+
+def _clean_name(value):
+    if value is None:
+        return None
+    name = ' '.join(str(value).split())[:MAX_NAME_LENGTH]
+    return name or None
+
+
+def normalize_skills(value):
+    """
+    Skills from an analysis (a list, or a comma-separated string) as a list
+    of distinct names, first spelling kept
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    skills, seen = [], set()
+    for item in value if isinstance(value, (list, tuple)) else [value]:
+        name = _clean_name(item)
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            skills.append(name)
+    return skills[:MAX_SKILLS]
+
+
+def normalize_location(value):
+    if isinstance(value, (list, tuple)):
+        value = ', '.join(str(item) for item in value if item)
+    return _clean_name(value)
+
+
+def profile_from_analysis(analysis):
+    """
+    The profile fields of an analysis (dict or JSON string), normalized
+    """
+    if isinstance(analysis, str):
+        try:
+            analysis = json.loads(analysis)
+        except ValueError:
+            analysis = None
+    if not isinstance(analysis, dict):
+        analysis = {}
+    return {
+        'skills': normalize_skills(analysis.get('skills')),
+        'experience': _clean_name(analysis.get('experience')),
+        'location': normalize_location(analysis.get('location')),
+    }
+
+
+def merge_profile(data, base=None):
+    """
+    Profile to save for an application: fields present in data (the request
+    body) win, the others come from base (an analysis or a stored profile)
+    """
+    profile = profile_from_analysis(base)
+    sent = profile_from_analysis({field: data[field] for field in PROFILE_FIELDS if field in data})
+    for field in PROFILE_FIELDS:
+        if field in data:
+            profile[field] = sent[field]
+    return profile
+
+
+def location_id(conn, name):
+    """
+    Id of the named location, created if new; None for no location (no commit)
+    """
+    if not name:
+        return None
+    conn.execute('INSERT OR IGNORE INTO locations (name) VALUES (?)', (name,))
+    return conn.execute('SELECT id FROM locations WHERE name = ?', (name,)).fetchone()[0]
+
+
+def save_skills(conn, app_id, skills):
+    """
+    Replace the skills of one application (no commit)
+    """
+    conn.execute('DELETE FROM application_skills WHERE application_id = ?', (app_id,))
+    if not skills:
+        return
+    conn.executemany('INSERT OR IGNORE INTO skills (name) VALUES (?)', [(name,) for name in skills])
+    placeholders = ', '.join('?' for _ in skills)
+    conn.execute(f'''
+        INSERT OR IGNORE INTO application_skills (application_id, skill_id)
+        SELECT ?, id FROM skills WHERE name IN ({placeholders})
+    ''', [app_id, *skills])
+
+
+def save_profile(conn, app_id, profile):
+    """
+    Store skills, experience and location of one application (no commit)
+    """
+    conn.execute('UPDATE applications SET experience = ?, location_id = ? WHERE id = ?',
+                 (profile['experience'], location_id(conn, profile['location']), app_id))
+    save_skills(conn, app_id, profile['skills'])
+
+
+def read_profile(conn, app_id):
+    """
+    skills, experience and location of one application
+    """
+    row = conn.execute('''
+        SELECT a.experience, l.name FROM applications a LEFT JOIN locations l ON l.id = a.location_id
+        WHERE a.id = ?
+    ''', (app_id,)).fetchone()
+    skills = [r[0] for r in conn.execute('''
+        SELECT s.name FROM application_skills x JOIN skills s ON s.id = x.skill_id
+        WHERE x.application_id = ? ORDER BY s.name
+    ''', (app_id,))]
+    return {
+        'skills': skills,
+        'experience': row[0] if row else None,
+        'location': row[1] if row else None,
+    }
+
+
+def skill_counts(conn, limit=20):
+    """
+    Most requested skills over all applications: [{'skill', 'count'}]
+    """
+    # Grouped straight from idx_application_skills_skill
+    rows = conn.execute('''
+        SELECT s.name, c.count FROM (
+            SELECT skill_id, COUNT(*) AS count FROM application_skills GROUP BY skill_id
+        ) c JOIN skills s ON s.id = c.skill_id
+        ORDER BY c.count DESC, s.name
+        LIMIT ?
+    ''', (limit,)).fetchall()
+    return [{'skill': row[0], 'count': row[1]} for row in rows]
+
+
+def location_counts(conn, limit=20):
+    """
+    Applications per location: [{'location', 'count'}]
+    """
+    rows = conn.execute('''
+        SELECT l.name, c.count FROM (
+            SELECT location_id, COUNT(*) AS count FROM applications
+            WHERE location_id IS NOT NULL GROUP BY location_id
+        ) c JOIN locations l ON l.id = c.location_id
+        ORDER BY c.count DESC, l.name
+        LIMIT ?
+    ''', (limit,)).fetchall()
+    return [{'location': row[0], 'count': row[1]} for row in rows]
+
+
+class PostingStore:
+    """
+    Compressed snapshots of scraped posting text.
+
+    save() is called by the analysis pipeline with every freshly scraped
+    text; identical text is stored once. Snapshots no application refers to
+    are dropped after retention seconds.
+    """
+
+    def __init__(self, pool, retention=30 * 24 * 3600, compress_level=6):
+        self.pool = pool
+        self.retention = retention
+        self.compress_level = compress_level
+
+    def save(self, url, text, content_hash=None):
+        """
+        Store the text scraped from url; returns its content hash
+        """
+        content_hash = content_hash or hash_content(text)
+        now = time.time()
+        raw = text.encode('utf-8')
+        compressed = zlib.compress(raw, self.compress_level)
+        conn = self.pool.acquire()
+        try:
+            conn.execute('''
+                INSERT INTO posting_snapshots (content_hash, url_key, url, text, text_size, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (content_hash) DO UPDATE SET
+                    url_key = excluded.url_key, url = excluded.url, fetched_at = excluded.fetched_at
+            ''', (content_hash, normalize_url(url), url, compressed, len(raw), now))
+            conn.execute('''
+                DELETE FROM posting_snapshots WHERE fetched_at < ? AND NOT EXISTS (
+                    SELECT 1 FROM applications WHERE posting_hash = posting_snapshots.content_hash
+                )
+            ''', (now - self.retention,))
+            conn.commit()
+        finally:
+            self.pool.release(conn)
+        return content_hash
+
+    def save_analysis(self, content_hash, analysis):
+        conn = self.pool.acquire()
+        try:
+            conn.execute('UPDATE posting_snapshots SET analysis = ? WHERE content_hash = ?', (analysis, content_hash))
+            conn.commit()
+        finally:
+            self.pool.release(conn)
+
+    def latest(self, conn, url):
+        """
+        Most recent snapshot for url (any equivalent link): dict with
+        content_hash and analysis, or None
+        """
+        if not url:
+            return None
+        row = conn.execute('''
+            SELECT content_hash, analysis FROM posting_snapshots WHERE url_key = ?
+            ORDER BY fetched_at DESC LIMIT 1
+        ''', (normalize_url(url),)).fetchone()
+        return {'content_hash': row[0], 'analysis': row[1]} if row else None
+
+    def stats(self):
+        conn = self.pool.acquire()
+        try:
+            row = conn.execute('''
+                SELECT COUNT(*), IFNULL(SUM(text_size), 0), IFNULL(SUM(length(text)), 0) FROM posting_snapshots
+            ''').fetchone()
+        finally:
+            self.pool.release(conn)
+        return {'snapshots': row[0], 'text_bytes': row[1], 'stored_bytes': row[2]}
+
+
+def read_snapshot(conn, content_hash):
+    """
+    Snapshot with its decompressed text, or None
+    """
+    row = conn.execute('''
+        SELECT content_hash, url, text, analysis, fetched_at FROM posting_snapshots WHERE content_hash = ?
+    ''', (content_hash,)).fetchone()
+    if row is None:
+        return None
+    return {
+        'content_hash': row[0],
+        'url': row[1],
+        'text': zlib.decompress(row[2]).decode('utf-8'),
+        'analysis': json.loads(row[3]) if row[3] else None,
+        'fetched_at': row[4],
+    }
@@ -0,0 +1,201 @@
+import math
+import re
+import threading
+
+# Lines mentioning pay are admitted first, together with the page header
+SALARY_PATTERN = re.compile(
+    r'(zł|pln|€|eur\b|\$|usd\b|£|gbp\b|chf\b|salary|wynagrodzenie|stawka|gehalt|brutto|netto|'
+    r'per (hour|month|year|annum)|/\s*(godz|h|mies|m-c|mc|month|year|rok)\b|\b\d+\s?k\b)',
+    re.IGNORECASE
+)
+
+# Lines likely to carry role, company, location or posting date
+KEY_FIELD_PATTERN = re.compile(
+    r'(position|role|title|company|employer|hiring|location|remote|hybrid|posted|published|'
+    r'stanowisko|firma|pracodawca|lokalizacja|zdaln|opublikowano|'
+    r'stelle|unternehmen|standort|veröffentlicht|'
+    r'experience|doświadczeni|erfahrung|requirements|wymagania|skills|'
+    r'b2b|uop|contract|full-time|part-time|\d{4}-\d{2}-\d{2}|\d{2}\.\d{2}\.\d{4})',
+    re.IGNORECASE
+)
+
+# Boilerplate that never helps the extraction
+BOILERPLATE_PATTERN = re.compile(
+    r'(cookie|privacy policy|polityka prywatności|datenschutz|all rights reserved|prawa zastrzeżone|©|'
+    r'sign in|log in|zaloguj|newsletter|terms (&|and) conditions|regulamin|impressum|agb\b|'
+    r'share this job|udostępnij|job alert|similar (jobs|offers)|podobne oferty|equal opportunity employer)',
+    re.IGNORECASE
+)
+
+# Lines this short without digits are usually menu entries or labels
+MIN_INFORMATIVE_WORDS = 3
+
+# The first lines hold the page title and h1 and are kept as context
+HEADER_LINES = 3
+
+# An over-budget line is cut to the remaining budget when at least this many
+# tokens are left; smaller remainders are not worth a fragment
+MIN_TRUNCATED_TOKENS = 16
+
+
+class TokenCounter:
+    """
+    Count tokens with tiktoken when it is installed and its encoding can be
+    loaded, otherwise estimate ~4 characters per token
+    """
+
+    def __init__(self, model='gpt-3.5-turbo'):
+        self.model = model
+        self.exact = False
+        self._encoding = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        # Deferred to first use: tiktoken may download its encoding file
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                import tiktoken
+                self._encoding = tiktoken.encoding_for_model(self.model)
+                self.exact = True
+            except Exception:
+                # tiktoken missing, unknown model or encoding file not downloadable
+                self._encoding = None
+            self._loaded = True
+
+    def count(self, text):
+        if not self._loaded:
+            self._load()
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        return math.ceil(len(text) / 4)
+
+    def truncate(self, text, tokens):
+        """
+        Longest prefix of text that fits in the given number of tokens
+        """
+        if not self._loaded:
+            self._load()
+        if self._encoding is not None:
+            # Decoding a cut token sequence may end in a partial character
+            return self._encoding.decode(self._encoding.encode(text)[:tokens]).rstrip('\ufffd')
+        return text[:tokens * 4]
+
+
+def _score(index, line):
+    """
+    Rank a line: 3 = must keep (header/salary), 2 = key fields,
+    1 = ordinary content, 0 = low information, -1 = boilerplate
+    """
+    if SALARY_PATTERN.search(line):
+        return 3
+    if BOILERPLATE_PATTERN.search(line):
+        return -1
+    if index < HEADER_LINES:
+        return 3
+    if KEY_FIELD_PATTERN.search(line):
+        return 2
+    if len(line.split()) < MIN_INFORMATIVE_WORDS and not any(c.isdigit() for c in line):
+        return 0
+    return 1
+
+
+def compact_text(text, token_budget, counter):
+    """
+    Compact newline-separated posting text to fit token_budget.
+
+    Repeated lines are dropped, boilerplate and low-information lines are
+    removed, and the remaining lines are admitted by priority (salary and
+    header lines first, then role/company/location lines, then the rest)
+    until the budget is reached. A line that does not fit is cut to the
+    remaining budget (so a posting that is one long paragraph is truncated
+    rather than dropped). Kept lines stay in their original order.
+    Returns (compacted_text, stats).
+    """
+    original_tokens = counter.count(text)
+
+    seen = set()
+    candidates = []
+    duplicates = 0
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        key = line.lower()
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        candidates.append(line)
+
+    scored = [(_score(i, line), i, line) for i, line in enumerate(candidates)]
+    dropped_boilerplate = sum(1 for score, _, _ in scored if score < 0)
+    dropped_low_information = sum(1 for score, _, _ in scored if score == 0)
+
+    kept = []
+    used = 0
+    over_budget = 0
+    truncated = 0
+    # Stable sort: higher priority first, original order within a priority
+    for score, index, line in sorted((s for s in scored if s[0] > 0), key=lambda s: -s[0]):
+        # +1 accounts for the newline joining this line to the others
+        cost = counter.count(line) + 1
+        if used + cost > token_budget:
+            remaining = token_budget - used - 1
+            if remaining < MIN_TRUNCATED_TOKENS:
+                over_budget += 1
+                continue
+            line = counter.truncate(line, remaining)
+            cost = counter.count(line) + 1
+            truncated += 1
+        kept.append((index, line))
+        used += cost
+
+    compacted = '\n'.join(line for _, line in sorted(kept))
+    compacted_tokens = counter.count(compacted)
+    stats = {
+        'original_tokens': original_tokens,
+        'compacted_tokens': compacted_tokens,
+        'tokens_saved': max(0, original_tokens - compacted_tokens),
+        'token_budget': token_budget,
+        'exact_tokenizer': counter.exact,
+        'lines_in': len(candidates) + duplicates,
+        'lines_kept': len(kept),
+        'dropped_duplicates': duplicates,
+        'dropped_boilerplate': dropped_boilerplate,
+        'dropped_low_information': dropped_low_information,
+        'dropped_over_budget': over_budget,
+        'lines_truncated': truncated
+    }
+    return compacted, stats
+
+
+class CompactionStats:
+    """
+    Running totals of prompt compaction across calls
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.original_tokens = 0
+        self.compacted_tokens = 0
+
+    def record(self, stats):
+        with self._lock:
+            self.calls += 1
+            self.original_tokens += stats['original_tokens']
+            self.compacted_tokens += stats['compacted_tokens']
+
+    def summary(self):
+        with self._lock:
+            saved = self.original_tokens - self.compacted_tokens
+            return {
+                'calls': self.calls,
+                'original_tokens': self.original_tokens,
+                'compacted_tokens': self.compacted_tokens,
+                'tokens_saved': saved,
+                'avg_tokens_saved': saved / self.calls if self.calls else 0.0
+            }
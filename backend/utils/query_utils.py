@@ -0,0 +1,187 @@
+import json
+import base64
+import math
+
+# Default and maximum page size for the applications list
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Sortable keys mapped to the SQL expression used for ORDER BY and the keyset
+# predicate. The expressions must match the indexes in migration_utils exactly,
+# otherwise SQLite falls back to a full scan + temp B-tree sort.
+SORT_KEYS = {
+    'id': 'id',
+    'company': "IFNULL(company, '')",
+    'role': "IFNULL(role, '')",
+    'status': "IFNULL(status, '')",
+    'date_applied': "IFNULL(date_applied, '')",
+    'date_posted': "IFNULL(date_posted, '')",
+    # Salaries sort by the stored, currency-normalized yearly PLN amount;
+    # monthly and yearly order are the same
+    'monthly_salary': 'IFNULL(salary_yearly_pln, 0)',
+    'yearly_salary': 'IFNULL(salary_yearly_pln, 0)',
+}
+
+
+class QueryError(ValueError):
+    """
+    Raised when list query parameters are invalid
+    """
+
+
+def encode_cursor(sort_value, row_id):
+    """
+    Encode the last row's sort value and id into an opaque cursor string
+    """
+    raw = json.dumps([sort_value, row_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor into (sort_value, id)
+    """
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return sort_value, int(row_id)
+    except (ValueError, TypeError):
+        raise QueryError('Invalid cursor')
+
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def build_filters(args):
+    """
+    Build the WHERE clause and parameters for the list filters
+    """
+    clauses = []
+    params = []
+
+    if args.get('company'):
+        clauses.append("company LIKE ? ESCAPE '\\'")
+        params.append(f"%{_escape_like(args['company'])}%")
+
+    if args.get('role'):
+        clauses.append("role LIKE ? ESCAPE '\\'")
+        params.append(f"%{_escape_like(args['role'])}%")
+
+    if args.get('status'):
+        clauses.append('status = ?')
+        params.append(args['status'])
+
+    # Exact (case-insensitive) skill and location names, resolved through
+    # the lookup tables and served by the skill and location indexes
+    if args.get('skill'):
+        clauses.append('id IN (SELECT application_id FROM application_skills '
+                       'WHERE skill_id = (SELECT id FROM skills WHERE name = ?))')
+        params.append(args['skill'])
+
+    if args.get('location'):
+        clauses.append('location_id = (SELECT id FROM locations WHERE name = ?)')
+        params.append(args['location'])
+
+    # Dates are stored as YYYY-MM-DD text, so range comparisons are lexicographic
+    if args.get('date_from'):
+        clauses.append('date_applied >= ?')
+        params.append(args['date_from'])
+
+    if args.get('date_to'):
+        clauses.append('date_applied <= ?')
+        params.append(args['date_to'])
+
+    # Salary range in yearly PLN, whatever the original currency and period
+    for name, comparator in (('salary_min', '>='), ('salary_max', '<=')):
+        if args.get(name):
+            try:
+                value = float(args[name])
+            except (TypeError, ValueError):
+                raise QueryError(f'Invalid {name}: must be a number')
+            # 'nan' would be bound as NULL and silently match nothing
+            if not math.isfinite(value):
+                raise QueryError(f'Invalid {name}: must be a finite number')
+            clauses.append(f"{SORT_KEYS['yearly_salary']} {comparator} ?")
+            params.append(value)
+
+    return clauses, params
+
+
+def parse_list_args(args):
+    """
+    Validate sort, order, limit and cursor parameters for the list endpoint
+    """
+    sort = args.get('sort', 'date_applied')
+    if sort not in SORT_KEYS:
+        raise QueryError(f"Invalid sort key: {sort}. Allowed: {', '.join(SORT_KEYS)}")
+
+    order = args.get('order', 'desc').lower()
+    if order not in ('asc', 'desc'):
+        raise QueryError('Invalid order: must be asc or desc')
+
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        raise QueryError('Invalid limit')
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    cursor = decode_cursor(args['cursor']) if args.get('cursor') else None
+
+    return sort, order, limit, cursor
+
+
+def query_applications(conn, args):
+    """
+    Run a filtered, sorted and keyset-paginated query over applications.
+
+    Returns a dict with the page items, the total number of matching rows
+    and a cursor for the next page (None when this is the last page).
+    """
+    sort, order, limit, cursor = parse_list_args(args)
+    sort_expr = SORT_KEYS[sort]
+    clauses, params = build_filters(args)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    total = conn.execute(f'SELECT COUNT(*) FROM applications {where}', params).fetchone()[0]
+
+    # Keyset predicate: continue strictly after the last (sort value, id) seen
+    page_clauses = list(clauses)
+    page_params = list(params)
+    if cursor is not None:
+        comparator = '<' if order == 'desc' else '>'
+        page_clauses.append(f'({sort_expr}, id) {comparator} (?, ?)')
+        page_params.extend(cursor)
+
+    page_where = f"WHERE {' AND '.join(page_clauses)}" if page_clauses else ''
+    direction = order.upper()
+    rows = conn.execute(f'''
+        SELECT *, {sort_expr} AS _sort_value
+        FROM applications
+        {page_where}
+        ORDER BY {sort_expr} {direction}, id {direction}
+        LIMIT ?
+    ''', page_params + [limit + 1]).fetchall()
+
+    # Fetch one extra row to know whether another page exists
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = []
+    for row in rows:
+        item = dict(row)
+        item.pop('_sort_value', None)
+        items.append(item)
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor(last['_sort_value'], last['id'])
+
+    return {
+        'items': items,
+        'total': total,
+        'next_cursor': next_cursor,
+        'limit': limit,
+        'sort': sort,
+        'order': order
+    }
@@ -0,0 +1,247 @@
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+
+# Currency every rate is expressed in (PLN per one unit of the currency)
+BASE_CURRENCY = 'PLN'
+
+# Seed rates (as of March 2025), used until the exchange_rates table is read
+DEFAULT_RATES = {
+    'PLN': 1.0,
+    'EUR': 4.17,
+    'USD': 3.84,
+    'GBP': 4.96
+}
+DEFAULT_RATES_AS_OF = '2025-03-01'
+
+
+class RateSnapshot:
+    """
+    Immutable set of exchange rates. Readers take one snapshot and use it
+    for a whole calculation, so a concurrent refresh never mixes old and
+    new rates within one result.
+    """
+
+    __slots__ = ('rates', 'currencies', 'as_of', 'source', 'version')
+
+    def __init__(self, rates, as_of=None, source=None, version=0):
+        # Base currency first, then alphabetical
+        self.currencies = tuple([BASE_CURRENCY] + sorted(c for c in rates if c != BASE_CURRENCY))
+        self.rates = MappingProxyType({c: 1.0 if c == BASE_CURRENCY else float(rates[c]) for c in self.currencies})
+        self.as_of = as_of
+        self.source = source
+        self.version = version
+
+    def get(self, currency, default=1.0):
+        return self.rates.get(currency, default)
+
+    def describe(self):
+        return {
+            'base': BASE_CURRENCY,
+            'as_of': self.as_of,
+            'source': self.source,
+            'rates': dict(self.rates)
+        }
+
+
+class StaticRateLoader:
+    """
+    Serves a fixed set of rates (the seed rates by default)
+    """
+
+    name = 'static'
+
+    def __init__(self, rates=None, as_of=None):
+        self.rates = dict(rates or DEFAULT_RATES)
+        self.as_of = as_of or DEFAULT_RATES_AS_OF
+
+    def load(self):
+        return self.rates, self.as_of
+
+
+class FileRateLoader:
+    """
+    Reads rates from a JSON file:
+    {"base": "PLN", "as_of": "2025-06-30", "rates": {"EUR": 4.27, "CHF": 4.55}}
+    with every rate given in PLN per one unit of the currency.
+    """
+
+    name = 'file'
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        with open(self.path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('base', BASE_CURRENCY) != BASE_CURRENCY:
+            raise ValueError(f"Rates file must use {BASE_CURRENCY} as base, got {data.get('base')}")
+        return data.get('rates') or {}, data.get('as_of')
+
+
+LOADERS = {
+    'static': StaticRateLoader,
+    'file': FileRateLoader,
+}
+
+
+def create_rate_loader(name=None, path=None):
+    """
+    Create the loader selected by name or RATES_LOADER (default static).
+
+    file: RATES_FILE (or path) is a JSON rates file, see FileRateLoader
+    """
+    name = name or os.getenv('RATES_LOADER', 'static')
+    if name == 'static':
+        return StaticRateLoader()
+    if name == 'file':
+        path = path or os.getenv('RATES_FILE')
+        if not path:
+            raise ValueError('RATES_FILE is required for the file rate loader')
+        return FileRateLoader(path)
+    raise ValueError(f"Unknown rate loader: {name}. Available: {', '.join(LOADERS)}")
+
+
+def validate_rates(rates):
+    """
+    Normalize currency codes and check that every rate is a positive number
+    """
+    clean = {}
+    for currency, rate in rates.items():
+        code = str(currency).strip().upper()
+        if not code.isalpha() or len(code) != 3:
+            raise ValueError(f"Invalid currency code: {currency!r}")
+        try:
+            value = float(rate)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid rate for {code}: {rate!r}")
+        if not value > 0:
+            raise ValueError(f"Rate for {code} must be positive, got {rate!r}")
+        clean[code] = value
+    clean[BASE_CURRENCY] = 1.0
+    return clean
+
+
+class RateStore:
+    """
+    Exchange rates persisted in the exchange_rates table and served from an
+    in-memory snapshot.
+
+    Lookups never touch SQLite: current() returns the snapshot, and at most
+    every check_interval seconds compares its version with the table (one
+    MAX() over a handful of rows) so other worker processes pick up a
+    refresh. refresh() upserts the loader's rates, recomputes the stored
+    salary_yearly_pln of applications in changed currencies in the same
+    transaction, then swaps the snapshot reference. Until bind() is called
+    the seed rates are served.
+    """
+
+    def __init__(self, check_interval=60):
+        self.pool = None
+        self.check_interval = check_interval
+        self._snapshot = RateSnapshot(DEFAULT_RATES, DEFAULT_RATES_AS_OF, 'default')
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def bind(self, pool, check_interval=None):
+        self.pool = pool
+        if check_interval is not None:
+            self.check_interval = check_interval
+        self.reload()
+
+    def current(self):
+        if self.pool is not None and time.monotonic() - self._checked_at > self.check_interval:
+            # One thread checks; the others keep using the current snapshot
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._check()
+                finally:
+                    self._lock.release()
+        return self._snapshot
+
+    def _check(self):
+        self._checked_at = time.monotonic()
+        conn = self.pool.acquire()
+        try:
+            version = conn.execute('SELECT MAX(updated_at) FROM exchange_rates').fetchone()[0] or 0
+            if version != self._snapshot.version:
+                self._snapshot = self._read(conn)
+        except Exception as e:
+            print(f"[WARNING] Could not check exchange rates: {e}")
+        finally:
+            self.pool.release(conn)
+
+    def _read(self, conn):
+        rows = conn.execute('SELECT currency, rate, as_of, source, updated_at FROM exchange_rates').fetchall()
+        if not rows:
+            return RateSnapshot(DEFAULT_RATES, DEFAULT_RATES_AS_OF, 'default')
+        latest = max(rows, key=lambda row: row[4])
+        return RateSnapshot({row[0]: row[1] for row in rows}, as_of=latest[2], source=latest[3], version=latest[4])
+
+    def reload(self):
+        conn = self.pool.acquire()
+        try:
+            self._snapshot = self._read(conn)
+            self._checked_at = time.monotonic()
+        finally:
+            self.pool.release(conn)
+        return self._snapshot
+
+    def refresh(self, loader=None):
+        """
+        Load rates from the loader (create_rate_loader() by default), store
+        them and swap the snapshot.
+
+        Currencies missing from the feed keep their previous rate. Returns a
+        summary with the changed currencies and recomputed applications.
+        """
+        from utils.salary_utils import to_yearly_pln
+
+        loader = loader or create_rate_loader()
+        rates, as_of = loader.load()
+        rates = validate_rates(rates)
+
+        conn = self.pool.acquire()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                previous = {row[0]: row[1] for row in conn.execute('SELECT currency, rate FROM exchange_rates')}
+                changed = sorted(c for c, rate in rates.items() if previous.get(c) != rate)
+                updated_at = time.time()
+                conn.executemany('''
+                    INSERT INTO exchange_rates (currency, rate, as_of, source, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (currency) DO UPDATE SET
+                        rate = excluded.rate, as_of = excluded.as_of,
+                        source = excluded.source, updated_at = excluded.updated_at
+                ''', [(c, rate, as_of, loader.name, updated_at) for c, rate in rates.items()])
+
+                # Stored yearly PLN salaries depend on the rates; triggers keep the stats in step
+                snapshot = RateSnapshot(dict(previous, **rates), as_of=as_of, source=loader.name, version=updated_at)
+                recomputed = 0
+                if changed:
+                    placeholders = ', '.join('?' for _ in changed)
+                    rows = conn.execute(f'''
+                        SELECT id, salary_amount, salary_currency, salary_type FROM applications
+                        WHERE salary_currency IN ({placeholders})
+                    ''', changed).fetchall()
+                    conn.executemany('UPDATE applications SET salary_yearly_pln = ? WHERE id = ?', [
+                        (to_yearly_pln(row[1], row[2], row[3], rates=snapshot), row[0]) for row in rows
+                    ])
+                    recomputed = len(rows)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        finally:
+            self.pool.release(conn)
+
+        self._snapshot = snapshot
+        self._checked_at = time.monotonic()
+        return {'changed': changed, 'recomputed': recomputed, **snapshot.describe()}
+
+
+# Shared by every conversion in the process; bound to the database by create_app()
+rate_store = RateStore()
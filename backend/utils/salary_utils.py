@@ -0,0 +1,125 @@
+"""
+Shared salary conversion.
+
+Used by /api/calculate-yearly-salary and to fill the stored
+applications.salary_yearly_pln column, which backs salary filters, sorting
+and stats in SQL. The *_batch variants convert whole arrays in one
+NumPy/pandas pass (/api/calculate-salaries).
+
+Exchange rates come from utils.rates_utils.rate_store; every function takes
+an optional RateSnapshot so one calculation uses one consistent set.
+"""
+import math
+
+from utils.rates_utils import rate_store
+
+# Assuming 40 hours per week, 52 weeks per year
+HOURS_PER_YEAR = 40 * 52
+
+# Payment periods per year for each salary type (unknown types count as yearly)
+PERIODS_PER_YEAR = {
+    'hourly': HOURS_PER_YEAR,
+    'monthly': 12,
+    'yearly': 1
+}
+
+# Periods the calculator breaks a yearly amount down into
+BREAKDOWN_PERIODS = {
+    'yearly': 1,
+    'monthly': 12,
+    'daily': 365,
+    'hourly': HOURS_PER_YEAR
+}
+
+
+def to_yearly_pln(amount, currency, salary_type, rates=None):
+    """
+    Convert an amount in the given currency and period to a yearly PLN amount.
+
+    Returns None when the amount is missing, not a number or not finite
+    ('nan', 'inf'). Strings are parsed like pandas.to_numeric in the batch
+    variant, so Python's '1_000' digit grouping is rejected too. Also None
+    for a currency missing from the rate snapshot; unknown salary types
+    count as yearly.
+    """
+    if amount is None or amount == '' or (isinstance(amount, str) and '_' in amount):
+        return None
+    try:
+        amount = float(amount)
+    except (TypeError, ValueError):
+        return None
+    rate = (rates or rate_store.current()).get(currency, None) if isinstance(currency, str) else None
+    if rate is None:
+        return None
+    yearly = amount * rate * PERIODS_PER_YEAR.get(salary_type if isinstance(salary_type, str) else None, 1)
+    return yearly if math.isfinite(yearly) else None
+
+
+def salary_breakdown(yearly_pln, rates=None):
+    """
+    Express a yearly PLN amount per period in every supported currency
+    """
+    rates = (rates or rate_store.current()).rates
+    return {
+        period: {currency: yearly_pln / divisor / rate for currency, rate in rates.items()}
+        for period, divisor in BREAKDOWN_PERIODS.items()
+    }
+
+
+def to_yearly_pln_batch(amounts, currencies, salary_types, rates=None):
+    """
+    Vectorized to_yearly_pln over equally long sequences.
+
+    Returns a float64 NumPy array with NaN wherever to_yearly_pln returns
+    None (missing, non-numeric or non-finite amounts, unknown currencies)
+    and the same values as to_yearly_pln everywhere else.
+    pandas is imported here so that app startup does not pay for it.
+    """
+    import numpy as np
+    import pandas as pd
+
+    amounts = pd.to_numeric(pd.Series(amounts, dtype=object), errors='coerce').to_numpy(dtype='float64')
+    rates = (rates or rate_store.current()).rates
+    # Only strings are looked up (JSON lists and objects are unhashable)
+    currencies = pd.Series([value if isinstance(value, str) else None for value in currencies], dtype=object)
+    salary_types = pd.Series([value if isinstance(value, str) else None for value in salary_types], dtype=object)
+    rates = currencies.map(dict(rates)).to_numpy(dtype='float64')
+    periods = salary_types.map(PERIODS_PER_YEAR).fillna(1).to_numpy(dtype='float64')
+    with np.errstate(over='ignore'):
+        yearly = amounts * rates * periods
+    # JSON has no NaN or Infinity; non-finite results count as missing
+    yearly[~np.isfinite(yearly)] = np.nan
+    return yearly
+
+
+def _to_list(values, missing):
+    # JSON has no NaN; missing amounts become None
+    if missing is None:
+        return values.tolist()
+    return [None if is_missing else value for value, is_missing in zip(values.tolist(), missing)]
+
+
+def salary_breakdown_batch(yearly_pln, rates=None):
+    """
+    Vectorized salary_breakdown in columnar form.
+
+    Returns the same {period: {currency: ...}} layout with a list of values
+    (one per input amount, None where the amount was missing) in place of
+    each number. Building one dict per item would cost more than the
+    conversion itself.
+    """
+    import numpy as np
+
+    rates = (rates or rate_store.current()).rates
+    currencies = list(rates)
+    yearly_pln = np.asarray(yearly_pln, dtype='float64')
+    divisors = np.array(list(BREAKDOWN_PERIODS.values()), dtype='float64')
+    rates = np.array([rates[currency] for currency in currencies], dtype='float64')
+    # Shape (periods, currencies, items) in one broadcasted division
+    table = yearly_pln[None, None, :] / divisors[:, None, None] / rates[None, :, None]
+    nan_mask = np.isnan(yearly_pln)
+    missing = nan_mask.tolist() if nan_mask.any() else None
+    return {
+        period: {currency: _to_list(table[i, j], missing) for j, currency in enumerate(currencies)}
+        for i, period in enumerate(BREAKDOWN_PERIODS)
+    }
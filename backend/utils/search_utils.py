@@ -0,0 +1,271 @@
+"""
+Full-text search over applications and their attached documents.
+
+applications_fts is an FTS5 table with one row per application (rowid =
+applications.id) and the columns company, role, notes, posting (scraped
+posting text) and documents (text of the attached CV and cover letter).
+
+- company, role, notes and documents are written by triggers on
+  applications, so every writer keeps the index current in its own
+  transaction
+- document text is extracted once per stored blob (document_texts, keyed by
+  content hash) when the file is uploaded; a trigger copies it into the
+  rows of applications that already reference the blob
+- posting text is not a column of applications, so index_posting() fills
+  it from the application's posting snapshot (or the stored page) when an
+  application is saved
+
+flask reindex-search extracts missing document texts and rebuilds the index.
+"""
+import re
+import time
+import zlib
+
+from utils.document_utils import extract_document_text
+from utils.posting_utils import read_snapshot
+from utils.query_utils import QueryError
+from utils.upload_utils import BLOB_REF_PREFIX, FILE_REF_COLUMNS, blob_sha_sql, parse_blob_ref
+
+SEARCH_COLUMNS = ('company', 'role', 'notes', 'posting', 'documents')
+
+# bm25 weight per column, in SEARCH_COLUMNS order: a match in the company or
+# role outranks one somewhere in a long posting
+SEARCH_WEIGHTS = (10.0, 8.0, 3.0, 1.0, 2.0)
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# Tokens of context around the match in a snippet
+SNIPPET_TOKENS = 12
+
+SEARCH_TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS document_texts (
+        sha256 TEXT PRIMARY KEY,
+        text TEXT NOT NULL,
+        extracted_at REAL NOT NULL
+    )
+    ''',
+    # Diacritics are folded so "sciezka" finds "ścieżka"; prefix indexes keep
+    # search-as-you-type queries ("kube*") off the full term scan
+    f'''
+    CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts USING fts5(
+        {', '.join(SEARCH_COLUMNS)},
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    ''',
+]
+
+
+def _documents_sql(row):
+    # Text of the documents referenced by row, '' when none were extracted
+    parts = [f"IFNULL((SELECT text FROM document_texts WHERE sha256 = {blob_sha_sql(f'{row}.{column}')}), '')"
+             for column in FILE_REF_COLUMNS]
+    return f"trim({' || char(10) || '.join(parts)})"
+
+
+def search_triggers():
+    documents_new = _documents_sql('NEW')
+    references = ' OR '.join(f"{column} LIKE '{BLOB_REF_PREFIX}' || NEW.sha256 || '/%'" for column in FILE_REF_COLUMNS)
+    return [
+        f'''
+        CREATE TRIGGER IF NOT EXISTS trg_search_insert AFTER INSERT ON applications BEGIN
+            INSERT INTO applications_fts (rowid, company, role, notes, posting, documents)
+            VALUES (NEW.id, NEW.company, NEW.role, NEW.notes, '', {documents_new});
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_search_delete AFTER DELETE ON applications BEGIN
+            DELETE FROM applications_fts WHERE rowid = OLD.id;
+        END
+        ''',
+        # posting is left alone; index_posting() owns it
+        f'''
+        CREATE TRIGGER IF NOT EXISTS trg_search_update AFTER UPDATE OF company, role, notes, {', '.join(FILE_REF_COLUMNS)}
+        ON applications BEGIN
+            UPDATE applications_fts
+            SET company = NEW.company, role = NEW.role, notes = NEW.notes, documents = {documents_new}
+            WHERE rowid = NEW.id;
+        END
+        ''',
+        # Text extracted after the application was saved (reindex, legacy files)
+        f'''
+        CREATE TRIGGER IF NOT EXISTS trg_search_document AFTER INSERT ON document_texts BEGIN
+            UPDATE applications_fts
+            SET documents = (SELECT {_documents_sql('a')} FROM applications a WHERE a.id = applications_fts.rowid)
+            WHERE rowid IN (SELECT id FROM applications WHERE {references});
+        END
+        ''',
+        # Texts of garbage-collected blobs go with them
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_search_blob_delete AFTER DELETE ON file_blobs BEGIN
+            DELETE FROM document_texts WHERE sha256 = OLD.sha256;
+        END
+        ''',
+    ]
+
+
+def create_search_index(cursor):
+    """
+    Create the search tables and triggers and index the current applications
+    (posting text and missing document texts are added by reindex_search)
+    """
+    for statement in SEARCH_TABLES:
+        cursor.execute(statement)
+    for statement in search_triggers():
+        cursor.execute(statement)
+    cursor.execute('DELETE FROM applications_fts')
+    cursor.execute(f'''
+        INSERT INTO applications_fts (rowid, company, role, notes, posting, documents)
+        SELECT a.id, a.company, a.role, a.notes, '', {_documents_sql('a')} FROM applications a
+    ''')
+
+
+def posting_text(conn, url, posting_hash=None):
+    """
+    Text of the job posting: the snapshot the application was saved with,
+    else the stored copy of the page at url, else ''
+    """
+    if posting_hash:
+        snapshot = read_snapshot(conn, posting_hash)
+        if snapshot is not None:
+            return snapshot['text']
+    if not url:
+        return ''
+    row = conn.execute('SELECT encoding, body FROM http_cache WHERE url = ?', (url,)).fetchone()
+    if row is None:
+        return ''
+    from utils.extract_utils import extract_text
+
+    html = zlib.decompress(row[1]).decode(row[0] or 'utf-8', errors='replace')
+    return extract_text(html)
+
+
+def index_posting(conn, app_id, url, posting_hash=None):
+    """
+    Store the posting text for one application in the index (no commit)
+    """
+    conn.execute('UPDATE applications_fts SET posting = ? WHERE rowid = ?',
+                 (posting_text(conn, url, posting_hash), app_id))
+
+
+def index_document(conn, sha256, path, filename):
+    """
+    Extract and store the text of a blob unless it is already known.
+    Returns True when new text was stored. Commits.
+    """
+    if conn.execute('SELECT 1 FROM document_texts WHERE sha256 = ?', (sha256,)).fetchone():
+        return False
+    text = extract_document_text(path, filename)
+    if text is None:
+        return False
+    conn.execute('INSERT OR IGNORE INTO document_texts (sha256, text, extracted_at) VALUES (?, ?, ?)',
+                 (sha256, text, time.time()))
+    conn.commit()
+    return True
+
+
+def reindex_search(conn, store):
+    """
+    Extract text for referenced documents that have none yet and rebuild
+    the index, posting text included. Returns a summary dict.
+    """
+    documents = 0
+    for column in FILE_REF_COLUMNS:
+        refs = [row[0] for row in conn.execute(f'SELECT DISTINCT {column} FROM applications WHERE {column} LIKE ?',
+                                                (f'{BLOB_REF_PREFIX}%',))]
+        for ref in refs:
+            parsed = parse_blob_ref(ref)
+            path = store.resolve(ref)
+            if parsed and path and index_document(conn, parsed[0], path, parsed[1]):
+                documents += 1
+
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        create_search_index(conn.cursor())
+        rows = conn.execute('SELECT id, url, posting_hash FROM applications').fetchall()
+        postings = 0
+        for app_id, url, posting_hash in rows:
+            text = posting_text(conn, url, posting_hash)
+            if text:
+                conn.execute('UPDATE applications_fts SET posting = ? WHERE rowid = ?', (text, app_id))
+                postings += 1
+        conn.execute("INSERT INTO applications_fts (applications_fts) VALUES ('optimize')")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return {'applications': len(rows), 'postings': postings, 'documents_extracted': documents}
+
+
+def build_match_query(text):
+    """
+    Turn user input into an FTS5 query: every word must match, "quoted
+    words" match as a phrase, and the last word also matches as a prefix
+    while the user is still typing. FTS5 operators in the input are treated
+    as plain words.
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', text):
+        tokens = re.findall(r'\w+', phrase or word)
+        if tokens:
+            terms.append((' '.join(tokens), bool(word)))
+    if not terms:
+        return None
+    parts = [f'"{tokens}"' for tokens, _ in terms]
+    last_tokens, bare = terms[-1]
+    if bare and not text.endswith((' ', '"')):
+        parts[-1] = f'"{last_tokens}"*'
+    return ' AND '.join(parts)
+
+
+def search_applications(conn, args):
+    """
+    Ranked search for /api/search. args: q (required), limit, offset.
+    Raises QueryError for invalid parameters.
+    """
+    match = build_match_query(args.get('q', ''))
+    if match is None:
+        raise QueryError('Search query (q) is required')
+    try:
+        limit = int(args.get('limit', DEFAULT_SEARCH_LIMIT))
+        offset = int(args.get('offset', 0))
+    except (TypeError, ValueError):
+        raise QueryError('limit and offset must be integers')
+    if not 1 <= limit <= MAX_SEARCH_LIMIT or offset < 0:
+        raise QueryError(f'limit must be between 1 and {MAX_SEARCH_LIMIT} and offset non-negative')
+
+    # snippet() with column -1 picks the best-matching column; the one-token
+    # snippets per column only tell which fields matched
+    weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS)
+    matched = ', '.join(f"snippet(applications_fts, {i}, char(2), '', '', 1)" for i in range(len(SEARCH_COLUMNS)))
+    rows = conn.execute(f'''
+        SELECT a.id, a.company, a.role, a.status, a.date_applied, a.cv_path, a.cover_letter_path,
+               bm25(applications_fts, {weights}) AS score,
+               snippet(applications_fts, -1, '<mark>', '</mark>', '…', {SNIPPET_TOKENS}) AS snippet,
+               {matched}
+        FROM applications_fts JOIN applications a ON a.id = applications_fts.rowid
+        WHERE applications_fts MATCH ?
+        ORDER BY score
+        LIMIT ? OFFSET ?
+    ''', (match, limit, offset)).fetchall()
+    total = conn.execute('SELECT COUNT(*) FROM applications_fts WHERE applications_fts MATCH ?', (match,)).fetchone()[0]
+
+    results = []
+    for row in rows:
+        flags = tuple(row)[9:]
+        results.append({
+            'id': row['id'],
+            'company': row['company'],
+            'role': row['role'],
+            'status': row['status'],
+            'date_applied': row['date_applied'],
+            'cv_path': row['cv_path'],
+            'cover_letter_path': row['cover_letter_path'],
+            # bm25 is lower for better matches; flip it so higher is better
+            'score': -row['score'],
+            'snippet': row['snippet'],
+            'matched_fields': [column for column, flag in zip(SEARCH_COLUMNS, flags) if flag and '\x02' in flag]
+        })
+    return {'query': match, 'total': total, 'results': results}
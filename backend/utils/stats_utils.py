@@ -0,0 +1,161 @@
+"""
+Materialized dashboard statistics.
+
+GET /api/stats used to aggregate the whole applications table on every call.
+The aggregates now live in two summary tables that triggers on applications
+(created by migrations 6 and 7) keep up to date inside the writing
+transaction, so every writer (API handlers, imports, manual SQL) is covered
+and reading the stats costs a few index lookups regardless of table size:
+
+- stats_summary: a single row with the total count and the count/sum of
+  positive normalized salaries (salary_yearly_pln, for the average)
+- stats_groups: (dimension, value, count) rows for the status and company
+  distributions; groups are deleted when their count drops to zero
+
+Minimum and maximum salary are not maintainable incrementally under
+deletes; they are read from the salary_yearly_pln index (one seek each).
+rebuild_stats() recomputes everything from scratch (flask rebuild-stats).
+"""
+from utils.query_utils import SORT_KEYS
+
+# Grouped columns of the applications table
+STATS_DIMENSIONS = ('status', 'company')
+
+# Column the salary aggregates are computed over (yearly amount in PLN)
+SALARY_COLUMN = 'salary_yearly_pln'
+SALARY_EXPR = SORT_KEYS['yearly_salary']
+
+
+def _salary_totals_sql(column):
+    return f'''
+        SELECT COUNT(*),
+               IFNULL(SUM(CASE WHEN {column} > 0 THEN 1 ELSE 0 END), 0),
+               IFNULL(SUM(CASE WHEN {column} > 0 THEN {column} ELSE 0 END), 0)
+        FROM applications
+    '''
+
+
+def _fill(cursor, salary_column=SALARY_COLUMN):
+    cursor.execute('DELETE FROM stats_summary')
+    cursor.execute('DELETE FROM stats_groups')
+    row = cursor.execute(_salary_totals_sql(salary_column)).fetchone()
+    cursor.execute('INSERT INTO stats_summary (id, total, salary_count, salary_sum) VALUES (1, ?, ?, ?)', tuple(row))
+    for dimension in STATS_DIMENSIONS:
+        cursor.execute(f'''
+            INSERT INTO stats_groups (dimension, value, count)
+            SELECT '{dimension}', {dimension}, COUNT(*) FROM applications GROUP BY {dimension}
+        ''')
+
+
+def read_stats(conn, top_companies=5):
+    """
+    Build the /api/stats payload from the summary tables
+    """
+    summary = conn.execute('SELECT total, salary_count, salary_sum FROM stats_summary WHERE id = 1').fetchone()
+    status_counts = conn.execute('''
+        SELECT value AS status, count FROM stats_groups WHERE dimension = 'status'
+    ''').fetchall()
+    company_counts = conn.execute('''
+        SELECT value AS company, count FROM stats_groups
+        WHERE dimension = 'company'
+        ORDER BY count DESC
+        LIMIT ?
+    ''', (top_companies,)).fetchall()
+
+    # Served by the expression index idx_applications_salary_yearly
+    min_salary = conn.execute(
+        f'SELECT {SALARY_EXPR} FROM applications WHERE {SALARY_EXPR} > 0 ORDER BY {SALARY_EXPR} LIMIT 1').fetchone()
+    max_salary = conn.execute(
+        f'SELECT {SALARY_EXPR} FROM applications WHERE {SALARY_EXPR} > 0 ORDER BY {SALARY_EXPR} DESC LIMIT 1').fetchone()
+
+    total = summary[0] if summary else 0
+    salary_count = summary[1] if summary else 0
+    return {
+        'total_applications': total,
+        'status_distribution': [dict(row) for row in status_counts],
+        'top_companies': [dict(row) for row in company_counts],
+        'salary_stats': {
+            'average': summary[2] / salary_count if salary_count else 0,
+            'min': min_salary[0] if min_salary else 0,
+            'max': max_salary[0] if max_salary else 0,
+            'currency': 'PLN',
+            'period': 'yearly'
+        }
+    }
+
+
+def compute_stats(conn, top_companies=5):
+    """
+    Aggregate the same payload directly from the applications table (full scans)
+    """
+    total = conn.execute('SELECT COUNT(*) FROM applications').fetchone()[0]
+    status_counts = conn.execute('SELECT status, COUNT(*) AS count FROM applications GROUP BY status').fetchall()
+    company_counts = conn.execute('''
+        SELECT company, COUNT(*) AS count FROM applications
+        GROUP BY company
+        ORDER BY count DESC
+        LIMIT ?
+    ''', (top_companies,)).fetchall()
+    salary = conn.execute(f'''
+        SELECT AVG({SALARY_COLUMN}), MIN({SALARY_COLUMN}), MAX({SALARY_COLUMN})
+        FROM applications WHERE {SALARY_COLUMN} > 0
+    ''').fetchone()
+    return {
+        'total_applications': total,
+        'status_distribution': [dict(row) for row in status_counts],
+        'top_companies': [dict(row) for row in company_counts],
+        'salary_stats': {
+            'average': salary[0] or 0,
+            'min': salary[1] or 0,
+            'max': salary[2] or 0,
+            'currency': 'PLN',
+            'period': 'yearly'
+        }
+    }
+
+
+def check_stats(conn):
+    """
+    Compare the summary tables with a fresh aggregation.
+
+    Returns a list of human-readable differences (empty when consistent).
+    """
+    differences = []
+    summary = conn.execute('SELECT total, salary_count, salary_sum FROM stats_summary WHERE id = 1').fetchone()
+    expected = conn.execute(_salary_totals_sql(SALARY_COLUMN)).fetchone()
+    if summary is None:
+        differences.append('stats_summary row is missing')
+    else:
+        for name, actual, wanted in zip(('total', 'salary_count'), summary[:2], expected[:2]):
+            if actual != wanted:
+                differences.append(f"{name}: {actual} != {wanted}")
+        # The running sum accumulates float rounding; only report real drift
+        if abs(summary[2] - expected[2]) > 1e-6 * max(1.0, abs(expected[2])):
+            differences.append(f"salary_sum: {summary[2]} != {expected[2]}")
+
+    for dimension in STATS_DIMENSIONS:
+        stored = {row[0]: row[1] for row in conn.execute(
+            'SELECT value, count FROM stats_groups WHERE dimension = ?', (dimension,))}
+        actual = {row[0]: row[1] for row in conn.execute(
+            f'SELECT {dimension}, COUNT(*) FROM applications GROUP BY {dimension}')}
+        for value in sorted(set(stored) | set(actual), key=lambda v: (v is None, str(v))):
+            if stored.get(value) != actual.get(value):
+                differences.append(f"{dimension} {value!r}: {stored.get(value)} != {actual.get(value)}")
+    return differences
+
+
+def rebuild_stats(conn):
+    """
+    Recompute the summary tables from scratch in one write transaction.
+
+    Returns the differences found before the rebuild.
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        differences = check_stats(conn)
+        _fill(conn.cursor())
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return differences
@@ -0,0 +1,106 @@
+import json
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object.
+
+    feed() takes the next chunk of model output and returns the top-level
+    (key, value) pairs completed by it, so each field can be delivered as
+    soon as its closing quote, bracket or delimiter arrives. Text before the
+    opening brace (such as a markdown code fence) is ignored.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.fields = {}
+        self._pos = 0
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._token_start = None  # start of the current top-level key or value
+        self._key = None
+        self._expect = 'key'  # 'key', 'colon' or 'value' at depth 1
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        completed = []
+        while self._pos < len(self.buffer) and not self._finished:
+            char = self.buffer[self._pos]
+
+            if not self._started:
+                if char == '{':
+                    self._started = True
+                    self._depth = 1
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect == 'key':
+                        self._key = json.loads(self.buffer[self._token_start:self._pos + 1])
+                        self._token_start = None
+                        self._expect = 'colon'
+                    elif self._depth == 1:
+                        # A string value is complete at its closing quote
+                        self._complete_value(completed, self._pos + 1)
+                self._pos += 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._token_start is None:
+                    self._token_start = self._pos
+            elif char == ':' and self._depth == 1 and self._expect == 'colon':
+                self._expect = 'value'
+            elif char in '{[':
+                if self._depth == 1 and self._token_start is None:
+                    self._token_start = self._pos
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 1:
+                    # A nested object or list value is complete
+                    self._complete_value(completed, self._pos + 1)
+                elif self._depth == 0:
+                    self._complete_value(completed, self._pos)
+                    self._finished = True
+            elif char == ',' and self._depth == 1:
+                self._complete_value(completed, self._pos)
+            elif not char.isspace() and self._depth == 1 and self._token_start is None:
+                # Start of a number, true, false or null
+                self._token_start = self._pos
+            self._pos += 1
+        return completed
+
+    def _complete_value(self, completed, end):
+        if self._expect == 'value' and self._token_start is not None:
+            raw = self.buffer[self._token_start:end].strip()
+            try:
+                value = json.loads(raw)
+            except ValueError:
+                value = None
+            else:
+                self.fields[self._key] = value
+                completed.append((self._key, value))
+        self._token_start = None
+        self._key = None
+        self._expect = 'key'
+
+    @property
+    def finished(self):
+        return self._finished
+
+
+def format_sse(event, data):
+    """
+    Format one server-sent event with a JSON payload
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,418 @@
+import html as html_lib
+import json
+import re
+import threading
+from html.parser import HTMLParser
+
+# Fields produced by the analysis, in prompt order
+ANALYSIS_FIELDS = [
+    'company', 'role', 'salary', 'salary_amount', 'salary_currency', 'salary_type',
+    'date_posted', 'skills', 'experience', 'location',
+]
+
+JSON_LD_PATTERN = re.compile(
+    r'<script[^>]*type\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.IGNORECASE | re.DOTALL
+)
+META_PATTERN = re.compile(r'<meta\s[^>]*>', re.IGNORECASE)
+ATTR_PATTERN = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+CURRENCIES = {
+    'zł': 'PLN', 'zl': 'PLN', 'pln': 'PLN',
+    '€': 'EUR', 'eur': 'EUR',
+    '$': 'USD', 'usd': 'USD',
+    '£': 'GBP', 'gbp': 'GBP',
+    'chf': 'CHF',
+}
+_CURRENCY = r'(zł|zl\b|pln\b|€|eur\b|\$|usd\b|£|gbp\b|chf\b)'
+# 18 000 / 5.500 / 70,000 (thousand separators) or a plain number, optional decimals and k suffix
+_AMOUNT = r'(\d{1,3}(?:[  .,]\d{3})+(?:[.,]\d{1,2})?|\d+(?:[.,]\d{1,2})?)(\s?k\b)?'
+SALARY_PATTERN = re.compile(
+    rf'(?:{_CURRENCY}\s?)?{_AMOUNT}(?:\s?{_CURRENCY})?'
+    rf'(?:\s?(?:-|–|—|to|do|bis)\s?(?:{_CURRENCY}\s?)?{_AMOUNT})?(?:\s?{_CURRENCY})?',
+    re.IGNORECASE
+)
+# Checked in this order in the text following the amount
+PERIOD_PATTERNS = [
+    ('hourly', re.compile(r'/\s*(h|hr|hour|godz|godzin\w*|std)\b|per hour|an hour|hourly|za godzin|pro stunde', re.IGNORECASE)),
+    ('monthly', re.compile(r'/\s*(mies\w*|m-c|mc|month|mo|monat)\b|per month|monthly|miesięczn|pro monat|monatlich', re.IGNORECASE)),
+    ('yearly', re.compile(r'/\s*(rok|year|yr|jahr)\b|per (year|annum)|annual|yearly|rocznie|pro jahr|jährlich|p\.\s?a\.', re.IGNORECASE)),
+]
+SALARY_KEYWORDS = re.compile(r'salary|pay\b|wynagrodzenie|stawka|gehalt|vergütung', re.IGNORECASE)
+SALARY_UNITS = {'HOUR': 'hourly', 'MONTH': 'monthly', 'YEAR': 'yearly'}
+# Window after the amount searched for the payment period
+PERIOD_WINDOW = 60
+MAX_SALARY_TEXT = 120
+
+
+def _clean(value):
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    value = ' '.join(html_lib.unescape(str(value)).split())
+    return value or None
+
+
+def _name(value):
+    # Organization/Place values may be objects, lists or plain strings
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        return _clean(value.get('name'))
+    return _clean(value)
+
+
+def _types(node):
+    types = node.get('@type', [])
+    return types if isinstance(types, list) else [types]
+
+
+def _find_job_postings(data):
+    if isinstance(data, list):
+        for item in data:
+            yield from _find_job_postings(item)
+    elif isinstance(data, dict):
+        if any(str(t).endswith('JobPosting') for t in _types(data)):
+            yield data
+        for key in ('@graph', 'mainEntity', 'itemListElement'):
+            if key in data:
+                yield from _find_job_postings(data[key])
+
+
+def _location(value):
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        address = value.get('address', value)
+        if isinstance(address, dict):
+            for key in ('addressLocality', 'addressRegion', 'addressCountry'):
+                place = _name(address.get(key))
+                if place:
+                    return place
+        return _name(value) or (_clean(address) if isinstance(address, str) else None)
+    return _clean(value)
+
+
+def _number(value):
+    try:
+        return float(str(value).replace(',', '.'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _format_amount(amount):
+    return f"{amount:,.2f}".rstrip('0').rstrip('.')
+
+
+def _salary_from_json_ld(base_salary):
+    if isinstance(base_salary, list):
+        base_salary = base_salary[0] if base_salary else None
+    if not isinstance(base_salary, dict):
+        return {}
+    value = base_salary.get('value')
+    unit = base_salary.get('unitText')
+    if isinstance(value, dict):
+        unit = value.get('unitText', unit)
+        low = _number(value.get('minValue', value.get('value')))
+        high = _number(value.get('maxValue')) or low
+    else:
+        low = high = _number(value)
+
+    fields = {}
+    currency = _clean(base_salary.get('currency'))
+    if currency:
+        fields['salary_currency'] = currency.upper()
+    salary_type = SALARY_UNITS.get(str(unit or '').upper())
+    if salary_type:
+        fields['salary_type'] = salary_type
+    if low:
+        fields['salary_amount'] = (low + high) / 2
+        amount_text = _format_amount(low) if low == high else f"{_format_amount(low)}–{_format_amount(high)}"
+        fields['salary'] = ' '.join(part for part in (amount_text, currency, f"/ {str(unit).lower()}" if unit else None) if part)
+    return fields
+
+
+def _from_json_ld(posting):
+    """
+    Map a schema.org JobPosting object onto the analysis fields
+    """
+    fields = {
+        'role': _clean(posting.get('title')),
+        'company': _name(posting.get('hiringOrganization')),
+        'location': _location(posting.get('jobLocation')),
+    }
+    if posting.get('jobLocationType') == 'TELECOMMUTE' and not fields['location']:
+        fields['location'] = 'Remote'
+
+    date_posted = _clean(posting.get('datePosted'))
+    if date_posted and DATE_PATTERN.match(str(date_posted)):
+        fields['date_posted'] = str(date_posted)[:10]
+
+    skills = posting.get('skills')
+    if isinstance(skills, str):
+        skills = [skill.strip() for skill in html_lib.unescape(skills).split(',')]
+    if isinstance(skills, list):
+        fields['skills'] = [_clean(skill) for skill in skills if _clean(skill)] or None
+
+    experience = posting.get('experienceRequirements')
+    if isinstance(experience, dict):
+        months = _number(experience.get('monthsOfExperience'))
+        experience = f"{months / 12:g} years" if months else _clean(experience.get('description'))
+    fields['experience'] = _clean(experience) if isinstance(experience, str) else experience
+
+    fields.update(_salary_from_json_ld(posting.get('baseSalary')))
+    return {key: value for key, value in fields.items() if value not in (None, '', [])}
+
+
+class _MicrodataParser(HTMLParser):
+    """
+    Collect schema.org microdata items as JSON-LD shaped dicts
+    """
+
+    VOID_TAGS = {'meta', 'link', 'img', 'br', 'hr', 'input', 'source', 'area', 'base', 'col', 'embed', 'wbr'}
+    VALUE_ATTRS = ('content', 'datetime', 'href', 'src', 'value')
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.items = []
+        # Open elements: [tag, item in scope, (parent item, prop) or None, text parts or None]
+        self._stack = []
+
+    def _scope(self):
+        return self._stack[-1][1] if self._stack else None
+
+    @staticmethod
+    def _assign(item, prop, value):
+        if item is not None:
+            for name in prop.split():
+                item.setdefault(name, value)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        parent = self._scope()
+        scope = parent
+        prop = attrs.get('itemprop')
+        text = None
+
+        if 'itemscope' in attrs:
+            scope = {'@type': (attrs.get('itemtype') or '').rstrip('/').rsplit('/', 1)[-1]}
+            if prop:
+                self._assign(parent, prop, scope)
+            else:
+                self.items.append(scope)
+        elif prop:
+            value = next((attrs[name] for name in self.VALUE_ATTRS if attrs.get(name)), None)
+            if value is not None:
+                self._assign(parent, prop, value)
+            elif tag not in self.VOID_TAGS:
+                text = []
+
+        if tag not in self.VOID_TAGS:
+            self._stack.append([tag, scope, (parent, prop) if text is not None else None, text])
+
+    def handle_endtag(self, tag):
+        if not any(entry[0] == tag for entry in self._stack):
+            return
+        while self._stack:
+            entry = self._stack.pop()
+            if entry[3] is not None:
+                parent, prop = entry[2]
+                self._assign(parent, prop, ' '.join(''.join(entry[3]).split()))
+            if entry[0] == tag:
+                break
+
+    def handle_data(self, data):
+        for entry in self._stack:
+            if entry[3] is not None:
+                entry[3].append(data)
+
+
+def _microdata_postings(html):
+    parser = _MicrodataParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        return []
+    return list(_find_job_postings(parser.items))
+
+
+def _meta_tags(html):
+    metas = {}
+    for tag in META_PATTERN.findall(html):
+        attrs = {m.group(1).lower(): m.group(2) if m.group(2) is not None else m.group(3) for m in ATTR_PATTERN.finditer(tag)}
+        key = (attrs.get('property') or attrs.get('name') or '').lower()
+        if key and 'content' in attrs:
+            metas.setdefault(key, _clean(attrs['content']))
+    return metas
+
+
+def _from_open_graph(metas):
+    fields = {}
+    title = metas.get('og:title')
+    if title:
+        # "Backend Engineer at Northwind Labs" carries both role and company
+        role, sep, company = title.rpartition(' at ')
+        if sep and role and company:
+            fields['role'], fields['company'] = role, company
+        else:
+            fields['role'] = title
+    return fields
+
+
+def _parse_amount(number, suffix):
+    number = number.replace(' ', ' ')
+    decimals = ''
+    match = re.search(r'[.,](\d{1,2})$', number)
+    if match and not re.fullmatch(r'\d{1,3}([ .,]\d{3})+', number):
+        decimals = match.group(1)
+        number = number[:match.start()]
+    value = float(re.sub(r'[ .,]', '', number) + ('.' + decimals if decimals else ''))
+    return value * 1000 if suffix else value
+
+
+def parse_salary(text):
+    """
+    Find the posting's salary in text with regular expressions.
+
+    Handles zł/€/$/£ amounts with thousand separators, decimal commas,
+    "k" suffixes and ranges, and the payment period that follows
+    ("/ godz.", "/mies.", "per year", ...). An amount only counts when its
+    line mentions a salary keyword or it is followed by a payment period;
+    lines with both are preferred. Returns a dict with the salary fields
+    found (possibly empty).
+    """
+    best = None
+    for line in text.split('\n'):
+        for match in SALARY_PATTERN.finditer(line):
+            groups = match.groups()
+            currency = next((g for g in (groups[0], groups[3], groups[4], groups[7]) if g), None)
+            if not currency:
+                continue
+            try:
+                low = _parse_amount(groups[1], groups[2])
+                high = _parse_amount(groups[5], groups[6]) if groups[5] else low
+            except ValueError:
+                continue
+            if low <= 0 or high < low:
+                continue
+
+            window = line[match.end():match.end() + PERIOD_WINDOW]
+            salary_type = next((name for name, pattern in PERIOD_PATTERNS if pattern.search(window)), None)
+            rank = (bool(SALARY_KEYWORDS.search(line)), salary_type is not None)
+            # A bare amount ("raised $20M", "2 500 zł bonus") is not a salary
+            if rank == (False, False):
+                continue
+            if best is None or rank > best[0]:
+                fields = {
+                    'salary': line[match.start():][:MAX_SALARY_TEXT].strip(),
+                    'salary_amount': (low + high) / 2,
+                    'salary_currency': CURRENCIES[currency.lower()],
+                }
+                if salary_type:
+                    fields['salary_type'] = salary_type
+                best = (rank, fields)
+            if best[0] == (True, True):
+                return best[1]
+    return best[1] if best else {}
+
+
+def extract_structured(html, text):
+    """
+    Extract analysis fields without an LLM.
+
+    Sources in priority order: schema.org JobPosting JSON-LD, JobPosting
+    microdata, OpenGraph title, then salary patterns in the page text and
+    meta description. Returns (fields, sources) where sources maps each
+    found field to the source it came from.
+    """
+    fields, sources = {}, {}
+
+    def merge(found, source):
+        for key, value in found.items():
+            if key not in fields:
+                fields[key] = value
+                sources[key] = source
+
+    if 'ld+json' in html:
+        for block in JSON_LD_PATTERN.findall(html):
+            try:
+                data = json.loads(block.strip())
+            except ValueError:
+                continue
+            for posting in _find_job_postings(data):
+                merge(_from_json_ld(posting), 'json-ld')
+
+    if 'itemprop' in html and 'JobPosting' in html:
+        for posting in _microdata_postings(html):
+            merge(_from_json_ld(posting), 'microdata')
+
+    metas = _meta_tags(html)
+    merge(_from_open_graph(metas), 'opengraph')
+
+    # Regex salary only fills gaps, as one consistent group
+    if not {'salary_amount', 'salary_currency', 'salary_type'} <= fields.keys():
+        salary = parse_salary(text)
+        if not salary:
+            description = metas.get('og:description') or metas.get('description')
+            salary = parse_salary(description) if description else {}
+        if 'salary_amount' in fields:
+            salary = {key: value for key, value in salary.items()
+                      if key == 'salary_type' and fields.get('salary_currency') == salary.get('salary_currency')}
+        merge(salary, 'regex')
+
+    return fields, sources
+
+
+class ExtractionStats:
+    """
+    Per source domain counters for the deterministic extraction stage
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._domains = {}
+
+    def record(self, domain, fields_found, extract_ms, llm_called, llm_ms=0.0):
+        with self._lock:
+            entry = self._domains.setdefault(domain, {
+                'pages': 0, 'complete': 0, 'partial': 0, 'empty': 0,
+                'fields_found': 0, 'extract_ms': 0.0, 'llm_calls': 0, 'llm_ms': 0.0
+            })
+            entry['pages'] += 1
+            entry['fields_found'] += fields_found
+            entry['extract_ms'] += extract_ms
+            if not llm_called:
+                entry['complete'] += 1
+            elif fields_found:
+                entry['partial'] += 1
+            else:
+                entry['empty'] += 1
+            if llm_called:
+                entry['llm_calls'] += 1
+                entry['llm_ms'] += llm_ms
+
+    def summary(self):
+        with self._lock:
+            domains = {}
+            for domain, entry in self._domains.items():
+                pages = entry['pages']
+                domains[domain] = {
+                    'pages': pages,
+                    'hit_rate': entry['complete'] / pages,
+                    'partial': entry['partial'],
+                    'empty': entry['empty'],
+                    'llm_calls_avoided': entry['complete'],
+                    'avg_fields_found': entry['fields_found'] / pages,
+                    'avg_extract_ms': entry['extract_ms'] / pages,
+                    'avg_llm_ms': entry['llm_ms'] / entry['llm_calls'] if entry['llm_calls'] else 0.0
+                }
+            pages = sum(entry['pages'] for entry in self._domains.values())
+            avoided = sum(entry['complete'] for entry in self._domains.values())
+            return {
+                'pages': pages,
+                'llm_calls_avoided': avoided,
+                'hit_rate': avoided / pages if pages else 0.0,
+                'domains': domains
+            }
@@ -0,0 +1,292 @@
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+# Stored paths (cv_path / cover_letter_path) look like
+# uploads/blobs/<sha256>/<original file name>; the bytes live once per
+# content hash under <upload folder>/blobs/<sha256[:2]>/<sha256>
+BLOB_REF_PREFIX = 'uploads/blobs/'
+CHUNK_SIZE = 64 * 1024
+
+# Application columns that reference uploaded files
+FILE_REF_COLUMNS = ('cv_path', 'cover_letter_path')
+
+# Text formats that compress well; downloads offer a gzip variant for them
+COMPRESSIBLE_EXTENSIONS = {'txt', 'rtf'}
+GZIP_SUFFIX = '.gz'
+
+
+def parse_blob_ref(ref):
+    """
+    Return (sha256, filename) for a blob path, or None for legacy/empty paths
+    """
+    if not ref or not ref.startswith(BLOB_REF_PREFIX):
+        return None
+    parts = ref[len(BLOB_REF_PREFIX):].split('/', 1)
+    if len(parts) != 2 or len(parts[0]) != 64 or not all(c in '0123456789abcdef' for c in parts[0]):
+        return None
+    return parts[0], parts[1]
+
+
+def blob_ref(sha256, filename):
+    return f"{BLOB_REF_PREFIX}{sha256}/{filename}"
+
+
+def blob_sha_sql(column):
+    # SQL twin of parse_blob_ref for triggers: the hash, or NULL for other paths
+    start = len(BLOB_REF_PREFIX) + 1
+    return f"(CASE WHEN {column} LIKE '{BLOB_REF_PREFIX}%' THEN substr({column}, {start}, 64) END)"
+
+
+class BlobStore:
+    """
+    Content-addressed store for uploaded documents.
+
+    save() streams the upload in chunks while hashing it. When the stream
+    is seekable (werkzeug spools uploads to memory or a temp file) the hash
+    is computed first and a file that is already stored is not written
+    again; otherwise the bytes go to a temp file that is renamed into place
+    or dropped if the blob exists. Blobs are tracked in file_blobs with a
+    reference count maintained by triggers on applications; unreferenced
+    blobs are removed by gc() after a grace period (an upload is referenced
+    only once the application form is saved).
+    """
+
+    def __init__(self, root, pool):
+        self.root = root
+        self.pool = pool
+        self.blob_dir = os.path.join(root, 'blobs')
+        os.makedirs(self.blob_dir, exist_ok=True)
+        # Content hashes of legacy files, keyed by (path, mtime, size)
+        self._legacy_hashes = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, sha256):
+        return os.path.join(self.blob_dir, sha256[:2], sha256)
+
+    def resolve(self, ref):
+        """
+        Absolute path of a stored reference (blob or legacy uploads/... path),
+        or None if it does not point inside the upload folder
+        """
+        parsed = parse_blob_ref(ref)
+        if parsed is not None:
+            return self.path_for(parsed[0])
+        if not ref or not ref.startswith('uploads/'):
+            return None
+        path = os.path.realpath(os.path.join(self.root, ref[len('uploads/'):]))
+        return path if path.startswith(os.path.realpath(self.root) + os.sep) else None
+
+    def content_hash(self, ref, path):
+        """
+        SHA-256 of the file behind ref: read from blob references, hashed
+        once (and remembered until the file changes) for legacy paths
+        """
+        parsed = parse_blob_ref(ref)
+        if parsed is not None:
+            return parsed[0]
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            sha256 = self._legacy_hashes.get(key)
+        if sha256 is None:
+            with open(path, 'rb') as f:
+                sha256, _ = self._hash_stream(f)
+            with self._lock:
+                self._legacy_hashes[key] = sha256
+        return sha256
+
+    def compressed_path(self, sha256, path):
+        """
+        Path of a gzip copy of the file with the given hash, compressed in
+        chunks on first request and kept next to the blob afterwards
+        """
+        target = self.path_for(sha256) + GZIP_SUFFIX
+        if os.path.exists(target):
+            return target
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.blob_dir, prefix='.gzip-')
+        try:
+            # mtime=0 keeps the output (and its Content-Length) identical across processes
+            with open(path, 'rb') as source, os.fdopen(fd, 'wb') as out, \
+                    gzip.GzipFile(fileobj=out, mode='wb', mtime=0) as compressor:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                    compressor.write(chunk)
+            os.replace(tmp_path, target)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return target
+
+    def _hash_stream(self, stream):
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            size += len(chunk)
+        return digest.hexdigest(), size
+
+    def _write_stream(self, stream):
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.blob_dir, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        return digest.hexdigest(), size, tmp_path
+
+    def _install(self, tmp_path, sha256):
+        target = self.path_for(sha256)
+        if os.path.exists(target):
+            os.unlink(tmp_path)
+            return False
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(tmp_path, target)
+        return True
+
+    def save(self, stream, filename):
+        """
+        Store the stream's bytes. Returns a dict with sha256, size, path
+        (the reference to store in the application) and deduplicated.
+        """
+        seekable = hasattr(stream, 'seek') and (not hasattr(stream, 'seekable') or stream.seekable())
+        tmp_path = None
+        if seekable:
+            start = stream.tell()
+            sha256, size = self._hash_stream(stream)
+            if not os.path.exists(self.path_for(sha256)):
+                stream.seek(start)
+                sha256, size, tmp_path = self._write_stream(stream)
+        else:
+            sha256, size, tmp_path = self._write_stream(stream)
+
+        # The file is installed and its row upserted under the database write
+        # lock that gc() holds while it deletes rows and files, so gc cannot
+        # remove a blob between the existence check and the upsert
+        now = time.time()
+        conn = self.pool.acquire()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if tmp_path is None and not os.path.exists(self.path_for(sha256)):
+                    # Collected since it was hashed: write it again
+                    stream.seek(start)
+                    sha256, size, tmp_path = self._write_stream(stream)
+                written = tmp_path is not None and self._install(tmp_path, sha256)
+                tmp_path = None
+                conn.execute('''
+                    INSERT INTO file_blobs (sha256, size, ref_count, created_at, last_uploaded, uploads)
+                    VALUES (?, ?, 0, ?, ?, 1)
+                    ON CONFLICT (sha256) DO UPDATE SET last_uploaded = excluded.last_uploaded, uploads = uploads + 1
+                ''', (sha256, size, now, now))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        finally:
+            self.pool.release(conn)
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+        return {'sha256': sha256, 'size': size, 'path': blob_ref(sha256, filename), 'deduplicated': not written}
+
+    def stats(self):
+        conn = self.pool.acquire()
+        try:
+            row = conn.execute('''
+                SELECT COUNT(*), IFNULL(SUM(size), 0), IFNULL(SUM(uploads), 0), IFNULL(SUM(size * uploads), 0),
+                       IFNULL(SUM(CASE WHEN ref_count <= 0 THEN 1 ELSE 0 END), 0)
+                FROM file_blobs
+            ''').fetchone()
+        finally:
+            self.pool.release(conn)
+        return {
+            'blobs': row[0],
+            'stored_bytes': row[1],
+            'uploads': row[2],
+            'uploaded_bytes': row[3],
+            'bytes_saved': row[3] - row[1],
+            'unreferenced': row[4]
+        }
+
+    def gc(self, grace=24 * 3600):
+        """
+        Delete blobs that no application references and that were last
+        uploaded more than grace seconds ago. Returns (blobs, bytes) removed.
+        """
+        cutoff = time.time() - grace
+        conn = self.pool.acquire()
+        try:
+            # Rows and files go under one write lock, the one save() takes
+            # before it relies on an existing file
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = conn.execute('SELECT sha256, size FROM file_blobs WHERE ref_count <= 0 AND last_uploaded < ?',
+                                    (cutoff,)).fetchall()
+                removed = []
+                for sha256, size in rows:
+                    conn.execute('DELETE FROM file_blobs WHERE sha256 = ?', (sha256,))
+                    removed.append((sha256, size))
+                for sha256, _ in removed:
+                    for path in (self.path_for(sha256), self.path_for(sha256) + GZIP_SUFFIX):
+                        try:
+                            os.unlink(path)
+                        except FileNotFoundError:
+                            pass
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        finally:
+            self.pool.release(conn)
+        return len(removed), sum(size for _, size in removed)
+
+    def import_legacy(self, delete=False):
+        """
+        Move files referenced by legacy uploads/<type>/<timestamp>_<name>
+        paths into the blob store and rewrite the references. Identical
+        files collapse into one blob. With delete=True the imported legacy
+        files are removed afterwards. Returns a summary dict.
+        """
+        conn = self.pool.acquire()
+        imported, missing, legacy_files = 0, [], set()
+        try:
+            for column in FILE_REF_COLUMNS:
+                rows = conn.execute(f'''
+                    SELECT id, {column} FROM applications
+                    WHERE {column} LIKE 'uploads/%' AND {column} NOT LIKE '{BLOB_REF_PREFIX}%'
+                ''').fetchall()
+                for app_id, ref in rows:
+                    path = self.resolve(ref)
+                    if path is None or not os.path.isfile(path):
+                        missing.append(ref)
+                        continue
+                    # Drop the timestamp prefix the old upload handler added
+                    name = os.path.basename(path)
+                    prefix, _, rest = name.partition('_')
+                    if prefix.isdigit() and len(prefix) == 14 and rest:
+                        name = rest
+                    with open(path, 'rb') as f:
+                        saved = self.save(f, name)
+                    # Commit per row: save() writes file_blobs through another pooled connection
+                    conn.execute(f'UPDATE applications SET {column} = ? WHERE id = ?', (saved['path'], app_id))
+                    conn.commit()
+                    legacy_files.add(path)
+                    imported += 1
+        finally:
+            self.pool.release(conn)
+
+        if delete:
+            for path in legacy_files:
+                os.unlink(path)
+        return {'imported': imported, 'legacy_files': len(legacy_files), 'deleted': delete, 'missing': missing}
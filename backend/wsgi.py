@@ -0,0 +1,13 @@
+"""
+Production WSGI entry point: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app import create_app
+
+app = create_app()
@@ -15,6 +15,12 @@ function App() {
   const [formDialogOpen, setFormDialogOpen] = useState(false);
   const [editingApplication, setEditingApplication] = useState(null);
   
+  // Server-side list query (filters, sorting) and pagination state
+  const [query, setQuery] = useState({ sort: 'date_applied', order: 'desc' });
+  const [total, setTotal] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  
   // Theme state
   const prefersDarkMode = useMediaQuery('(prefers-color-scheme: dark)');
   const [darkMode, setDarkMode] = useState(prefersDarkMode);
@@ -68,31 +74,50 @@ function App() {
     setDarkMode(!darkMode);
   };
 
-  const fetchApplications = async () => {
-    setLoading(true);
+  const fetchApplications = async (cursor = null) => {
+    if (cursor) {
+      setLoadingMore(true);
+    } else {
+      setLoading(true);
+    }
     setError(null);
     try {
-      const response = await axios.get('http://localhost:5000/api/applications');
-      setApplications(response.data);
+      // Filtering, sorting and pagination are computed by the backend
+      const response = await axios.get('http://localhost:5000/api/applications', {
+        params: { ...query, cursor: cursor || undefined }
+      });
+      const { items, total, next_cursor } = response.data;
+      setApplications(prev => (cursor ? [...prev, ...items] : items));
+      setTotal(total);
+      setNextCursor(next_cursor);
     } catch (error) {
       console.error('Error fetching applications:', error);
       setError('Failed to load applications. Please try again later.');
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
   useEffect(() => {
     fetchApplications();
-  }, []);
+  }, [query]);
+
+  const handleLoadMore = () => {
+    if (nextCursor) {
+      fetchApplications(nextCursor);
+    }
+  };
 
   const handleApplicationAdded = (newApplication) => {
-    setApplications([...applications, newApplication]);
+    // Refetch the first page so the new row lands in its sorted position
+    fetchApplications();
     setFormDialogOpen(false);
   };
 
   const handleApplicationDeleted = (id) => {
     setApplications(applications.filter(app => app.id !== id));
+    setTotal(prev => Math.max(prev - 1, 0));
   };
 
   const handleEditApplication = (application) => {
@@ -133,8 +158,13 @@ function App() {
       <Container maxWidth="lg" sx={{ mt: 4, mb: 4 }}>
         <ApplicationList 
           applications={applications} 
+          total={total}
+          hasMore={Boolean(nextCursor)}
           loading={loading} 
+          loadingMore={loadingMore}
           error={error} 
+          onQueryChange={setQuery}
+          onLoadMore={handleLoadMore}
           onDelete={handleApplicationDeleted} 
           onEdit={handleEditApplication}
           onAddClick={() => setFormDialogOpen(true)}
@@ -209,6 +209,84 @@ const ApplicationForm = ({ open, onClose, onSubmit, initialData }) => {
     }
   };
 
+  // Form fields that analysis results may fill in
+  const ANALYSIS_FORM_FIELDS = ['company', 'role', 'salary', 'salary_amount', 'salary_currency', 'salary_type', 'date_posted'];
+
+  const applyAnalysisField = (name, value) => {
+    if (!ANALYSIS_FORM_FIELDS.includes(name)) return;
+    setFormData(prevData => ({
+      ...prevData,
+      [name]: name === 'salary_amount' ? (value ? parseFloat(value) : 0) : (value || prevData[name])
+    }));
+  };
+
+  // Streams the analysis as server-sent events, filling each field as soon
+  // as it arrives; resolves with the final result
+  const streamAnalysis = async (url) => {
+    const response = await fetch('http://localhost:5000/api/analyze-url/stream', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ url })
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Streaming analysis failed (${response.status})`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      // Events are separated by a blank line
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) >= 0) {
+        const rawEvent = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        let eventName = 'message';
+        let data = '';
+        rawEvent.split('\n').forEach(line => {
+          if (line.startsWith('event: ')) eventName = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        });
+        if (!data) continue;
+
+        const payload = JSON.parse(data);
+        if (eventName === 'field') {
+          applyAnalysisField(payload.name, payload.value);
+        } else if (eventName === 'result') {
+          return payload;
+        } else if (eventName === 'error') {
+          const analysisFailure = new Error(payload.error);
+          analysisFailure.fromServer = true;
+          throw analysisFailure;
+        }
+      }
+    }
+    throw new Error('Analysis stream ended without a result');
+  };
+
+  // Analysis as a background job; long-poll until it has finished
+  const runAnalysisJob = async (url) => {
+    const submitResponse = await axios.post('http://localhost:5000/api/jobs/analyze-url', { url });
+
+    let job = submitResponse.data;
+    while (job.status !== 'succeeded' && job.status !== 'failed') {
+      const pollResponse = await axios.get(`http://localhost:5000/api/jobs/${submitResponse.data.job_id}`, {
+        params: { wait: 25 }
+      });
+      job = pollResponse.data;
+    }
+
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Analysis job failed');
+    }
+    return job.result;
+  };
+
   const analyzeJobUrl = async () => {
     if (!formData.url) {
       setAnalysisError('Please enter a job posting URL');
@@ -219,14 +297,17 @@ const ApplicationForm = ({ open, onClose, onSubmit, initialData }) => {
     setAnalysisError(null);
 
     try {
-      const response = await axios.post('http://localhost:5000/api/analyze-url', {
-        url: formData.url
-      });
+      let analysisData;
+      try {
+        analysisData = await streamAnalysis(formData.url);
+      } catch (streamError) {
+        // The analysis itself failed; retrying it as a job would not help
+        if (streamError.fromServer) throw streamError;
+        console.warn('Streaming analysis failed, falling back to background job:', streamError);
+        analysisData = await runAnalysisJob(formData.url);
+      }
 
-      if (response.data) {
-        // Update form data with analyzed information
-        const analysisData = response.data;
-        
+      if (analysisData) {
         // Log the analysis data for debugging
         console.log('URL analysis response:', analysisData);
         
@@ -181,14 +181,14 @@ const ApplicationRow = ({ application, onDelete, onEdit, isOpen }) => {
                     </TableCell>
                     <TableCell>
                       {application.cv_path ? (
-                        <a href={`http://localhost:5000${application.cv_path}`} target="_blank" rel="noopener noreferrer">
+                        <a href={`http://localhost:5000/${application.cv_path}`} target="_blank" rel="noopener noreferrer">
                           View CV
                         </a>
                       ) : 'Not uploaded'}
                     </TableCell>
                     <TableCell>
                       {application.cover_letter_path ? (
-                        <a href={`http://localhost:5000${application.cover_letter_path}`} target="_blank" rel="noopener noreferrer">
+                        <a href={`http://localhost:5000/${application.cover_letter_path}`} target="_blank" rel="noopener noreferrer">
                           View Cover Letter
                         </a>
                       ) : 'Not uploaded'}
@@ -214,7 +214,10 @@ const ApplicationRow = ({ application, onDelete, onEdit, isOpen }) => {
   );
 };
 
-const ApplicationList = ({ applications, loading, error, onDelete, onEdit, onAddClick }) => {
+const ApplicationList = ({
+  applications, total, hasMore, loading, loadingMore, error,
+  onDelete, onEdit, onAddClick, onQueryChange, onLoadMore
+}) => {
   // State for sorting
   const [order, setOrder] = useState('desc');
   const [orderBy, setOrderBy] = useState('date_applied');
@@ -230,7 +233,6 @@ const ApplicationList = ({ applications, loading, error, onDelete, onEdit, onAdd
   
   const [showFilters, setShowFilters] = useState(false);
   const [statuses, setStatuses] = useState([]);
-  const [filteredApplications, setFilteredApplications] = useState([]);
   const [allExpanded, setAllExpanded] = useState(false);
 
   // Fetch statuses for filter dropdown
@@ -240,67 +242,21 @@ const ApplicationList = ({ applications, loading, error, onDelete, onEdit, onAdd
       .catch(error => console.error('Error fetching statuses:', error));
   }, []);
 
-  // Apply filters and sorting
+  // Send filters and sorting to the backend (debounced so typing doesn't fire a request per key)
   useEffect(() => {
-    let result = [...applications];
-    
-    // Apply filters
-    if (filters.company) {
-      result = result.filter(app => 
-        app.company.toLowerCase().includes(filters.company.toLowerCase())
-      );
-    }
-    
-    if (filters.role) {
-      result = result.filter(app => 
-        app.role.toLowerCase().includes(filters.role.toLowerCase())
-      );
-    }
-    
-    if (filters.status) {
-      result = result.filter(app => app.status === filters.status);
-    }
-    
-    if (filters.dateFrom) {
-      const fromDate = new Date(filters.dateFrom);
-      result = result.filter(app => {
-        if (!app.date_applied) return false;
-        return new Date(app.date_applied) >= fromDate;
-      });
-    }
-    
-    if (filters.dateTo) {
-      const toDate = new Date(filters.dateTo);
-      toDate.setHours(23, 59, 59, 999); // End of day
-      result = result.filter(app => {
-        if (!app.date_applied) return false;
-        return new Date(app.date_applied) <= toDate;
-      });
-    }
-    
-    // Apply sorting
-    result.sort((a, b) => {
-      let aValue = a[orderBy];
-      let bValue = b[orderBy];
-      
-      // Handle special cases
-      if (orderBy === 'date_applied' || orderBy === 'date_posted') {
-        aValue = aValue ? new Date(aValue).getTime() : 0;
-        bValue = bValue ? new Date(bValue).getTime() : 0;
-      } else if (orderBy === 'monthly_salary') {
-        aValue = a.salary_amount ? parseFloat(calculateMonthlySalary(a.salary_amount, a.salary_type)) : 0;
-        bValue = b.salary_amount ? parseFloat(calculateMonthlySalary(b.salary_amount, b.salary_type)) : 0;
-      }
-      
-      if (order === 'asc') {
-        return aValue < bValue ? -1 : aValue > bValue ? 1 : 0;
-      } else {
-        return bValue < aValue ? -1 : bValue > aValue ? 1 : 0;
-      }
-    });
-    
-    setFilteredApplications(result);
-  }, [applications, filters, order, orderBy]);
+    const timer = setTimeout(() => {
+      const query = { sort: orderBy, order };
+      if (filters.company) query.company = filters.company;
+      if (filters.role) query.role = filters.role;
+      if (filters.status) query.status = filters.status;
+      if (filters.dateFrom) query.date_from = filters.dateFrom;
+      if (filters.dateTo) query.date_to = filters.dateTo;
+      onQueryChange(query);
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [filters, order, orderBy]);
+
+  const hasActiveFilters = Object.values(filters).some(value => value !== '');
 
   const handleRequestSort = (property) => {
     const isAsc = orderBy === property && order === 'asc';
@@ -341,13 +297,13 @@ const ApplicationList = ({ applications, loading, error, onDelete, onEdit, onAdd
 
   return (
     <Paper sx={{ width: '100%', overflow: 'hidden', mb: 4 }}>
-      {loading ? (
+      {loading && applications.length === 0 && !hasActiveFilters ? (
         <Box sx={{ display: 'flex', justifyContent: 'center', p: 3 }}>
           <CircularProgress />
         </Box>
       ) : error ? (
         <Alert severity="error" sx={{ m: 2 }}>{error}</Alert>
-      ) : applications.length === 0 ? (
+      ) : applications.length === 0 && !hasActiveFilters ? (
         <Box sx={{ p: 3, textAlign: 'center' }}>
           <Typography variant="body1" gutterBottom>
             No applications found.
@@ -366,7 +322,7 @@ const ApplicationList = ({ applications, loading, error, onDelete, onEdit, onAdd
         <>
           <Box sx={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', p: 2 }}>
             <Typography variant="h6" component="div">
-              Your Job Applications ({filteredApplications.length})
+              Your Job Applications ({total})
             </Typography>
             <Box>
               <Tooltip title="Toggle Filters">
@@ -536,7 +492,7 @@ const ApplicationList = ({ applications, loading, error, onDelete, onEdit, onAdd
                 </TableRow>
               </TableHead>
               <TableBody>
-                {filteredApplications.map((application) => (
+                {applications.map((application) => (
                   <ApplicationRow 
                     key={application.id} 
                     application={application} 
@@ -548,6 +504,14 @@ const ApplicationList = ({ applications, loading, error, onDelete, onEdit, onAdd
               </TableBody>
             </Table>
           </TableContainer>
+          
+          {hasMore && (
+            <Box sx={{ display: 'flex', justifyContent: 'center', p: 2 }}>
+              <Button variant="outlined" onClick={onLoadMore} disabled={loadingMore}>
+                {loadingMore ? <CircularProgress size={20} /> : `Load More (${applications.length} of ${total})`}
+              </Button>
+            </Box>
+          )}
         </>
       )}
     </Paper>